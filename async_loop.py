@@ -0,0 +1,330 @@
+"""asyncio main loop for True Liberator
+
+Runs the session generator from main.py on an asyncio event loop instead of pygame's clock, so
+that services doing I/O can share the loop with the game:
+
+    SaveWriter          autosaves and the high score file, written one at a time in a worker thread;
+                        newer data for a file replaces whatever of it is still waiting
+    LeaderboardClient   sends every new high score as a line of JSON to TRUE_LIBERATOR_LEADERBOARD,
+                        a port on localhost or a Unix socket path, reconnecting when it goes away
+    spectators          with TRUE_LIBERATOR_SPECTATE, subscribers are accepted as they connect and
+                        what a slow subscriber could not take is sent between frames
+
+    TRUE_LIBERATOR_ASYNC=1 python main.py
+    TRUE_LIBERATOR_ASYNC=1 TRUE_LIBERATOR_LEADERBOARD=47901 python main.py
+    python async_loop.py leaderboard 47901         # a local leaderboard that prints what it is sent
+
+Frames start at deadlines a whole number of frame periods after the first, so the frame rate
+neither drifts nor rounds to whole milliseconds as clock.tick() does. A frame never awaits, so no
+I/O can start in the middle of one: services only run while the loop waits for the next deadline,
+and each of their steps is non-blocking socket work or a hand-off to a thread, far shorter than
+the wait. Frames that still start late are counted and reported on exit.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import socket
+import time
+
+import pygame
+
+import savegame
+from spectator import parse_address
+
+LATE_MS = 2.0  # A frame starting this long after its deadline counts as late
+MAX_UNSENT = 100  # Scores kept for the leaderboard while it can't be reached
+CONNECT_TIMEOUT = 2.0
+RETRY_MIN = 1.0  # Seconds before reconnecting to the leaderboard, doubled after every failure
+RETRY_MAX = 30.0
+LINGER = 1.0  # Seconds allowed on exit to send scores still queued for the leaderboard
+
+
+def write_file(path, data):
+    """Replace path with data, or remove it when data is None"""
+    if data is None:
+        savegame.remove(path)
+    else:
+        savegame.write_atomic(path, data)
+
+
+class SaveWriter:
+    """Writes files for the game off the frame; submit() only records what to write"""
+    def __init__(self):
+        self.pending = {}  # Path -> bytes, or None to remove the file
+        self.ready = asyncio.Event()
+        self.closing = False
+        self.writing = False
+        self.written = 0
+        self.failed = 0
+
+    def busy(self):
+        return bool(self.pending) or self.writing
+
+    def submit(self, path, data):
+        self.pending.pop(path, None)  # Requests for one file are carried out in the order made
+        self.pending[path] = data
+        self.ready.set()
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        while not (self.closing and not self.pending):
+            await self.ready.wait()
+            self.ready.clear()
+            while self.pending:
+                path = next(iter(self.pending))
+                data = self.pending.pop(path)
+                self.writing = True
+                try:
+                    await loop.run_in_executor(None, write_file, path, data)
+                    self.written += 1
+                except OSError:
+                    self.failed += 1
+                finally:
+                    self.writing = False
+
+    def close(self):
+        """Let serve() return once everything submitted so far is written"""
+        self.closing = True
+        self.ready.set()
+
+
+class LeaderboardClient:
+    """Sends new high scores to a local leaderboard, one JSON line each, and reads one line back per score.
+
+    A score is only dropped from the queue once the leaderboard has answered it, so scores sent
+    just before a connection breaks are sent again after reconnecting.
+    """
+    def __init__(self, address):
+        self.family, self.address = parse_address(address)
+        self.queue = collections.deque(maxlen=MAX_UNSENT)
+        self.ready = asyncio.Event()
+        self.sent = 0
+        self.last_reply = None
+
+    def busy(self):
+        return bool(self.queue)
+
+    def submit(self, entry):
+        self.queue.append(dict(entry, time=int(time.time())))
+        self.ready.set()
+
+    async def connect(self):
+        if self.family == socket.AF_UNIX:
+            connection = asyncio.open_unix_connection(self.address)
+        else:
+            connection = asyncio.open_connection(*self.address)
+        return await asyncio.wait_for(connection, CONNECT_TIMEOUT)
+
+    async def serve(self):
+        reader = writer = None
+        retry = RETRY_MIN
+        try:
+            while True:
+                await self.ready.wait()
+                if writer is None:
+                    try:
+                        reader, writer = await self.connect()
+                        retry = RETRY_MIN
+                    except (OSError, asyncio.TimeoutError):
+                        await asyncio.sleep(retry)
+                        retry = min(retry * 2, RETRY_MAX)
+                        continue
+                try:
+                    while self.queue:
+                        writer.write(json.dumps(self.queue[0]).encode() + b'\n')
+                        await writer.drain()
+                        reply = await asyncio.wait_for(reader.readline(), CONNECT_TIMEOUT)
+                        if not reply:
+                            raise ConnectionResetError("leaderboard closed the connection")
+                        self.last_reply = reply.decode(errors='replace').strip()
+                        self.queue.popleft()
+                        self.sent += 1
+                    self.ready.clear()
+                except (OSError, asyncio.TimeoutError):
+                    writer.close()
+                    reader = writer = None
+        finally:
+            if writer:
+                writer.close()
+
+    async def flush(self, timeout):
+        """Give queued scores up to timeout seconds to go out"""
+        end = time.monotonic() + timeout
+        while self.queue and time.monotonic() < end:
+            await asyncio.sleep(0.05)
+
+
+class AsyncRunner:
+    """Drives a session generator (main.session) at fps frames a second on the running event loop"""
+    def __init__(self, fps):
+        self.period = 1.0 / fps
+        self.after_frame = []  # Callbacks run once the loop is free after each frame
+        self.busy = []  # Callables telling whether a service has work in hand
+        self.frames = 0
+        self.frame_seconds = 0.0
+        self.late = 0
+        self.worst_ms = 0.0
+
+    async def drive(self, session):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        reply = None
+        while True:
+            start = loop.time()
+            try:
+                wait = session.send(reply)
+            except StopIteration:
+                return
+            now = loop.time()
+            if wait is None:
+                for callback in self.after_frame:
+                    loop.call_soon(callback)
+                deadline += self.period
+                if deadline < now:
+                    # The frame overran, so the next one is late already; start it now rather than
+                    # race to catch up, once the services have had their turn
+                    self.count_late(now - deadline)
+                    deadline = now
+                    await asyncio.sleep(0)
+                else:
+                    await asyncio.sleep(deadline - now)
+                    self.count_late(loop.time() - deadline)
+                self.frames += 1
+                self.frame_seconds += loop.time() - start
+                reply = (now - start) * 1000
+            else:
+                reply = await self.wait_for_events(wait)
+                deadline = loop.time()
+
+    def count_late(self, seconds):
+        late_ms = seconds * 1000
+        self.worst_ms = max(self.worst_ms, late_ms)
+        if late_ms > LATE_MS:
+            self.late += 1
+
+    async def wait_for_events(self, timeout_ms):
+        """Like main.wait_for_events() while static screens wait for input.
+        
+        SDL's event queue can't wake the event loop, so while no service has work in hand this
+        sleeps in SDL for the whole timeout, just as the blocking loop does, and the screens idle
+        at next to no CPU. Only while a service is busy does it poll once a frame instead.
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + max(0, timeout_ms) / 1000
+        while True:
+            await asyncio.sleep(0)  # Callbacks already due run first
+            remaining = end - loop.time()
+            if remaining <= 0:
+                return pygame.event.get()
+            if not any(busy() for busy in self.busy):
+                event = pygame.event.wait(max(1, int(remaining * 1000)))
+                if event.type == pygame.NOEVENT:
+                    return []
+                return [event] + pygame.event.get()
+            events = pygame.event.get()
+            if events:
+                return events
+            await asyncio.sleep(min(self.period, remaining))
+
+    def report(self):
+        if not self.frames:
+            return "no frames"
+        return (f"{self.frames} frames at {self.frames / self.frame_seconds:.2f} fps, "
+                f"{self.late} late by more than {LATE_MS:g} ms (worst {self.worst_ms:.1f} ms)")
+
+
+async def play(scenes, session, fps):
+    runner = AsyncRunner(fps)
+    loop = asyncio.get_running_loop()
+    writer = SaveWriter()
+    services = [asyncio.create_task(writer.serve())]
+    runner.busy.append(writer.busy)
+    high_scores = scenes.menu.high_score_manager
+    scenes.writer = high_scores.writer = writer
+    if scenes.game:
+        scenes.game.writer = writer
+    leaderboard = None
+    address = os.environ.get('TRUE_LIBERATOR_LEADERBOARD')
+    if address:
+        leaderboard = high_scores.leaderboard = LeaderboardClient(address)
+        services.append(asyncio.create_task(leaderboard.serve()))
+        runner.busy.append(leaderboard.busy)
+    spectators = scenes.spectators
+    if spectators:
+        loop.add_reader(spectators.listener.fileno(), spectators.accept)
+        runner.after_frame.append(spectators.drain)
+    try:
+        await runner.drive(session)
+    finally:
+        session.close()
+        if spectators:
+            loop.remove_reader(spectators.listener.fileno())
+        if leaderboard:
+            await leaderboard.flush(LINGER)
+        writer.close()
+        await services[0]
+        for task in services[1:]:
+            task.cancel()
+        await asyncio.gather(*services[1:], return_exceptions=True)
+        scenes.writer = high_scores.writer = high_scores.leaderboard = None
+        if scenes.game:
+            scenes.game.writer = None
+    summary = f"Async loop: {runner.report()}; {writer.written} files written"
+    if leaderboard:
+        summary += f", {leaderboard.sent} scores sent to the leaderboard"
+        if leaderboard.queue:
+            summary += f", {len(leaderboard.queue)} not sent"
+    print(summary)
+    return runner
+
+
+def run(scenes, session, fps):
+    """Play the session generator on a new event loop, with the services hosted alongside it"""
+    return asyncio.run(play(scenes, session, fps))
+
+
+async def serve_leaderboard(address):
+    """A leaderboard kept in memory that prints every score it is sent and answers with its rank"""
+    family, address = parse_address(address)
+    scores = []
+
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                entry = json.loads(line)
+                scores.append(entry)
+                scores.sort(key=lambda score: score['score'], reverse=True)
+                rank = scores.index(entry) + 1
+                print(f"#{rank:<3d} {entry['name']:<10} {entry['score']:7d}  {entry['difficulty']}")
+                writer.write(json.dumps({'rank': rank, 'entries': len(scores)}).encode() + b'\n')
+                await writer.drain()
+        except (OSError, ValueError, KeyError):
+            pass
+        finally:
+            writer.close()
+
+    if family == socket.AF_INET:
+        server = await asyncio.start_server(handle, *address)
+    else:
+        if os.path.exists(address):
+            os.unlink(address)
+        server = await asyncio.start_unix_server(handle, address)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local leaderboard for TRUE_LIBERATOR_LEADERBOARD")
+    parser.add_argument('command', choices=['leaderboard'])
+    parser.add_argument('address', help="TCP port on localhost or Unix socket path")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_leaderboard(args.address))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Difficulty autotuner for True Liberator
+
+Searches the DIFFICULTY_SETTINGS numbers, including the per-wave ramps applied by
+Game.start_new_wave, so that a scripted attacker reaches a target wave on each
+difficulty. Every candidate is scored on the same seeded headless games, run in
+parallel, and results are cached per (parameter set, seed) so repeated candidates
+and reruns cost nothing.
+
+    python autotune.py --target EASY=8 --target NORMAL=5 --target HARD=3 --seeds 32 --generations 12
+
+Prints a DIFFICULTY_SETTINGS table ready to paste into main.py, plus the measured
+fraction of games reaching each wave before and after tuning, and writes both to
+--output as JSON.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+
+from headless import GreedyAttacker, run_headless
+from main import DIFFICULTY_SETTINGS
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TARGETS = {'EASY': 8, 'NORMAL': 5, 'HARD': 3}
+
+# Tuned parameters: (lowest, highest, rounding step)
+PARAMETERS = {
+    'ai_accuracy': (0.3, 0.98, 0.01),
+    'ai_range': (200, 800, 10),
+    'ai_reaction_chance': (0.05, 0.9, 0.01),
+    'missile_count': (3, 25, 1),
+    'shot_cooldown': (300, 4000, 50),
+    'wave_cooldown_step': (0, 400, 10),
+    'wave_accuracy_step': (0.0, 0.05, 0.005),
+    'wave_reaction_step': (0.0, 0.1, 0.005),
+}
+
+
+def game_version():
+    """Hash of the simulation sources, so cached results die with the rules they were measured under.
+    
+    Every module of this tree that the headless simulation has imported counts, so moving code
+    out of main.py into a module of its own never leaves stale results valid.
+    """
+    digest = hashlib.sha1()
+    paths = {os.path.abspath(module.__file__) for module in list(sys.modules.values())
+             if getattr(module, '__file__', None)}
+    own = os.path.abspath(__file__)
+    for path in sorted(path for path in paths if os.path.dirname(path) == HERE and path != own):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def settings_key(difficulty, settings, bot_interval, max_waves):
+    blob = json.dumps([difficulty, settings, bot_interval, max_waves], sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()
+
+
+def play(task):
+    """Worker: waves reached by the bot in one seeded game"""
+    difficulty, settings, seed, bot_interval, max_waves = task
+    game = run_headless(difficulty, seed, GreedyAttacker(seed, min_interval=bot_interval), max_waves=max_waves,
+                        settings=settings)
+    return min(game.wave, max_waves)
+
+
+class Evaluator:
+    """Scores parameter sets on fixed seeds, in a process pool, with an on-disk cache"""
+    def __init__(self, seeds, bot_interval, max_waves, cache_path, processes=None):
+        self.seeds = list(seeds)
+        self.bot_interval = bot_interval
+        self.max_waves = max_waves
+        self.cache_path = cache_path
+        self.version = game_version()
+        self.cache = {}
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path) as f:
+                    stored = json.load(f)
+                if stored.get('version') == self.version:
+                    self.cache = stored['results']
+            except (OSError, ValueError, KeyError):
+                pass
+        self.pool = multiprocessing.Pool(processes)
+        self.games_played = 0
+        self.cache_hits = 0
+
+    def waves(self, difficulty, candidates):
+        """Waves reached on every seed, for each candidate settings dict"""
+        keys = [settings_key(difficulty, settings, self.bot_interval, self.max_waves) for settings in candidates]
+        tasks = []
+        queued = set()
+        for key, settings in zip(keys, candidates):
+            done = self.cache.setdefault(key, {})
+            for seed in self.seeds:
+                if str(seed) in done:
+                    self.cache_hits += 1
+                elif (key, seed) not in queued:
+                    queued.add((key, seed))
+                    tasks.append((key, seed, (difficulty, settings, seed, self.bot_interval, self.max_waves)))
+        for (key, seed, _), wave in zip(tasks, self.pool.imap(play, [task for _, _, task in tasks], chunksize=4)):
+            self.cache[key][str(seed)] = wave
+        self.games_played += len(tasks)
+        return [[self.cache[key][str(seed)] for seed in self.seeds] for key in keys]
+
+    def save(self):
+        if self.cache_path:
+            with open(self.cache_path, 'w') as f:
+                json.dump({'version': self.version, 'results': self.cache}, f)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+def loss(waves, target):
+    """Distance of the median and mean waves reached from the target"""
+    return (statistics.median(waves) - target) ** 2 + 0.5 * (statistics.fmean(waves) - target) ** 2
+
+
+def survival_curve(waves, max_waves):
+    """Fraction of games that reached each wave"""
+    return [sum(1 for wave in waves if wave >= w) / len(waves) for w in range(1, max_waves + 1)]
+
+
+def clamp(name, value):
+    lowest, highest, step = PARAMETERS[name]
+    value = min(max(value, lowest), highest)
+    value = round(round(value / step) * step, 6)
+    return int(value) if isinstance(step, int) else value
+
+
+def mutate(settings, sigma, rng):
+    """Copy of settings with one to three parameters nudged by a Gaussian step of sigma times their range"""
+    candidate = dict(settings)
+    for name in rng.sample(sorted(PARAMETERS), rng.randint(1, 3)):
+        lowest, highest, _ = PARAMETERS[name]
+        candidate[name] = clamp(name, candidate[name] + rng.gauss(0, sigma * (highest - lowest)))
+    return candidate
+
+
+def tune(evaluator, difficulty, target, generations, population, rng, log=print):
+    """(1+lambda) evolution strategy with step-size adaptation; returns (best settings, its waves)"""
+    best = dict(DIFFICULTY_SETTINGS[difficulty])
+    best_waves = evaluator.waves(difficulty, [best])[0]
+    best_loss = loss(best_waves, target)
+    sigma = 0.15
+    log(f"{difficulty}: start median wave {statistics.median(best_waves)} (target {target}), loss {best_loss:.2f}")
+    for generation in range(generations):
+        if best_loss == 0:
+            break
+        candidates = [mutate(best, sigma, rng) for _ in range(population)]
+        results = evaluator.waves(difficulty, candidates)
+        losses = [loss(waves, target) for waves in results]
+        i = min(range(population), key=losses.__getitem__)
+        if losses[i] < best_loss:
+            best, best_waves, best_loss = candidates[i], results[i], losses[i]
+            sigma = min(sigma * 1.3, 0.5)
+        else:
+            sigma = max(sigma * 0.7, 0.02)
+        log(f"{difficulty}: generation {generation + 1} median wave {statistics.median(best_waves)} "
+            f"loss {best_loss:.2f} step {sigma:.3f}")
+    return best, best_waves
+
+
+def format_table(table):
+    """DIFFICULTY_SETTINGS source text in the style of main.py"""
+    lines = ["DIFFICULTY_SETTINGS = {"]
+    for i, (difficulty, settings) in enumerate(table.items()):
+        lines.append(f"    '{difficulty}': {{")
+        items = list(settings.items())
+        for j, (name, value) in enumerate(items):
+            lines.append(f"        '{name}': {value!r}{',' if j < len(items) - 1 else ''}")
+        lines.append("    }" + ("," if i < len(table) - 1 else ""))
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune DIFFICULTY_SETTINGS against target bot outcomes")
+    parser.add_argument('--target', action='append', default=[], metavar='DIFFICULTY=WAVE',
+                        help="median wave the bot should reach (default EASY=8, NORMAL=5, HARD=3)")
+    parser.add_argument('--seeds', type=int, default=32, help="seeded games per candidate")
+    parser.add_argument('--generations', type=int, default=12)
+    parser.add_argument('--population', type=int, default=8, help="candidates per generation")
+    parser.add_argument('--bot-interval', type=int, default=30, help="frames the bot waits between shots")
+    parser.add_argument('--max-waves', type=int, default=None, help="stop games here (default twice the top target)")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--random-seed', type=int, default=0)
+    parser.add_argument('--cache', default=os.path.join(HERE, '.autotune_cache.json'))
+    parser.add_argument('--output', default='autotune_results.json')
+    args = parser.parse_args()
+
+    targets = dict(DEFAULT_TARGETS)
+    if args.target:
+        targets = {}
+        for spec in args.target:
+            difficulty, wave = spec.split('=')
+            targets[difficulty.upper()] = int(wave)
+    max_waves = args.max_waves or 2 * max(targets.values())
+    rng = random.Random(args.random_seed)
+    evaluator = Evaluator(range(args.seeds), args.bot_interval, max_waves, args.cache, args.processes)
+    table = {name: dict(settings) for name, settings in DIFFICULTY_SETTINGS.items()}
+    curves = {}
+    try:
+        for difficulty, target in targets.items():
+            before = evaluator.waves(difficulty, [DIFFICULTY_SETTINGS[difficulty]])[0]
+            table[difficulty], after = tune(evaluator, difficulty, target, args.generations, args.population, rng)
+            curves[difficulty] = {
+                'target': target,
+                'before': {'median': statistics.median(before), 'reached': survival_curve(before, max_waves)},
+                'after': {'median': statistics.median(after), 'reached': survival_curve(after, max_waves)},
+            }
+            evaluator.save()
+    finally:
+        evaluator.close()
+
+    print()
+    print(format_table(table))
+    print()
+    print("Fraction of games reaching each wave, before -> after:")
+    for difficulty, curve in curves.items():
+        print(f"  {difficulty} (target median {curve['target']}, "
+              f"median {curve['before']['median']} -> {curve['after']['median']})")
+        for wave, (old, new) in enumerate(zip(curve['before']['reached'], curve['after']['reached']), 1):
+            print(f"    wave {wave:2d}  {old:5.0%} -> {new:5.0%}")
+    print(f"{evaluator.games_played} games played, {evaluator.cache_hits} results from cache")
+
+    with open(args.output, 'w') as f:
+        json.dump({'settings': table, 'curves': curves, 'seeds': args.seeds, 'bot_interval': args.bot_interval,
+                   'max_waves': max_waves}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Defensive coverage for True Liberator
+
+CoverageField holds, for each defensive base, the interceptor flight time to every grid cell
+within its reach. The intercept planner reads it to rule out missiles far out of range, and
+the threat map overlay draws the combined field.
+"""
+import math
+
+import numpy
+
+
+COVERAGE_CELL = 10  # Pixels per side of a coverage grid cell
+# Coverage reaches this far past ai_range, more than a missile flies in one InterceptPlanner window
+COVERAGE_MARGIN = 128
+
+
+class CoverageField:
+    """Where the defensive bases can reach, as grids over the battlefield.
+
+    Each base has a window of cells around it holding the interceptor flight time, in ticks,
+    to the nearest point of every cell, out to COVERAGE_MARGIN past ai_range and infinite
+    beyond. Bases never move within a game, so the windows are built once; the field made at
+    the start of each wave or when a base is destroyed shares them and only redoes the threat
+    map, the per-cell earliest flight time and number of standing bases in range. Queries are
+    lower bounds read from the tables: they never overestimate a distance, so they can rule
+    pairs out exactly.
+    """
+    def __init__(self, bases, ai_range, world, windows=None):
+        self.bases = bases
+        self.ai_range = ai_range
+        self.world = world
+        self.standing = tuple(not base.destroyed for base in bases)
+        self.windows = windows if windows is not None else [self.window(base) for base in bases]
+        self.threat = None  # (earliest ticks, bases in range), built on first use
+
+    def window(self, base):
+        """(first column, first row, ticks) for the cells within reach of one base, indexed [column, row]"""
+        size = COVERAGE_CELL
+        reach = self.ai_range + COVERAGE_MARGIN
+        column = math.floor((base.x - reach) / size)
+        row = math.floor((base.y - reach) / size)
+        left = numpy.arange(column, math.floor((base.x + reach) / size) + 1) * size
+        top = numpy.arange(row, math.floor((base.y + reach) / size) + 1) * size
+        # Distance from the base to the nearest point of each cell, zero in the base's own cell
+        gap_x = numpy.maximum(numpy.maximum(left - base.x, base.x - (left + size)), 0)[:, None]
+        gap_y = numpy.maximum(numpy.maximum(top - base.y, base.y - (top + size)), 0)[None, :]
+        distance = numpy.hypot(gap_x, gap_y)
+        ticks = numpy.where(distance <= reach, distance / 4, numpy.inf).astype(numpy.float32)  # Interceptors fly 4px per tick
+        return column, row, ticks
+
+    def rebuilt(self):
+        """Field for the bases as they stand now, sharing this one's per-base windows"""
+        return CoverageField(self.bases, self.ai_range, self.world, self.windows)
+
+    def stale(self):
+        return self.standing != tuple(not base.destroyed for base in self.bases)
+
+    def time_to_reach(self, index, x, y):
+        """Interceptor flight time from base index to the cell of (x, y), at most the true time; inf if far out of range"""
+        column, row, ticks = self.windows[index]
+        i = int(x // COVERAGE_CELL) - column
+        j = int(y // COVERAGE_CELL) - row
+        if 0 <= i < ticks.shape[0] and 0 <= j < ticks.shape[1]:
+            return float(ticks[i, j])
+        return math.inf
+
+    def times_to_reach(self, index, x, y):
+        """time_to_reach() for arrays of x and y at once"""
+        column, row, ticks = self.windows[index]
+        i = (x // COVERAGE_CELL).astype(int) - column
+        j = (y // COVERAGE_CELL).astype(int) - row
+        inside = (i >= 0) & (i < ticks.shape[0]) & (j >= 0) & (j < ticks.shape[1])
+        times = numpy.full(len(x), numpy.inf)
+        times[inside] = ticks[i[inside], j[inside]]
+        return times
+
+    def threat_map(self):
+        """(earliest ticks, bases in range) per world cell, counting standing bases only"""
+        if self.threat is None:
+            columns = math.ceil(self.world[0] / COVERAGE_CELL)
+            rows = math.ceil(self.world[1] / COVERAGE_CELL)
+            earliest = numpy.full((columns, rows), numpy.inf, dtype=numpy.float32)
+            count = numpy.zeros((columns, rows), dtype=numpy.uint8)
+            limit = self.ai_range / 4
+            for standing, (column, row, ticks) in zip(self.standing, self.windows):
+                if not standing:
+                    continue
+                # Clip the window to the world
+                i0, j0 = max(column, 0), max(row, 0)
+                i1, j1 = min(column + ticks.shape[0], columns), min(row + ticks.shape[1], rows)
+                if i0 >= i1 or j0 >= j1:
+                    continue
+                part = ticks[i0 - column:i1 - column, j0 - row:j1 - row]
+                numpy.minimum(earliest[i0:i1, j0:j1], numpy.where(part <= limit, part, numpy.inf),
+                              out=earliest[i0:i1, j0:j1])
+                count[i0:i1, j0:j1] += part <= limit
+            self.threat = (earliest, count)
+        return self.threat
@@ -0,0 +1,217 @@
+"""Headless simulation of True Liberator games
+
+Runs games without a display, driven by a scripted player, and can fast-forward
+through quiet stretches of a wave instead of single-stepping every frame.
+
+    python headless.py --games 20 --difficulty NORMAL
+    python headless.py --games 5 --player lookahead     # also reports fork and rollout throughput
+    python headless.py --games 50 --telemetry run.tlm   # gameplay events for telemetry.py
+"""
+import argparse
+import random
+import time
+
+import telemetry
+from main import Game, FPS
+
+
+class GreedyAttacker:
+    """Scripted player that fires at a random standing city or base whenever a launcher is ready"""
+    def __init__(self, seed=None, aim_error=10, min_interval=0):
+        self.rng = random.Random(seed)
+        self.aim_error = aim_error
+        self.min_interval = min_interval  # Frames to wait between shots, on top of launcher cooldowns
+
+    def act(self, game):
+        """Launch if possible and return the number of frames until the next decision"""
+        current_time = game.current_time()
+        targets = [(city.x + city.width // 2, city.y - 20) for city in game.cities if not city.destroyed]
+        targets += [(base.x, base.y) for base in game.defensive_bases if not base.destroyed]
+        if targets and any(launcher.can_shoot(current_time) for launcher in game.launchers):
+            target_x, target_y = self.rng.choice(targets)
+            game.launch_missile(target_x + self.rng.randint(-self.aim_error, self.aim_error),
+                                target_y + self.rng.randint(-self.aim_error, self.aim_error))
+
+        # Wake up again when the next launcher has reloaded
+        ready_times = [launcher.last_shot_time + launcher.shot_cooldown + 1
+                       for launcher in game.launchers if launcher.missiles_remaining > 0]
+        if not ready_times:
+            return FPS
+        return max(1, self.min_interval, game.frames_until(min(ready_times)))
+
+
+class LookaheadAttacker:
+    """Scripted player that plans by simulation.
+
+    Whenever a launcher is ready it forks the game once per candidate target, fires at that
+    target in the fork, fast-forwards the fork a few seconds and keeps the target that scored
+    most. Forks share the game's RNG state, so the defence they play against reacts exactly as
+    the real one will. The counters double as a benchmark of fork and rollout throughput.
+    """
+    def __init__(self, seed=None, candidates=24, horizon=FPS * 4, aim_error=25, min_interval=0, fast_forward=True):
+        self.rng = random.Random(seed)
+        self.candidates = candidates
+        self.horizon = horizon  # Frames simulated per candidate; a missile crosses the screen in about 3s
+        self.aim_error = aim_error
+        self.min_interval = min_interval
+        self.fast_forward = fast_forward  # Rollouts single-step every frame when False, for timing comparisons
+        self.forks = 0
+        self.fork_seconds = 0.0
+        self.rollout_frames = 0
+        self.rollout_seconds = 0.0
+
+    def targets(self, game):
+        """Candidate clicks: every standing city and base, then random offsets around them"""
+        aims = [(city.x + city.width // 2, city.y - 20) for city in game.cities if not city.destroyed]
+        aims += [(base.x, base.y) for base in game.defensive_bases if not base.destroyed]
+        targets = list(aims)
+        while aims and len(targets) < self.candidates:
+            x, y = self.rng.choice(aims)
+            targets.append((x + self.rng.randint(-self.aim_error, self.aim_error),
+                            y + self.rng.randint(-self.aim_error, self.aim_error)))
+        return targets
+
+    def rollout(self, game, target):
+        """Points scored within the horizon after clicking target now"""
+        start = time.perf_counter()
+        fork = game.fork()
+        forked = time.perf_counter()
+        fork.launch_missile(*target)
+        if self.fast_forward:
+            self.rollout_frames += fork.fast_forward(self.horizon)
+        else:
+            for _ in range(self.horizon):
+                if fork.game_over or fork.show_victory_screen:
+                    break
+                fork.step()
+                self.rollout_frames += 1
+        self.forks += 1
+        self.fork_seconds += forked - start
+        self.rollout_seconds += time.perf_counter() - forked
+        return fork.score - game.score - (1000 if fork.game_over else 0)
+
+    def act(self, game):
+        current_time = game.current_time()
+        if any(launcher.can_shoot(current_time) for launcher in game.launchers):
+            targets = self.targets(game)
+            if targets:
+                game.launch_missile(*max(targets, key=lambda target: self.rollout(game, target)))
+
+        ready_times = [launcher.last_shot_time + launcher.shot_cooldown + 1
+                       for launcher in game.launchers if launcher.missiles_remaining > 0]
+        if not ready_times:
+            return FPS
+        return max(1, self.min_interval, game.frames_until(min(ready_times)))
+
+    def report(self):
+        if not self.forks:
+            return "no decisions taken"
+        return (f"{self.forks} forks at {self.fork_seconds / self.forks * 1e6:.1f} us each, "
+                f"{self.rollout_frames} frames simulated in rollouts "
+                f"({self.rollout_frames / self.rollout_seconds:,.0f} frames/s)")
+
+
+class ReplayPlayer:
+    """Replays recorded launches, given as (frame, x, y) tuples sorted by frame"""
+    def __init__(self, launches):
+        self.launches = list(launches)
+        self.index = 0
+
+    def act(self, game):
+        while self.index < len(self.launches) and self.launches[self.index][0] <= game.frame:
+            frame, x, y = self.launches[self.index]
+            game.launch_missile(x, y)
+            self.index += 1
+        if self.index < len(self.launches):
+            return self.launches[self.index][0] - game.frame
+        return FPS * 60
+
+
+def run_headless(difficulty='NORMAL', seed=0, player=None, max_frames=FPS * 60 * 30, max_waves=None,
+                 fast_forward=True, settings=None, telemetry=None):
+    """Play one game headlessly and return the finished Game.
+
+    Milestone victory screens are continued automatically. The game stops at game over,
+    after max_frames frames, or once max_waves waves have been completed. settings
+    overrides DIFFICULTY_SETTINGS[difficulty]. Events go to the telemetry log if one is given.
+    """
+    game = Game(difficulty, headless=True, seed=seed, settings=settings, telemetry=telemetry)
+    if player is None:
+        player = GreedyAttacker(seed)
+    next_decision = 0
+    while not game.game_over and game.frame < max_frames:
+        if max_waves is not None and game.wave > max_waves:
+            break
+        if game.show_victory_screen:
+            game.continue_after_victory()
+        if game.frame >= next_decision:
+            next_decision = game.frame + max(1, player.act(game))
+        ticks = min(next_decision, max_frames) - game.frame
+        if fast_forward:
+            game.fast_forward(ticks)
+        else:
+            for _ in range(ticks):
+                game.step()
+                if game.game_over or game.show_victory_screen:
+                    break
+    return game
+
+
+def summarize(game):
+    return {'frame': game.frame, 'wave': game.wave, 'score': game.score, 'game_over': game.game_over}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate True Liberator games headlessly")
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--difficulty', default='NORMAL', choices=['EASY', 'NORMAL', 'HARD'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-waves', type=int, default=None)
+    parser.add_argument('--min-interval', type=int, default=0, help="frames the bot waits between shots")
+    parser.add_argument('--player', default='greedy', choices=['greedy', 'lookahead'])
+    parser.add_argument('--telemetry', help="log the gameplay events of the fast-forward games to this file")
+    args = parser.parse_args()
+    player_class = LookaheadAttacker if args.player == 'lookahead' else GreedyAttacker
+
+    timings = {}
+    results = {}
+    players = []
+    log = None
+    if args.telemetry:
+        log = telemetry.TelemetryLog(args.telemetry, {'source': 'headless', 'difficulty': args.difficulty,
+                                                      'seed': args.seed, 'player': args.player})
+    for fast_forward in (False, True):
+        start = time.perf_counter()
+        results[fast_forward] = []
+        for i in range(args.games):
+            options = {'fast_forward': fast_forward} if args.player == 'lookahead' else {}
+            player = player_class(args.seed + i, min_interval=args.min_interval, **options)
+            if fast_forward:
+                players.append(player)
+            results[fast_forward].append(summarize(run_headless(args.difficulty, args.seed + i, player,
+                                                                max_waves=args.max_waves, fast_forward=fast_forward,
+                                                                telemetry=log if fast_forward else None)))
+        timings[fast_forward] = time.perf_counter() - start
+    if log:
+        log.close()
+
+    frames = sum(result['frame'] for result in results[True])
+    print(f"{args.games} games, {frames} frames simulated")
+    print(f"Single-step:  {timings[False]:.3f}s")
+    print(f"Fast-forward: {timings[True]:.3f}s ({timings[False] / timings[True]:.1f}x)")
+    print("Identical results" if results[True] == results[False] else "RESULTS DIFFER")
+    print(f"Mean wave reached: {sum(result['wave'] for result in results[True]) / args.games:.2f}")
+    if args.player == 'lookahead':
+        planner = LookaheadAttacker()
+        for player in players:
+            planner.forks += player.forks
+            planner.fork_seconds += player.fork_seconds
+            planner.rollout_frames += player.rollout_frames
+            planner.rollout_seconds += player.rollout_seconds
+        print(f"Planner: {planner.report()}")
+    if log:
+        print(f"Telemetry: {log.events} events in {log.chunks} chunks written to {args.telemetry}")
+
+
+if __name__ == "__main__":
+    main()
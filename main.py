@@ -1,18 +1,31 @@
 import pygame
 import sys
+import gc
 import math
 import random
 import numpy
 import json
 import os
+import threading
+import time
 
-# Initialize pygame
-pygame.init()
+from coverage_field import COVERAGE_CELL, CoverageField
+from particles import ParticleSystem
+from planner import INTERCEPT_STEPS, InterceptPlanner
+import profiler
+import savegame
+from sound import SoundEngine
+import telemetry
 
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
+AUTOSAVE_FILE = "autosave.sav"  # Written at every new wave, removed when the game ends
+WORLD_MAX = 5  # Largest battlefield, in screens across and down
+SCROLL_SPEED = 12  # Camera pixels per frame while an arrow key is held or the mouse is at the edge
+SCROLL_EDGE = 8  # Mouse this close to the window edge scrolls the camera
+MINIMAP_WIDTH = 160
 
 # Colors (retro 1980s palette)
 BLACK = (0, 0, 0)
@@ -35,7 +48,15 @@ DIFFICULTY_SETTINGS = {
         'player_missile_limit': 12,  # Doubled from 6
         'player_cooldown': 1000,
         'player_explosion_radius': 60,  # Large explosions
-        'defensive_explosion_radius': 15  # Swapped - smaller defensive explosions on easy
+        'defensive_explosion_radius': 15,  # Swapped - smaller defensive explosions on easy
+        # Per-wave ramps applied by Game.start_new_wave
+        'wave_cooldown_step': 200,
+        'min_shot_cooldown': 300,
+        'max_base_missiles': 20,
+        'wave_accuracy_step': 0.02,
+        'max_ai_accuracy': 0.95,
+        'wave_reaction_step': 0.05,
+        'max_ai_reaction_chance': 0.8
     },
     'NORMAL': {
         'ai_accuracy': 0.85,
@@ -46,7 +67,15 @@ DIFFICULTY_SETTINGS = {
         'player_missile_limit': 10,  # Updated to 10 missiles
         'player_cooldown': 1500,
         'player_explosion_radius': 45,  # Medium explosions
-        'defensive_explosion_radius': 20
+        'defensive_explosion_radius': 20,
+        # Per-wave ramps applied by Game.start_new_wave
+        'wave_cooldown_step': 200,
+        'min_shot_cooldown': 300,
+        'max_base_missiles': 20,
+        'wave_accuracy_step': 0.02,
+        'max_ai_accuracy': 0.95,
+        'wave_reaction_step': 0.05,
+        'max_ai_reaction_chance': 0.8
     },
     'HARD': {
         'ai_accuracy': 0.9,
@@ -57,13 +86,287 @@ DIFFICULTY_SETTINGS = {
         'player_missile_limit': 8,  # Doubled from 4
         'player_cooldown': 2000,
         'player_explosion_radius': 30,  # Small explosions - can only destroy single targets
-        'defensive_explosion_radius': 25  # Swapped - larger defensive explosions on hard
+        'defensive_explosion_radius': 25,  # Swapped - larger defensive explosions on hard
+        # Per-wave ramps applied by Game.start_new_wave
+        'wave_cooldown_step': 200,
+        'min_shot_cooldown': 300,
+        'max_base_missiles': 20,
+        'wave_accuracy_step': 0.02,
+        'max_ai_accuracy': 0.95,
+        'wave_reaction_step': 0.05,
+        'max_ai_reaction_chance': 0.8
     }
 }
 
+def synthesize_menu_music():
+    """Create Terminator-inspired chiptune music, as stereo int16 samples"""
+    try:
+        sample_rate = 22050
+        duration = 4.0  # 4 second loop
+        frames = int(duration * sample_rate)
+        arr = numpy.zeros((frames, 2))
+        
+        # Terminator-inspired bass line (simplified)
+        bass_notes = [110, 110, 146.83, 110, 98, 110, 130.81, 110]  # A2, A2, D3, A2, G2, A2, C3, A2
+        note_duration = frames // len(bass_notes)
+        t = numpy.arange(note_duration) / sample_rate
+        
+        for note_idx, freq in enumerate(bass_notes):
+            start_frame = note_idx * note_duration
+            end_frame = min(start_frame + note_duration, frames)
+            note_t = t[:end_frame - start_frame]
+            
+            # Square wave for retro sound
+            wave = 1024 * numpy.where(numpy.sin(2 * numpy.pi * freq * note_t) > 0, 1, -1)
+            # Add some decay
+            wave = wave * numpy.maximum(0.1, 1 - note_t * 1.5)
+            arr[start_frame:end_frame, 0] = wave
+            arr[start_frame:end_frame, 1] = wave
+            
+        return arr.astype(numpy.int16)
+    except:
+        return None
+        
+class AssetRegistry:
+    """Process-wide home for the display surface, fonts, sounds and the high score table.
+    
+    Everything is created on first request and shared from then on, so moving between the
+    menu, a game and name entry never reopens the window, reloads the score file or
+    resynthesizes audio. Pygame subsystems are only brought up when something asks for
+    them, so tools that only need the settings or a headless Game never start SDL.
+    """
+    SOUND_SYNTHESIZERS = {
+        'menu_music': synthesize_menu_music,
+    }
+    
+    def __init__(self):
+        self.screen = None
+        self.fonts = {}
+        self.samples = {}
+        self.sounds = {}
+        self.pending_samples = set()
+        self.high_score_manager = None
+        self.overlay_surface = None
+        self.sfx = None
+        
+    def display(self):
+        """The game window, opened on first use"""
+        if self.screen is None:
+            if not pygame.display.get_init():
+                pygame.display.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("True Liberator")
+        return self.screen
+        
+    def font(self, size):
+        """Default font at the given size"""
+        font = self.fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+        
+    def mixer_ready(self):
+        """Initialize the mixer on first use; returns False when there is no audio device"""
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error:
+                return False
+        return True
+        
+    def preload_sound(self, name):
+        """Synthesize a sound's samples on a background thread"""
+        if name in self.samples or name in self.pending_samples:
+            return
+        self.pending_samples.add(name)
+        
+        def synthesize():
+            self.samples[name] = self.SOUND_SYNTHESIZERS[name]()
+            
+        threading.Thread(target=synthesize, daemon=True).start()
+        
+    def sound(self, name, wait=True):
+        """The named sound, or None if audio is unavailable.
+        
+        With wait=False, returns None instead of blocking while the samples are still being
+        synthesized; call again on a later frame.
+        """
+        if name in self.sounds:
+            return self.sounds[name]
+        if name not in self.samples:
+            if not wait:
+                self.preload_sound(name)
+                return None
+            self.samples[name] = self.SOUND_SYNTHESIZERS[name]()
+        sound = None
+        if self.samples[name] is not None and self.mixer_ready():
+            try:
+                sound = pygame.sndarray.make_sound(self.samples[name])
+            except:
+                pass
+        self.sounds[name] = sound
+        return sound
+        
+    def sound_engine(self):
+        """The shared SoundEngine for in-game effects"""
+        if self.sfx is None:
+            self.sfx = SoundEngine(SCREEN_WIDTH)
+            if self.mixer_ready():
+                self.sfx.start()
+        return self.sfx
+        
+    def high_scores(self):
+        """The shared high score table, loaded from disk once"""
+        if self.high_score_manager is None:
+            self.high_score_manager = HighScoreManager()
+        return self.high_score_manager
+        
+    def overlay(self):
+        """Half-transparent black surface for dimming the playfield behind end-of-game screens"""
+        if self.overlay_surface is None:
+            self.overlay_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.overlay_surface.set_alpha(128)
+            self.overlay_surface.fill(BLACK)
+        return self.overlay_surface
+        
+ASSETS = AssetRegistry()
+
+class LatencyProbe:
+    """Measures click-to-launch and click-to-screen latency, for TRUE_LIBERATOR_LATENCY runs.
+    
+    pygame 2 events carry no timestamp, so unless an event has one, a click is taken to have
+    arrived halfway between the previous event poll and the one that returned it. All times
+    are time.perf_counter() seconds.
+    """
+    def __init__(self):
+        self.poll_time = time.perf_counter()
+        self.previous_poll_time = self.poll_time
+        self.pending_inputs = []  # Input times of launches not yet on screen
+        self.input_to_launch = []
+        self.input_to_frame = []
+        
+    def events_polled(self):
+        self.previous_poll_time = self.poll_time
+        self.poll_time = time.perf_counter()
+        
+    def input_time(self, event):
+        timestamp = getattr(event, 'timestamp', None)  # SDL ticks in ms, where the pygame build exposes it
+        if timestamp is not None:
+            return time.perf_counter() - (pygame.time.get_ticks() - timestamp) / 1000
+        return (self.previous_poll_time + self.poll_time) / 2
+        
+    def launched(self, event):
+        input_time = self.input_time(event)
+        self.input_to_launch.append(time.perf_counter() - input_time)
+        self.pending_inputs.append(input_time)
+        
+    def frame_drawn(self):
+        if self.pending_inputs:
+            now = time.perf_counter()
+            self.input_to_frame.extend(now - input_time for input_time in self.pending_inputs)
+            self.pending_inputs.clear()
+            
+    def summary(self):
+        result = {}
+        for name, samples in (('input_to_launch_ms', self.input_to_launch), ('input_to_frame_ms', self.input_to_frame)):
+            ordered = sorted(sample * 1000 for sample in samples)
+            if ordered:
+                result[name] = {'count': len(ordered), 'p50': ordered[len(ordered) // 2],
+                                'p90': ordered[int(len(ordered) * 0.9)], 'p99': ordered[int(len(ordered) * 0.99)],
+                                'max': ordered[-1]}
+        return result
+        
+    def report(self, path=None):
+        summary = self.summary()
+        for name, stats in summary.items():
+            print(f"{name}: n={stats['count']} p50={stats['p50']:.1f} p90={stats['p90']:.1f} "
+                  f"p99={stats['p99']:.1f} max={stats['max']:.1f}")
+        if path:
+            try:
+                with open(path, 'w') as f:
+                    json.dump({'summary': summary, 'input_to_launch_ms': [s * 1000 for s in self.input_to_launch],
+                               'input_to_frame_ms': [s * 1000 for s in self.input_to_frame]}, f)
+                print(f"Latency samples written to {path}")
+            except OSError as error:
+                print(f"Latency samples not written: {error}")
+
+class QualityGovernor:
+    """Trades cosmetic detail for frame time.
+    
+    Watches how long recent frames took to update and draw, steps down a tier when the
+    average runs over the frame budget and back up only after a longer stretch well under
+    it, so the picture does not flicker between tiers. Only drawing reads the tier.
+    """
+    TIERS = [
+        # name, trail points (player, defensive), explosion rings, city window detail, stars, share of particles spawned
+        {'name': 'HIGH', 'missile_trail': 15, 'defensive_trail': 10, 'explosion_rings': 4, 'city_windows': 2, 'stars': 50,
+         'particles': 1.0},
+        {'name': 'MEDIUM', 'missile_trail': 8, 'defensive_trail': 5, 'explosion_rings': 2, 'city_windows': 1, 'stars': 25,
+         'particles': 0.5},
+        {'name': 'LOW', 'missile_trail': 3, 'defensive_trail': 2, 'explosion_rings': 1, 'city_windows': 0, 'stars': 0,
+         'particles': 0.25},
+    ]
+    
+    def __init__(self, budget_ms=1000 / FPS, window=30):
+        self.budget_ms = budget_ms
+        self.window = window  # Frames per averaging window
+        self.downgrade_ms = budget_ms * 0.9
+        self.upgrade_ms = budget_ms * 0.5
+        self.upgrade_windows = 4  # Consecutive fast windows needed before stepping back up
+        self.tier = 0
+        self.pinned = False
+        self.frame_ms = 0.0
+        self.frames = 0
+        self.fast_windows = 0
+        self.average_ms = 0.0
+        self.changes = 0
+        
+        forced = os.environ.get('TRUE_LIBERATOR_QUALITY', '').upper()  # Pin a tier, e.g. for captures
+        for i, tier in enumerate(self.TIERS):
+            if tier['name'] == forced:
+                self.tier = i
+                self.pinned = True
+                
+    @property
+    def settings(self):
+        return self.TIERS[self.tier]
+        
+    @property
+    def tier_name(self):
+        return self.TIERS[self.tier]['name']
+        
+    def record(self, work_ms):
+        """Feed the time one frame spent updating and drawing, not sleeping"""
+        self.frame_ms += work_ms
+        self.frames += 1
+        if self.frames < self.window:
+            return
+        self.average_ms = self.frame_ms / self.frames
+        self.frame_ms = 0.0
+        self.frames = 0
+        if self.pinned:
+            return
+        if self.average_ms > self.downgrade_ms:
+            self.fast_windows = 0
+            if self.tier < len(self.TIERS) - 1:
+                self.tier += 1
+                self.changes += 1
+        elif self.average_ms < self.upgrade_ms:
+            self.fast_windows += 1
+            if self.fast_windows >= self.upgrade_windows and self.tier > 0:
+                self.tier -= 1
+                self.changes += 1
+                self.fast_windows = 0
+        else:
+            self.fast_windows = 0
+
 class HighScoreManager:
     def __init__(self):
         self.scores_file = "high_scores.json"
+        self.writer = None  # Optional async_loop.SaveWriter that writes the file off the frame
+        self.leaderboard = None  # Optional async_loop.LeaderboardClient that new scores are sent to
         self.high_scores = self.load_scores()
         
     def load_scores(self):
@@ -94,6 +397,9 @@ class HighScoreManager:
     def save_scores(self, scores=None):
         try:
             scores_to_save = scores if scores else self.high_scores
+            if self.writer:
+                self.writer.submit(self.scores_file, json.dumps(scores_to_save, indent=2).encode())
+                return
             with open(self.scores_file, 'w') as f:
                 json.dump(scores_to_save, f, indent=2)
         except:
@@ -107,23 +413,41 @@ class HighScoreManager:
         self.high_scores = self.high_scores[:10]  # Keep top 10
         # print(f"DEBUG: High scores after adding: {[entry['name'] for entry in self.high_scores[:3]]}")
         self.save_scores()
+        if self.leaderboard:
+            self.leaderboard.submit(new_entry)
         
     def is_high_score(self, score):
         return len(self.high_scores) < 10 or score > self.high_scores[-1]["score"]
 
+IDLE_TIMEOUT_MS = 1000  # Longest a static screen sleeps before looking around again
+
+def wait_for_events(timeout_ms):
+    """Sleep until input arrives or timeout_ms passes, then return every pending event"""
+    event = pygame.event.wait(max(0, int(timeout_ms)))
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+    
+def changes_screen(events):
+    """Whether any of the events may change a static screen (mouse movement never does)"""
+    return any(event.type != pygame.MOUSEMOTION for event in events)
+
 class NameEntryScreen:
     def __init__(self, screen, score, difficulty):
         self.screen = screen
+        self.font_large = ASSETS.font(48)
+        self.font_medium = ASSETS.font(36)
+        self.font_small = ASSETS.font(28)
+        self.max_name_length = 10
+        self.cursor_blink_rate = 500  # milliseconds
+        self.reset(score, difficulty)
+        
+    def reset(self, score, difficulty):
         self.score = score
         self.difficulty = difficulty
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_small = pygame.font.Font(None, 28)
         self.player_name = ""
-        self.max_name_length = 10
         self.cursor_visible = True
         self.cursor_timer = 0
-        self.cursor_blink_rate = 500  # milliseconds
         
     def handle_events(self, event):
         if event.type == pygame.KEYDOWN:
@@ -147,11 +471,17 @@ class NameEntryScreen:
         return ('CONTINUE', None)
         
     def update(self):
-        # Update cursor blinking
+        """Blink the cursor; returns True when the screen needs redrawing"""
         current_time = pygame.time.get_ticks()
         if current_time - self.cursor_timer > self.cursor_blink_rate:
             self.cursor_visible = not self.cursor_visible
             self.cursor_timer = current_time
+            return True
+        return False
+        
+    def idle_timeout(self):
+        """Milliseconds until the cursor next blinks"""
+        return self.cursor_blink_rate - (pygame.time.get_ticks() - self.cursor_timer) + 1
             
     def draw(self):
         self.screen.fill(BLACK)
@@ -221,49 +551,36 @@ class NameEntryScreen:
 class MenuScreen:
     def __init__(self, screen):
         self.screen = screen
-        self.font_large = pygame.font.Font(None, 72)
-        self.font_medium = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 32)
+        self.font_large = ASSETS.font(72)
+        self.font_medium = ASSETS.font(48)
+        self.font_small = ASSETS.font(32)
         self.selected_difficulty = 'NORMAL'
         self.menu_state = 'MAIN'  # MAIN, DIFFICULTY, HIGH_SCORES
-        self.high_score_manager = HighScoreManager()
+        self.high_score_manager = ASSETS.high_scores()
+        self.saved = None  # savegame.peek() of the autosave, as of saved_writes save writes
+        self.saved_writes = None
         
-        # Create menu music
-        self.menu_music = self.create_menu_music()
+        # Menu music is synthesized in the background so the first frame isn't held up
+        self.menu_music = None
         self.music_playing = False
+        self.music_requested = False
+        ASSETS.preload_sound('menu_music')
         
-    def create_menu_music(self):
-        """Create Terminator-inspired chiptune music"""
-        try:
-            import numpy
-            sample_rate = 22050
-            duration = 4.0  # 4 second loop
-            frames = int(duration * sample_rate)
-            arr = numpy.zeros((frames, 2))
-            
-            # Terminator-inspired bass line (simplified)
-            bass_notes = [110, 110, 146.83, 110, 98, 110, 130.81, 110]  # A2, A2, D3, A2, G2, A2, C3, A2
-            note_duration = frames // len(bass_notes)
-            
-            for note_idx, freq in enumerate(bass_notes):
-                start_frame = note_idx * note_duration
-                end_frame = min(start_frame + note_duration, frames)
-                
-                for i in range(start_frame, end_frame):
-                    t = (i - start_frame) / sample_rate
-                    # Square wave for retro sound
-                    wave = 1024 * (1 if numpy.sin(2 * numpy.pi * freq * t) > 0 else -1)
-                    # Add some decay
-                    envelope = max(0.1, 1 - t * 1.5)
-                    wave *= envelope
-                    arr[i][0] = wave
-                    arr[i][1] = wave
-                    
-            return pygame.sndarray.make_sound(arr.astype(numpy.int16))
-        except:
-            return None
+    def update(self):
+        # Pick up the menu music once its samples are ready
+        if self.menu_music is None:
+            self.menu_music = ASSETS.sound('menu_music', wait=False)
+        if self.music_requested:
+            self.start_music()
+            
+    def idle_timeout(self):
+        """How long the menu may sleep; it keeps polling while the music is still being synthesized"""
+        if self.music_requested and 'menu_music' not in ASSETS.sounds:
+            return 1000 // FPS
+        return IDLE_TIMEOUT_MS
             
     def start_music(self):
+        self.music_requested = True
         if self.menu_music and not self.music_playing:
             try:
                 pygame.mixer.Sound.play(self.menu_music, loops=-1)  # Loop indefinitely
@@ -272,6 +589,7 @@ class MenuScreen:
                 pass
                 
     def stop_music(self):
+        self.music_requested = False
         if self.music_playing:
             try:
                 pygame.mixer.stop()
@@ -279,6 +597,17 @@ class MenuScreen:
             except:
                 pass
                 
+    def saved_game(self):
+        """(difficulty, wave, score) of the autosave, or None; the file is only read again after a save is written"""
+        if self.saved_writes != savegame.writes:
+            self.saved_writes = savegame.writes
+            self.saved = savegame.peek(AUTOSAVE_FILE)
+        return self.saved
+        
+    def refresh_saved_game(self):
+        """Read the autosave again on next use, e.g. when the menu is entered"""
+        self.saved_writes = None
+        
     def reset_high_scores(self):
         """Reset high scores to default pre-populated values"""
         default_scores = [
@@ -303,6 +632,8 @@ class MenuScreen:
                     self.menu_state = 'DIFFICULTY'
                 elif event.key == pygame.K_2:
                     self.menu_state = 'HIGH_SCORES'
+                elif event.key == pygame.K_3 and self.saved_game():
+                    return 'RESUME_GAME'
                 elif event.key == pygame.K_ESCAPE:
                     return 'QUIT'
             elif self.menu_state == 'DIFFICULTY':
@@ -361,6 +692,10 @@ class MenuScreen:
             "2 - HIGH SCORES",
             "ESC - QUIT"
         ]
+        saved = self.saved_game()
+        if saved:
+            difficulty, wave, score = saved
+            options.insert(2, f"3 - RESUME {difficulty} WAVE {wave}")
         
         for i, option in enumerate(options):
             text = self.font_small.render(option, True, WHITE)
@@ -385,20 +720,20 @@ class MenuScreen:
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 250 + i * 80))
             self.screen.blit(text, text_rect)
             
-            desc_text = pygame.font.Font(None, 20).render(desc, True, WHITE)
+            desc_text = ASSETS.font(20).render(desc, True, WHITE)
             desc_rect = desc_text.get_rect(center=(SCREEN_WIDTH//2, 275 + i * 80))
             self.screen.blit(desc_text, desc_rect)
             
         # Additional info
-        info_text = pygame.font.Font(None, 18).render("Hard mode: explosions can only destroy single targets!", True, RED)
+        info_text = ASSETS.font(18).render("Hard mode: explosions can only destroy single targets!", True, RED)
         info_rect = info_text.get_rect(center=(SCREEN_WIDTH//2, 430))
         self.screen.blit(info_text, info_rect)
         
-        info_text2 = pygame.font.Font(None, 18).render("Defensive missiles have proximity fuses (30px radius)!", True, CYAN)
+        info_text2 = ASSETS.font(18).render("Defensive missiles have proximity fuses (30px radius)!", True, CYAN)
         info_rect2 = info_text2.get_rect(center=(SCREEN_WIDTH//2, 450))
         self.screen.blit(info_text2, info_rect2)
         
-        info_text3 = pygame.font.Font(None, 18).render("Hard mode has larger defensive explosions!", True, RED)
+        info_text3 = ASSETS.font(18).render("Hard mode has larger defensive explosions!", True, RED)
         info_rect3 = info_text3.get_rect(center=(SCREEN_WIDTH//2, 470))
         self.screen.blit(info_text3, info_rect3)
             
@@ -408,9 +743,6 @@ class MenuScreen:
         self.screen.blit(back_text, back_rect)
         
     def draw_high_scores(self):
-        # Reload high scores to ensure we have the latest data
-        self.high_score_manager.high_scores = self.high_score_manager.load_scores()
-        
         # Title
         title = self.font_medium.render("HIGH SCORES", True, GREEN)
         title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 80))
@@ -437,7 +769,7 @@ class MenuScreen:
                 color = RED
                 
             score_line = f"{rank} {name} {score}    {difficulty}"
-            text = pygame.font.Font(None, 28).render(score_line, True, color)
+            text = ASSETS.font(28).render(score_line, True, color)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 170 + i * 30))
             self.screen.blit(text, text_rect)
             
@@ -464,8 +796,8 @@ class MissileLauncher:
         self.color = GREEN
         self.missiles_remaining = missile_limit
         self.max_missiles = missile_limit
-        self.last_shot_time = 0
         self.shot_cooldown = cooldown
+        self.last_shot_time = -cooldown - 1  # Loaded and ready when the game starts
         
     def can_shoot(self, current_time):
         return (self.missiles_remaining > 0 and 
@@ -482,19 +814,54 @@ class MissileLauncher:
         """Reload missiles after a delay"""
         self.missiles_remaining = self.max_missiles
         
-    def draw(self, screen):
+    def bounding_box(self):
+        """World rectangle (left, top, right, bottom) covered by draw(), barrel and count included"""
+        return (self.x - self.width//2, self.y - 15, self.x + self.width//2, self.y + 45)
+        
+    def draw(self, screen, offset=(0, 0)):
+        x = self.x - offset[0]
+        y = self.y - offset[1]
         # Draw launcher base
-        pygame.draw.rect(screen, self.color, (self.x - self.width//2, self.y, self.width, self.height))
+        pygame.draw.rect(screen, self.color, (x - self.width//2, y, self.width, self.height))
         # Draw launcher barrel
-        pygame.draw.rect(screen, self.color, (self.x - 3, self.y - 15, 6, 15))
+        pygame.draw.rect(screen, self.color, (x - 3, y - 15, 6, 15))
         
         # Draw missile count
-        font = pygame.font.Font(None, 20)
+        font = ASSETS.font(20)
         text = font.render(str(self.missiles_remaining), True, WHITE)
-        screen.blit(text, (self.x - 5, self.y + 25))
+        screen.blit(text, (x - 5, y + 25))
+
+class EntityPool:
+    """Free list of retired entities of one type, recycled through their reset() method"""
+    def __init__(self, entity_class):
+        self.entity_class = entity_class
+        self.free = []
+        
+    def acquire(self, *args):
+        if self.free:
+            entity = self.free.pop()
+            entity.reset(*args)
+            return entity
+        return self.entity_class(*args)
+        
+    def release(self, entity):
+        self.free.append(entity)
+        
+    def release_all(self, entities):
+        self.free.extend(entities)
+        entities.clear()
 
 class Missile:
-    def __init__(self, start_x, start_y, target_x, target_y):
+    __slots__ = ('start_x', 'start_y', 'x', 'y', 'target_x', 'target_y', 'distance', 'speed',
+                 'dx', 'dy', 'steps', 'done_step', 'trail', 'active', 'uid', 'world_height')
+                 
+    def __init__(self, start_x, start_y, target_x, target_y, world=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.trail = []
+        self.uid = 0  # Assigned by Game so network clients can track entities across snapshots
+        self.reset(start_x, start_y, target_x, target_y, world)
+        
+    def reset(self, start_x, start_y, target_x, target_y, world=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.world_height = world[1]  # Missiles that fall past the ground are gone
         self.start_x = start_x
         self.start_y = start_y
         self.x = start_x
@@ -504,13 +871,19 @@ class Missile:
         
         # Calculate direction and speed
         distance = math.sqrt((target_x - start_x)**2 + (target_y - start_y)**2)
+        self.distance = distance
         self.speed = 3
         self.dx = (target_x - start_x) / distance * self.speed
         self.dy = (target_y - start_y) / distance * self.speed
+        self.steps = 0  # Position is start + steps * (dx, dy), so jumps land exactly where stepping would
+        self.done_step = None
         
-        self.trail = []
+        self.trail.clear()
         self.active = True
         
+    def position_at(self, steps):
+        return (self.start_x + self.dx * steps, self.start_y + self.dy * steps)
+        
     def update(self):
         if not self.active:
             return
@@ -521,35 +894,75 @@ class Missile:
             self.trail.pop(0)
             
         # Move missile
-        self.x += self.dx
-        self.y += self.dy
+        x, y = self.x, self.y
+        self.steps += 1
+        self.x, self.y = self.position_at(self.steps)
         
-        # Check if reached target
-        if abs(self.x - self.target_x) < 5 and abs(self.y - self.target_y) < 5:
+        # Check if reached target anywhere along this step
+        if self.reached_target_between(x, y, self.x, self.y):
             self.active = False
             return True  # Hit target
         
-        # Check if missile went off screen
-        if self.y > SCREEN_HEIGHT:
+        # Check if missile left the world
+        if self.y > self.world_height:
             self.active = False
             
         return False
         
-    def draw(self, screen):
+    def reached_target(self, x, y):
+        return abs(x - self.target_x) < 5 and abs(y - self.target_y) < 5
+        
+    def reached_target_between(self, x0, y0, x1, y1):
+        """Whether the step from (x0, y0) to (x1, y1) passes through the arrival box, however long the step"""
+        return _segment_enters_box(x0, y0, x1, y1, self.target_x, self.target_y, 5)
+        
+    def steps_until_done(self):
+        """Number of update() calls until this missile arrives or leaves the world"""
+        if self.done_step is None:
+            # Arrival needs to be within 5px on both axes, i.e. closer than 5*sqrt(2) along the flight line
+            step = max(1, int((self.distance - 8) / self.speed))
+            if self.dy > 0:
+                step = min(step, max(1, int((self.world_height - self.start_y) / self.dy) - 1))
+            while True:
+                x, y = self.position_at(step)
+                if self.reached_target_between(*self.position_at(step - 1), x, y) or y > self.world_height:
+                    break
+                step += 1
+            self.done_step = step
+        return self.done_step - self.steps
+        
+    def advance(self, ticks):
+        """Jump ticks quiet steps ahead, leaving the same state as calling update() that many times"""
+        _advance_trail(self, ticks, 15)
+        
+    def bounding_box(self):
+        """World rectangle (left, top, right, bottom) covering the head and trail"""
+        x, y = self.trail[0] if self.trail else (self.x, self.y)
+        return (min(x, self.x) - 3, min(y, self.y) - 3, max(x, self.x) + 3, max(y, self.y) + 3)
+        
+    def draw(self, screen, trail_points=15, offset=(0, 0)):
         if not self.active:
             return
+        ox, oy = offset  # Camera position; everything is drawn relative to it
             
         # Draw trail
-        for i, pos in enumerate(self.trail):
-            alpha = i / len(self.trail)
+        trail = self.trail if len(self.trail) <= trail_points else self.trail[-trail_points:]
+        for i, (x, y) in enumerate(trail):
+            alpha = i / len(trail)
             color = (int(255 * alpha), int(255 * alpha), 0)
-            pygame.draw.circle(screen, color, pos, max(1, int(3 * alpha)))
+            pygame.draw.circle(screen, color, (x - ox, y - oy), max(1, int(3 * alpha)))
             
         # Draw missile head
-        pygame.draw.circle(screen, YELLOW, (int(self.x), int(self.y)), 3)
+        pygame.draw.circle(screen, YELLOW, (int(self.x) - ox, int(self.y) - oy), 3)
 
 class Explosion:
+    __slots__ = ('x', 'y', 'radius', 'max_radius', 'growth_rate', 'active', 'is_defensive', 'uid')
+    
     def __init__(self, x, y, max_radius=50, is_defensive=False):
+        self.uid = 0
+        self.reset(x, y, max_radius, is_defensive)
+        
+    def reset(self, x, y, max_radius=50, is_defensive=False):
         self.x = x
         self.y = y
         self.radius = 0
@@ -566,9 +979,20 @@ class Explosion:
         if self.radius >= self.max_radius:
             self.active = False
             
-    def draw(self, screen):
+    def ticks_remaining(self):
+        """Number of update() calls until the explosion burns out"""
+        return max(1, math.ceil((self.max_radius - self.radius) / self.growth_rate))
+        
+    def advance(self, ticks):
+        self.radius += self.growth_rate * ticks
+            
+    def bounding_box(self):
+        return (self.x - self.radius, self.y - self.radius, self.x + self.radius, self.y + self.radius)
+        
+    def draw(self, screen, rings=4, offset=(0, 0)):
         if not self.active:
             return
+        ox, oy = offset
             
         # Draw expanding explosion circles
         if self.is_defensive:
@@ -578,49 +1002,64 @@ class Explosion:
             # Red/orange colors for player explosions
             colors = [RED, ORANGE, YELLOW, WHITE]
             
-        for i, color in enumerate(colors):
+        for i, color in enumerate(colors[:rings]):
             r = max(0, self.radius - i * 5)
             if r > 0:
-                pygame.draw.circle(screen, color, (int(self.x), int(self.y)), int(r), 2)
+                pygame.draw.circle(screen, color, (int(self.x) - ox, int(self.y) - oy), int(r), 2)
 
 class DefensiveMissileBase:
-    def __init__(self, x, y, difficulty='NORMAL'):
+    def __init__(self, x, y, difficulty='NORMAL', settings=None, world=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        settings = settings or DIFFICULTY_SETTINGS[difficulty]
         self.x = x
         self.y = y
+        self.world = world  # Interceptors leaving these bounds are lost
         self.width = 30
         self.height = 15
         self.destroyed = False
         self.color = RED
-        self.missiles_remaining = DIFFICULTY_SETTINGS[difficulty]['missile_count']
+        self.missiles_remaining = settings['missile_count']
         self.max_missiles = self.missiles_remaining
-        self.last_shot_time = 0
-        self.shot_cooldown = DIFFICULTY_SETTINGS[difficulty]['shot_cooldown']
+        self.shot_cooldown = settings['shot_cooldown']
+        self.last_shot_time = -self.shot_cooldown - 1  # Ready when the game starts
         
-    def draw(self, screen):
+    def draw(self, screen, offset=(0, 0)):
+        x = self.x - offset[0]
+        y = self.y - offset[1]
         if self.destroyed:
             # Draw destroyed base
-            pygame.draw.rect(screen, (100, 0, 0), (self.x - self.width//2, self.y, self.width, self.height))
+            pygame.draw.rect(screen, (100, 0, 0), (x - self.width//2, y, self.width, self.height))
             return
             
         # Draw active base
-        pygame.draw.rect(screen, self.color, (self.x - self.width//2, self.y, self.width, self.height))
+        pygame.draw.rect(screen, self.color, (x - self.width//2, y, self.width, self.height))
         # Draw missile count
-        font = pygame.font.Font(None, 20)
+        font = ASSETS.font(20)
         text = font.render(str(self.missiles_remaining), True, WHITE)
-        screen.blit(text, (self.x - 5, self.y - 20))
+        screen.blit(text, (x - 5, y - 20))
         
     def can_shoot(self, current_time):
         return (not self.destroyed and 
                 self.missiles_remaining > 0 and 
                 current_time - self.last_shot_time > self.shot_cooldown)
                 
-    def shoot(self, target_x, target_y, current_time):
+    def ready_time(self):
+        """Earliest time at which can_shoot() turns true, or None if the base is out of action"""
+        if self.destroyed or self.missiles_remaining <= 0:
+            return None
+        return self.last_shot_time + self.shot_cooldown + 1
+                
+    def shoot(self, target_x, target_y, current_time, pool=None):
         if self.can_shoot(current_time):
             self.missiles_remaining -= 1
             self.last_shot_time = current_time
-            return DefensiveMissile(self.x, self.y, target_x, target_y)
+            if pool is not None:
+                return pool.acquire(self.x, self.y, target_x, target_y, self.world)
+            return DefensiveMissile(self.x, self.y, target_x, target_y, self.world)
         return None
         
+    def bounding_box(self):
+        return (self.x - self.width//2, self.y - 20, self.x + self.width//2, self.y + self.height)
+        
     def check_hit(self, x, y, radius):
         if self.destroyed:
             return False
@@ -632,7 +1071,17 @@ class DefensiveMissileBase:
         return False
 
 class DefensiveMissile:
-    def __init__(self, start_x, start_y, target_x, target_y):
+    __slots__ = ('start_x', 'start_y', 'x', 'y', 'target_x', 'target_y', 'distance', 'speed',
+                 'dx', 'dy', 'steps', 'done_step', 'trail', 'active', 'proximity_fuse_radius', 'uid', 'target_uid',
+                 'world_width', 'world_height')
+                 
+    def __init__(self, start_x, start_y, target_x, target_y, world=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.trail = []
+        self.uid = 0  # Assigned by Game so network clients can track entities across snapshots
+        self.reset(start_x, start_y, target_x, target_y, world)
+        
+    def reset(self, start_x, start_y, target_x, target_y, world=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.world_width, self.world_height = world
         self.start_x = start_x
         self.start_y = start_y
         self.x = start_x
@@ -642,15 +1091,24 @@ class DefensiveMissile:
         
         # Calculate direction and speed (faster than player missiles)
         distance = math.sqrt((target_x - start_x)**2 + (target_y - start_y)**2)
+        self.distance = distance
         self.speed = 4
         self.dx = (target_x - start_x) / distance * self.speed
         self.dy = (target_y - start_y) / distance * self.speed
+        self.steps = 0
+        self.done_step = None
         
-        self.trail = []
+        self.trail.clear()
         self.active = True
         self.proximity_fuse_radius = 30  # Consistent 30-pixel radius for all difficulties
+        self.target_uid = 0  # uid of the player missile the AI aimed this at, 0 if none
+        
+    def position_at(self, steps):
+        return (self.start_x + self.dx * steps, self.start_y + self.dy * steps)
         
-    def update(self, player_missiles):
+    def update(self, fused=False):
+        """Move one step; fused says whether a player missile came within fuse range during it,
+        as found for every pair at once by swept_fuses()"""
         if not self.active:
             return False
             
@@ -660,40 +1118,379 @@ class DefensiveMissile:
             self.trail.pop(0)
             
         # Move missile
-        self.x += self.dx
-        self.y += self.dy
-        
-        # Check proximity fuse - explode if close to any player missile
-        for player_missile in player_missiles:
-            if player_missile.active:
-                distance = math.sqrt((self.x - player_missile.x)**2 + (self.y - player_missile.y)**2)
-                if distance <= self.proximity_fuse_radius:
-                    self.active = False
-                    return True  # Proximity detonation
-        
-        # Check if reached target (backup detonation)
-        if abs(self.x - self.target_x) < 8 and abs(self.y - self.target_y) < 8:
+        x, y = self.x, self.y
+        self.steps += 1
+        self.x, self.y = self.position_at(self.steps)
+        
+        # Proximity fuse - explode if a player missile came close
+        if fused:
+            self.active = False
+            return True  # Proximity detonation
+        
+        # Check if reached target anywhere along this step (backup detonation)
+        if self.reached_target_between(x, y, self.x, self.y):
             self.active = False
             return True  # Hit target
         
-        # Check if missile went off screen
-        if self.y < 0 or self.y > SCREEN_HEIGHT or self.x < 0 or self.x > SCREEN_WIDTH:
+        # Check if missile left the world
+        if self.off_screen(self.x, self.y):
             self.active = False
             
         return False
         
-    def draw(self, screen):
+    def reached_target(self, x, y):
+        return abs(x - self.target_x) < 8 and abs(y - self.target_y) < 8
+        
+    def reached_target_between(self, x0, y0, x1, y1):
+        return _segment_enters_box(x0, y0, x1, y1, self.target_x, self.target_y, 8)
+        
+    def off_screen(self, x, y):
+        return y < 0 or y > self.world_height or x < 0 or x > self.world_width
+        
+    def steps_until_done(self):
+        """Number of update() calls until this missile reaches its target or leaves the world.
+        
+        Proximity detonations depend on the player missiles and are bounded by the caller.
+        """
+        if self.done_step is None:
+            # Arrival needs to be within 8px on both axes, i.e. closer than 8*sqrt(2) along the flight line
+            step = max(1, int((self.distance - 12) / self.speed))
+            for start, delta, limit in ((self.start_x, self.dx, self.world_width),
+                                        (self.start_y, self.dy, self.world_height)):
+                if delta > 0:
+                    step = min(step, max(1, int((limit - start) / delta) - 1))
+                elif delta < 0:
+                    step = min(step, max(1, int(start / -delta) - 1))
+            while True:
+                x, y = self.position_at(step)
+                if self.reached_target_between(*self.position_at(step - 1), x, y) or self.off_screen(x, y):
+                    break
+                step += 1
+            self.done_step = step
+        return self.done_step - self.steps
+        
+    def advance(self, ticks):
+        """Jump ticks quiet steps ahead, leaving the same state as calling update() that many times"""
+        _advance_trail(self, ticks, 10)
+        
+    def bounding_box(self):
+        x, y = self.trail[0] if self.trail else (self.x, self.y)
+        return (min(x, self.x) - 2, min(y, self.y) - 2, max(x, self.x) + 2, max(y, self.y) + 2)
+        
+    def draw(self, screen, trail_points=10, offset=(0, 0)):
         if not self.active:
             return
+        ox, oy = offset
             
         # Draw trail (red/orange for defensive missiles)
-        for i, pos in enumerate(self.trail):
-            alpha = i / len(self.trail)
+        trail = self.trail if len(self.trail) <= trail_points else self.trail[-trail_points:]
+        for i, (x, y) in enumerate(trail):
+            alpha = i / len(trail)
             color = (int(255 * alpha), int(100 * alpha), 0)
-            pygame.draw.circle(screen, color, pos, max(1, int(2 * alpha)))
+            pygame.draw.circle(screen, color, (x - ox, y - oy), max(1, int(2 * alpha)))
             
         # Draw missile head
-        pygame.draw.circle(screen, RED, (int(self.x), int(self.y)), 2)
+        pygame.draw.circle(screen, RED, (int(self.x) - ox, int(self.y) - oy), 2)
+
+def compact_entities(entities, pool, released=None):
+    """Drop inactive entities in place, keeping order, and hand them back to their pool.
+    
+    released, if given, is called with each entity before it goes back.
+    """
+    kept = 0
+    for entity in entities:
+        if entity.active:
+            entities[kept] = entity
+            kept += 1
+        else:
+            if released:
+                released(entity)
+            pool.release(entity)
+    del entities[kept:]
+    
+def _copy_entity(entity):
+    """Copy of a slotted entity with its own trail, bypassing __init__"""
+    entity_class = type(entity)
+    other = entity_class.__new__(entity_class)
+    for name in entity_class.__slots__:
+        setattr(other, name, getattr(entity, name))
+    if hasattr(entity, 'trail'):
+        other.trail = entity.trail.copy()
+    return other
+    
+def _copy_unit(unit):
+    """Copy of a launcher, base or city; their attributes are all immutable values"""
+    other = object.__new__(type(unit))
+    other.__dict__.update(unit.__dict__)
+    return other
+    
+def collect_garbage():
+    """Run a full collection now and freeze the survivors.
+    
+    Frozen objects are skipped by later collections, so the generation-2 passes that
+    would otherwise walk every long-lived object in the middle of a wave stay cheap.
+    """
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
+    
+def _advance_trail(missile, ticks, trail_length):
+    """Move a missile ticks steps along its flight line, keeping the trail update() would have left"""
+    first_step = max(missile.steps, missile.steps + ticks - trail_length)
+    missile.steps += ticks
+    missile.x, missile.y = missile.position_at(missile.steps)
+    if ticks < trail_length:
+        del missile.trail[:max(0, len(missile.trail) + ticks - trail_length)]
+    else:
+        missile.trail.clear()
+    # Same arithmetic as position_at(), without a call per point
+    start_x, start_y, dx, dy = missile.start_x, missile.start_y, missile.dx, missile.dy
+    missile.trail += [(int(start_x + dx * step), int(start_y + dy * step)) for step in range(first_step, missile.steps)]
+        
+def _first_contact(px, py, vx, vy, radius, growth=0):
+    """First step k >= 0 at which a point at p + k*v may come within radius + k*growth of the origin.
+    
+    Returns math.inf if it never does. The answer may be early, but never late.
+    """
+    a = vx * vx + vy * vy - growth * growth
+    b = 2 * (px * vx + py * vy - radius * growth)
+    c = px * px + py * py - radius * radius
+    if c <= 0:
+        return 0
+    if a <= 0:
+        # The circle grows at least as fast as the point moves - fall back to a triangle-inequality bound
+        closing_speed = math.sqrt(vx * vx + vy * vy) + growth
+        if closing_speed == 0:
+            return math.inf
+        gap = math.sqrt(px * px + py * py) - radius - 1e-6
+        return max(0, math.floor(gap / closing_speed))
+    discriminant = b * b - 4 * a * c
+    if discriminant < 0:
+        return math.inf
+    root = (-b - math.sqrt(discriminant)) / (2 * a)
+    if root < 0:
+        return math.inf  # Closest approach is already behind us
+    return max(0, math.floor(root - 1e-6))  # Margin for float rounding in the distance checks
+    
+def _segment_enters_box(x0, y0, x1, y1, center_x, center_y, half):
+    """Whether the segment from (x0, y0) to (x1, y1) passes through the open square of half-width half around the center"""
+    if abs(x1 - center_x) < half and abs(y1 - center_y) < half:
+        return True  # Ends inside - the common case, and exactly the old end-of-step test
+    if abs(x1 - center_x) >= half + abs(x1 - x0) or abs(y1 - center_y) >= half + abs(y1 - y0):
+        return False  # Too far away for this step to have reached the square
+    # Clip the segment against the square one axis at a time (slab test)
+    enter, leave = 0.0, 1.0
+    for start, end, center in ((x0, x1, center_x), (y0, y1, center_y)):
+        delta = end - start
+        if delta == 0:
+            if abs(start - center) >= half:
+                return False
+            continue
+        low = (center - half - start) / delta
+        high = (center + half - start) / delta
+        enter = max(enter, min(low, high))
+        leave = min(leave, max(low, high))
+        if enter >= leave:
+            return False
+    return True
+    
+VECTOR_PAIRS = 48  # Pairs from which a batched NumPy collision pass beats a plain loop
+
+def swept_distances(x0, y0, x1, y1):
+    """Closest approach to the origin of each segment from (x0, y0) to (x1, y1), elementwise over arrays.
+    
+    With relative positions at the start and end of a tick this is how close two objects moving
+    in straight lines came during the tick, so nothing can pass through a radius between samples.
+    """
+    vx = x1 - x0
+    vy = y1 - y0
+    length2 = vx * vx + vy * vy
+    t = numpy.clip(-(x0 * vx + y0 * vy) / numpy.where(length2 > 0, length2, 1), 0, 1)
+    closest_x = x0 + t * vx
+    closest_y = y0 + t * vy
+    # The end point is included exactly, so a contact the old end-of-tick test saw is always seen
+    return numpy.sqrt(numpy.minimum(closest_x * closest_x + closest_y * closest_y, x1 * x1 + y1 * y1))
+    
+def _swept_distance(x0, y0, x1, y1):
+    """swept_distances() for a single segment, with the same arithmetic"""
+    vx = x1 - x0
+    vy = y1 - y0
+    length2 = vx * vx + vy * vy
+    t = min(max(-(x0 * vx + y0 * vy) / (length2 if length2 > 0 else 1), 0), 1)
+    closest_x = x0 + t * vx
+    closest_y = y0 + t * vy
+    return math.sqrt(min(closest_x * closest_x + closest_y * closest_y, x1 * x1 + y1 * y1))
+    
+def _step_table(entities, ahead):
+    """Start and end points of the step each entity took last tick (ahead=0) or takes next (ahead=1), as arrays"""
+    start_x, start_y, dx, dy, steps = numpy.array([(entity.start_x, entity.start_y, entity.dx, entity.dy,
+                                                    entity.steps + ahead) for entity in entities], dtype=float).T
+    return start_x + dx * (steps - 1), start_y + dy * (steps - 1), start_x + dx * steps, start_y + dy * steps
+    
+def swept_fuses(d_missiles, missiles):
+    """For each defensive missile, whether its next step takes it within fuse range of a player missile.
+    
+    Player missiles must already have taken their step for this tick; every pair is tested
+    along the whole stretch both cover in the tick. Many pairs are tested in one batched
+    NumPy pass, a few in a loop with the same arithmetic, which is cheaper at that size.
+    """
+    missiles = [missile for missile in missiles if missile.active]
+    if not d_missiles or not missiles:
+        return [False] * len(d_missiles)
+    if len(d_missiles) * len(missiles) >= VECTOR_PAIRS:
+        mx0, my0, mx1, my1 = _step_table(missiles, 0)
+        x0, y0, x1, y1 = (column[:, None] for column in _step_table(d_missiles, 1))
+        radius = numpy.array([d_missile.proximity_fuse_radius for d_missile in d_missiles])[:, None]
+        return (swept_distances(x0 - mx0, y0 - my0, x1 - mx1, y1 - my1) <= radius).any(axis=1).tolist()
+    steps = [(missile.position_at(missile.steps - 1), missile.x, missile.y, missile.speed) for missile in missiles]
+    fuses = []
+    for d_missile in d_missiles:
+        x1, y1 = d_missile.position_at(d_missile.steps + 1)
+        radius = d_missile.proximity_fuse_radius
+        fused = False
+        for (mx0, my0), mx1, my1, speed in steps:
+            # Relative to each other the pair moves at most speed + speed per tick (plus rounding slack)
+            reach = radius + speed + d_missile.speed + 1
+            if abs(x1 - mx1) > reach or abs(y1 - my1) > reach:
+                continue
+            if _swept_distance(d_missile.x - mx0, d_missile.y - my0, x1 - mx1, y1 - my1) <= radius:
+                fused = True
+                break
+        fuses.append(fused)
+    return fuses
+    
+def swept_interceptions(explosions, missiles):
+    """For each explosion, the indices of the player missiles whose last step passed inside it"""
+    if not explosions or not missiles:
+        return [()] * len(explosions)
+    if len(explosions) * len(missiles) >= VECTOR_PAIRS:
+        mx0, my0, mx1, my1 = _step_table(missiles, 0)
+        x, y, radius = (column[:, None] for column in numpy.array(
+            [(explosion.x, explosion.y, explosion.radius) for explosion in explosions], dtype=float).T)
+        return [numpy.flatnonzero(row).tolist() for row in swept_distances(mx0 - x, my0 - y, mx1 - x, my1 - y) < radius]
+    steps = [(missile.position_at(missile.steps - 1), missile.x, missile.y, missile.speed) for missile in missiles]
+    caught = []
+    for explosion in explosions:
+        x, y, radius = explosion.x, explosion.y, explosion.radius
+        inside = []
+        for index, ((mx0, my0), mx1, my1, speed) in enumerate(steps):
+            reach = radius + speed + 1
+            if abs(mx1 - x) > reach or abs(my1 - y) > reach:
+                continue
+            if _swept_distance(mx0 - x, my0 - y, mx1 - x, my1 - y) < radius:
+                inside.append(index)
+        caught.append(inside)
+    return caught
+    
+def _ticks_to_touch(gap, speed):
+    """First tick (1-based) at which a gap shrinking by at most speed per tick may drop below zero"""
+    gap -= 1e-6
+    if gap < 0:
+        return 1
+    return math.floor(gap / speed) + 1
+
+def solve_assignment(cost):
+    """Minimum-cost matching of rows to columns (Hungarian algorithm with potentials).
+    
+    cost is a list of equally long rows and may be rectangular; min(rows, columns) pairs
+    are matched. Returns a list of (row, column) pairs sorted by row.
+    """
+    if not cost or not cost[0]:
+        return []
+    transposed = len(cost) > len(cost[0])
+    if transposed:
+        cost = [list(column) for column in zip(*cost)]
+    n, m = len(cost), len(cost[0])
+    
+    # 1-based arrays as in the classic formulation; column 0 is a virtual start column
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)  # Row matched to each column
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        match[0] = row
+        column = 0
+        min_slack = [math.inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[column] = True
+            current_row = match[column]
+            delta = math.inf
+            next_column = 0
+            row_cost = cost[current_row - 1]
+            u_row = u[current_row]
+            for j in range(1, m + 1):
+                if not used[j]:
+                    slack = row_cost[j - 1] - u_row - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = column
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        next_column = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            column = next_column
+            if match[column] == 0:
+                break
+        # Flip the augmenting path back to the start column
+        while column:
+            previous = way[column]
+            match[column] = match[previous]
+            column = previous
+            
+    pairs = [(match[j] - 1, j - 1) for j in range(1, m + 1) if match[j]]
+    if transposed:
+        pairs = [(column, row) for row, column in pairs]
+    return sorted(pairs)
+
+UNREACHABLE_COST = 1e9  # Cost of a base and missile pair that cannot meet
+
+def parse_world(text):
+    """(columns, rows) of screens from a size such as '3x2', or the single screen if text is empty or invalid"""
+    try:
+        columns, rows = (int(part) for part in text.lower().split('x'))
+    except (AttributeError, ValueError):
+        return (1, 1)
+    return (min(max(columns, 1), WORLD_MAX), min(max(rows, 1), WORLD_MAX))
+
+class SpatialGrid:
+    """Uniform grid of buckets over the world, for finding what overlaps a rectangle.
+    
+    Items go into every cell their bounding box touches, so a query only looks at the
+    cells under the rectangle, however large the world is.
+    """
+    def __init__(self, cell_size=200):
+        self.cell_size = cell_size
+        self.cells = {}
+        
+    def clear(self):
+        self.cells.clear()
+        
+    def insert(self, item, left, top, right, bottom):
+        size = self.cell_size
+        for cell_x in range(int(left // size), int(right // size) + 1):
+            for cell_y in range(int(top // size), int(bottom // size) + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket is None:
+                    self.cells[(cell_x, cell_y)] = [item]
+                else:
+                    bucket.append(item)
+                    
+    def query(self, left, top, right, bottom):
+        """Set of items whose cells overlap the rectangle; may include some just outside it"""
+        size = self.cell_size
+        found = set()
+        for cell_x in range(int(left // size), int(right // size) + 1):
+            for cell_y in range(int(top // size), int(bottom // size) + 1):
+                bucket = self.cells.get((cell_x, cell_y))
+                if bucket:
+                    found.update(bucket)
+        return found
 
 class City:
     def __init__(self, x, y):
@@ -704,25 +1501,34 @@ class City:
         self.destroyed = False
         self.color = CYAN
         
-    def draw(self, screen):
+    def draw(self, screen, window_detail=2, offset=(0, 0)):
+        y = self.y - offset[1]
         if self.destroyed:
+            # Rubble where the buildings stood
+            for i in range(3):
+                pygame.draw.rect(screen, (70, 70, 70), (self.x - offset[0] + i * 20, y - 6 + (i % 2) * 2, 18, 6 - (i % 2) * 2))
             return
             
         # Draw city buildings
         for i in range(3):
-            building_x = self.x + i * 20
+            building_x = self.x - offset[0] + i * 20
             building_height = random.randint(20, 35) if not hasattr(self, 'building_heights') else self.building_heights[i]
             if not hasattr(self, 'building_heights'):
                 if not hasattr(self, 'building_heights'):
                     self.building_heights = [random.randint(20, 35) for _ in range(3)]
-            pygame.draw.rect(screen, self.color, (building_x, self.y - self.building_heights[i], 18, self.building_heights[i]))
+            pygame.draw.rect(screen, self.color, (building_x, y - self.building_heights[i], 18, self.building_heights[i]))
             
-            # Draw windows
-            for row in range(0, self.building_heights[i], 8):
+            # Draw windows (every other row at reduced detail, none at the lowest)
+            if window_detail == 0:
+                continue
+            for row in range(0, self.building_heights[i], 8 if window_detail == 2 else 16):
                 for col in range(2, 16, 6):
                     if random.random() > 0.3:  # Some windows are lit
-                        pygame.draw.rect(screen, YELLOW, (building_x + col, self.y - self.building_heights[i] + row + 2, 2, 3))
+                        pygame.draw.rect(screen, YELLOW, (building_x + col, y - self.building_heights[i] + row + 2, 2, 3))
     
+    def bounding_box(self):
+        return (self.x, self.y - 35, self.x + 58, self.y)  # Three 18px buildings, up to 35px tall
+        
     def check_hit(self, x, y, radius):
         if self.destroyed:
             return False
@@ -738,61 +1544,135 @@ class City:
         return False
 
 class Game:
-    def __init__(self, difficulty='NORMAL'):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("True Liberator")
+    def __init__(self, difficulty='NORMAL', headless=False, seed=None, ai_defense=True, settings=None, world=(1, 1),
+                 telemetry=None):
+        # Headless games skip the display, fonts and sounds so they can be simulated as fast as possible
+        self.headless = headless
+        # Battlefield size in screens across and down; anything above one screen scrolls
+        self.world = world
+        # With ai_defense off the bases only fire through defend(), e.g. for a human defender
+        self.ai_defense = ai_defense
+        self.next_uid = 1
+        self.spectators = None  # Optional SpectatorPublisher, fed once per tick by run()
+        self.simulation = None  # Optional SimulationProcess; when set this Game only mirrors and draws it
+        self.quality = QualityGovernor()  # Cosmetic detail tier, lowered when frames run long
+        self.planner = InterceptPlanner()  # Cached intercept solutions for the AI defence
+        self.show_threat_map = False  # Toggled with T
+        self.threat_overlay = None  # (key, surface) of the threat map as last drawn
+        self.latency = LatencyProbe() if os.environ.get('TRUE_LIBERATOR_LATENCY') else None
+        # Inputs are only kept when someone will replay them; otherwise the list grows for the whole game
+        self.record_inputs = bool(os.environ.get('TRUE_LIBERATOR_RECORD_DIR'))
+        self.autosave_path = None  # Set to save the full game state at every new wave
+        self.writer = None  # Optional async_loop.SaveWriter that takes over writing and removing saves
+        self.telemetry = telemetry  # Optional telemetry.TelemetryLog that gameplay events are emitted into
+        if not headless:
+            self.screen = ASSETS.display()
+            self.font = ASSETS.font(36)
+            self.sfx = ASSETS.sound_engine()
+            self.high_score_manager = ASSETS.high_scores()
+            self.particles = ParticleSystem(ground=SCREEN_HEIGHT - 18)
+            # Frame captures on F9 or TRUE_LIBERATOR_PROFILE; AI planning gets a phase of its own
+            self.profiler = profiler.FrameProfiler.from_environment({Game.update_ai_defense.__code__: 'ai'})
+        else:
+            self.screen = None
+            self.font = None
+            self.sfx = None
+            self.high_score_manager = None
+            self.particles = None
+            self.profiler = None
         self.clock = pygame.time.Clock()
-        self.difficulty = difficulty
-        self.difficulty_settings = DIFFICULTY_SETTINGS[difficulty]
         
-        # Game objects
-        self.launchers = [
-            MissileLauncher(200, 50, 
-                          self.difficulty_settings['player_missile_limit'], 
-                          self.difficulty_settings['player_cooldown']),
-            MissileLauncher(600, 50, 
-                          self.difficulty_settings['player_missile_limit'], 
-                          self.difficulty_settings['player_cooldown'])
-        ]
+        self.missiles = []
+        self.defensive_missiles = []
+        self.explosions = []
         
-        # Defensive missile bases (edge-center-edge positioning)
-        self.defensive_bases = [
-            DefensiveMissileBase(50, SCREEN_HEIGHT - 80, difficulty),      # Left edge
-            DefensiveMissileBase(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 80, difficulty),  # Center
-            DefensiveMissileBase(SCREEN_WIDTH - 50, SCREEN_HEIGHT - 80, difficulty)   # Right edge
-        ]
+        # Retired entities are recycled instead of reallocated every launch and detonation
+        self.missile_pool = EntityPool(Missile)
+        self.defensive_missile_pool = EntityPool(DefensiveMissile)
+        self.explosion_pool = EntityPool(Explosion)
         
-        # Cities positioned evenly between bases
-        self.cities = []
+        # Rendering only looks up what is under the camera: launchers, bases and cities are
+        # indexed once per game, missiles and explosions tested against the view as they are drawn
+        self.static_index = SpatialGrid()
         
-        # First 3 cities between base 1 (50px) and base 2 (400px)
-        # Distance = 400 - 50 = 350px, divided by 4 sections = 87.5px each
-        base1_x = 50
-        base2_x = SCREEN_WIDTH // 2
-        section_width = (base2_x - base1_x * 0) / 4
-        for i in range(3):
-            city_x = base1_x - base1_x + section_width * (i + 1)
-            self.cities.append(City(city_x, SCREEN_HEIGHT - 20))
+        self.reset(difficulty, seed, settings)
         
-        # Last 3 cities between base 2 (400px) and base 3 (750px)  
-        # Distance = 750 - 400 = 350px, divided by 4 sections = 87.5px each
-        base3_x = SCREEN_WIDTH - 50
-        # section_width = (base3_x - base2_x) / 4
-        for i in range(3):
-            city_x = base2_x - base1_x + section_width * (i + 1)
-            self.cities.append(City(city_x, SCREEN_HEIGHT - 20))
-            
-        self.missiles = []
-        self.defensive_missiles = []
-        self.explosions = []
+    def reset(self, difficulty='NORMAL', seed=None, settings=None):
+        """Set up a new game, reusing this Game's entity lists, pools and assets.
+        
+        settings replaces DIFFICULTY_SETTINGS[difficulty], e.g. for candidates tried by autotune.py.
+        """
+        self.difficulty = difficulty
+        self.difficulty_settings = settings or DIFFICULTY_SETTINGS[difficulty]
+        
+        # The battlefield is a row of screens, each laid out like the original single screen, and
+        # extra rows of sky above them
+        columns, rows = self.world
+        self.world_width = SCREEN_WIDTH * columns
+        self.world_height = SCREEN_HEIGHT * rows
+        world = (self.world_width, self.world_height)
+        ground = self.world_height
+        
+        # Game objects
+        self.launchers = []
+        self.defensive_bases = []
+        self.cities = []
+        for column in range(columns):
+            left = column * SCREEN_WIDTH
+            self.launchers += [
+                MissileLauncher(left + 200, 50, 
+                              self.difficulty_settings['player_missile_limit'], 
+                              self.difficulty_settings['player_cooldown']),
+                MissileLauncher(left + 600, 50, 
+                              self.difficulty_settings['player_missile_limit'], 
+                              self.difficulty_settings['player_cooldown'])
+            ]
+            
+            # Defensive missile bases (edge-center-edge positioning)
+            self.defensive_bases += [
+                DefensiveMissileBase(left + 50, ground - 80, difficulty, self.difficulty_settings, world),      # Left edge
+                DefensiveMissileBase(left + SCREEN_WIDTH // 2, ground - 80, difficulty, self.difficulty_settings, world),  # Center
+                DefensiveMissileBase(left + SCREEN_WIDTH - 50, ground - 80, difficulty, self.difficulty_settings, world)   # Right edge
+            ]
+            
+            # Cities positioned evenly between bases
+            # First 3 cities between base 1 (50px) and base 2 (400px)
+            # Distance = 400 - 50 = 350px, divided by 4 sections = 87.5px each
+            base1_x = 50
+            base2_x = SCREEN_WIDTH // 2
+            section_width = (base2_x - base1_x * 0) / 4
+            for i in range(3):
+                city_x = left + section_width * (i + 1)
+                self.cities.append(City(city_x, ground - 20))
+            
+            # Last 3 cities between base 2 (400px) and base 3 (750px)  
+            # Distance = 750 - 400 = 350px, divided by 4 sections = 87.5px each
+            for i in range(3):
+                city_x = left + base2_x - base1_x + section_width * (i + 1)
+                self.cities.append(City(city_x, ground - 20))
+                
+        self.static_index.clear()
+        for kind, units in enumerate((self.launchers, self.defensive_bases, self.cities)):
+            for index, unit in enumerate(units):
+                self.static_index.insert((kind, index), *unit.bounding_box())
+        
+        # Start over the cities at the bottom left
+        self.camera_x = 0
+        self.camera_y = self.world_height - SCREEN_HEIGHT
+        if self.particles:
+            self.particles.clear()
+            self.particles.ground = ground - 18  # Just below the cities' base line
+            
+        self.missile_pool.release_all(self.missiles)
+        self.defensive_missile_pool.release_all(self.defensive_missiles)
+        self.explosion_pool.release_all(self.explosions)
+        self.planner.clear()
         
         self.score = 0
-        self.font = pygame.font.Font(None, 36)
         self.game_over = False
         self.victory = False
         self.show_victory_screen = False
         self.wave = 1
-        self.high_score_manager = HighScoreManager()
         
         # AI parameters from difficulty settings
         self.ai_accuracy = self.difficulty_settings['ai_accuracy']
@@ -800,17 +1680,38 @@ class Game:
         self.ai_reaction_chance = self.difficulty_settings['ai_reaction_chance']
         self.player_explosion_radius = self.difficulty_settings['player_explosion_radius']
         self.defensive_explosion_radius = self.difficulty_settings['defensive_explosion_radius']
+        self.coverage = CoverageField(self.defensive_bases, self.ai_range, world)
         
         # Launcher reload timer
         self.last_reload_time = 0
         self.reload_interval = 10000  # 10 seconds
         
-        # Generate simple beep sound
-        self.create_sounds()
+        # Simulation clock - advances one frame per update so headless runs are deterministic
+        self.frame = 0
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.rng_capture = None  # (rng, frame, state) reused by fork()
+        
+        # Player inputs by frame; with the seed they are enough to replay the whole game
+        self.session_events = []
+        self.resumed = False  # Set when loaded from a save, which the seed and inputs can't replay
+        
+        if self.telemetry:
+            self.telemetry.emit(0, telemetry.GAME_START, telemetry.DIFFICULTIES.index(difficulty), 0, self.seed,
+                                self.world_width, self.world_height)
+            self.telemetry.emit(0, telemetry.WAVE_START, self.wave)
+        
+        if not self.headless:
+            collect_garbage()
+            
+    def current_time(self):
+        """Simulation time in milliseconds"""
+        return self.frame * 1000 // FPS
         
     def start_new_wave(self):
         """Start a new wave with increased difficulty"""
         self.wave += 1
+        settings = self.difficulty_settings
         
         # Restore cities
         for city in self.cities:
@@ -819,29 +1720,40 @@ class Game:
         # Restore and upgrade defensive bases
         for base in self.defensive_bases:
             base.destroyed = False
-            base.missiles_remaining = min(base.max_missiles + self.wave, 20)  # Increase missiles
+            base.missiles_remaining = min(base.max_missiles + self.wave, settings['max_base_missiles'])  # Increase missiles
             base.max_missiles = base.missiles_remaining
             # Decrease cooldown (make AI faster)
-            base.shot_cooldown = max(base.shot_cooldown - 200, 300)
+            base.shot_cooldown = max(base.shot_cooldown - settings['wave_cooldown_step'], settings['min_shot_cooldown'])
+        self.coverage = self.coverage.rebuilt()
             
         # Reset launchers
         for launcher in self.launchers:
             launcher.reload()
             
         # Increase AI difficulty
-        self.ai_accuracy = min(self.ai_accuracy + 0.02, 0.95)  # Increase accuracy
-        self.ai_reaction_chance = min(self.ai_reaction_chance + 0.05, 0.8)  # Increase reaction
+        self.ai_accuracy = min(self.ai_accuracy + settings['wave_accuracy_step'], settings['max_ai_accuracy'])  # Increase accuracy
+        self.ai_reaction_chance = min(self.ai_reaction_chance + settings['wave_reaction_step'],
+                                      settings['max_ai_reaction_chance'])  # Increase reaction
         
         # Clear missiles and explosions
-        self.missiles.clear()
-        self.defensive_missiles.clear()
-        self.explosions.clear()
+        self.missile_pool.release_all(self.missiles)
+        self.defensive_missile_pool.release_all(self.defensive_missiles)
+        self.explosion_pool.release_all(self.explosions)
+        self.planner.clear()
         
         # Reset timers
-        self.last_reload_time = pygame.time.get_ticks()
+        self.last_reload_time = self.current_time()
         
         # Wave bonus
         self.score += self.wave * 500
+        if self.telemetry:
+            self.telemetry.emit(self.frame, telemetry.WAVE_START, self.wave, 0, self.score)
+        
+        # Between waves is the one place a full collection can't cause a visible hitch
+        if not self.headless:
+            collect_garbage()
+        if self.autosave_path:
+            self.autosave()
         
     def check_game_over(self):
         cities_left = sum(1 for city in self.cities if not city.destroyed)
@@ -849,6 +1761,8 @@ class Game:
         # Check if all cities are destroyed (wave complete)
         if cities_left == 0:
             self.victory = True
+            if self.telemetry:
+                self.telemetry.emit(self.frame, telemetry.WAVE_END, self.wave, 0, self.score)
             
             # Check if this is a milestone wave (every 10 waves)
             if self.wave % 10 == 0:
@@ -868,18 +1782,17 @@ class Game:
         if total_missiles_available == 0 and missiles_in_flight == 0 and explosions_active == 0:
             # Player is out of missiles and cities remain - game over
             self.game_over = True
+            if self.telemetry:
+                self.telemetry.emit(self.frame, telemetry.GAME_OVER, self.wave, 0, self.score)
                 
     def draw_victory_screen(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(ASSETS.overlay(), (0, 0))
         
         title = self.font.render("MISSION ACCOMPLISHED!", True, GREEN)
         title_rect = title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 80))
         self.screen.blit(title, title_rect)
         
-        subtitle = pygame.font.Font(None, 32).render(f"Wave {self.wave} Complete!", True, YELLOW)
+        subtitle = ASSETS.font(32).render(f"Wave {self.wave} Complete!", True, YELLOW)
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 40))
         self.screen.blit(subtitle, subtitle_rect)
         
@@ -888,36 +1801,33 @@ class Game:
         self.screen.blit(score_text, score_rect)
         
         # Show options
-        option1 = pygame.font.Font(None, 28).render("1. CONTINUE PLAYING", True, GREEN)
+        option1 = ASSETS.font(28).render("1. CONTINUE PLAYING", True, GREEN)
         option1_rect = option1.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
         self.screen.blit(option1, option1_rect)
         
         if self.high_score_manager.is_high_score(self.score):
-            option2 = pygame.font.Font(None, 28).render("2. ENTER HIGH SCORE", True, PURPLE)
+            option2 = ASSETS.font(28).render("2. ENTER HIGH SCORE", True, PURPLE)
             option2_rect = option2.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 80))
             self.screen.blit(option2, option2_rect)
             
-            option3 = pygame.font.Font(None, 28).render("3. QUIT TO TITLE", True, WHITE)
+            option3 = ASSETS.font(28).render("3. QUIT TO TITLE", True, WHITE)
             option3_rect = option3.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 110))
             self.screen.blit(option3, option3_rect)
         else:
-            option2 = pygame.font.Font(None, 28).render("2. QUIT TO TITLE", True, WHITE)
+            option2 = ASSETS.font(28).render("2. QUIT TO TITLE", True, WHITE)
             option2_rect = option2.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 80))
             self.screen.blit(option2, option2_rect)
             
         # Instructions
-        inst_text = pygame.font.Font(None, 20).render("Press the number key for your choice", True, CYAN)
+        inst_text = ASSETS.font(20).render("Press the number key for your choice", True, CYAN)
         inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150))
         self.screen.blit(inst_text, inst_rect)
         
     def draw_game_over(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(ASSETS.overlay(), (0, 0))
         
         title = self.font.render("THE END", True, RED)
-        subtitle = pygame.font.Font(None, 28).render("The cities could not be liberated!", True, YELLOW)
+        subtitle = ASSETS.font(28).render("The cities could not be liberated!", True, YELLOW)
             
         title_rect = title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 10))
@@ -929,29 +1839,26 @@ class Game:
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 30))
         self.screen.blit(score_text, score_rect)
         
-        wave_text = pygame.font.Font(None, 28).render(f"Waves Completed: {self.wave - 1}", True, CYAN)
+        wave_text = ASSETS.font(28).render(f"Waves Completed: {self.wave - 1}", True, CYAN)
         wave_rect = wave_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 60))
         self.screen.blit(wave_text, wave_rect)
         
-        difficulty_text = pygame.font.Font(None, 24).render(f"Difficulty: {self.difficulty}", True, CYAN)
+        difficulty_text = ASSETS.font(24).render(f"Difficulty: {self.difficulty}", True, CYAN)
         difficulty_rect = difficulty_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 90))
         self.screen.blit(difficulty_text, difficulty_rect)
         
         if self.high_score_manager.is_high_score(self.score):
-            high_score_text = pygame.font.Font(None, 28).render("NEW HIGH SCORE!", True, PURPLE)
+            high_score_text = ASSETS.font(28).render("NEW HIGH SCORE!", True, PURPLE)
             high_score_rect = high_score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 120))
             self.screen.blit(high_score_text, high_score_rect)
         
-        continue_text = pygame.font.Font(None, 24).render("Press SPACE to continue or ESC to quit", True, WHITE)
+        continue_text = ASSETS.font(24).render("Press SPACE to continue or ESC to quit", True, WHITE)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150))
         self.screen.blit(continue_text, continue_rect)
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(ASSETS.overlay(), (0, 0))
         
         title = self.font.render("THE END", True, RED)
-        subtitle = pygame.font.Font(None, 28).render("The cities could not be liberated!", True, YELLOW)
+        subtitle = ASSETS.font(28).render("The cities could not be liberated!", True, YELLOW)
             
         title_rect = title.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
         subtitle_rect = subtitle.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 10))
@@ -963,43 +1870,23 @@ class Game:
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 30))
         self.screen.blit(score_text, score_rect)
         
-        wave_text = pygame.font.Font(None, 28).render(f"Waves Completed: {self.wave - 1}", True, CYAN)
+        wave_text = ASSETS.font(28).render(f"Waves Completed: {self.wave - 1}", True, CYAN)
         wave_rect = wave_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 60))
         self.screen.blit(wave_text, wave_rect)
         
-        difficulty_text = pygame.font.Font(None, 24).render(f"Difficulty: {self.difficulty}", True, CYAN)
+        difficulty_text = ASSETS.font(24).render(f"Difficulty: {self.difficulty}", True, CYAN)
         difficulty_rect = difficulty_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 90))
         self.screen.blit(difficulty_text, difficulty_rect)
         
         if self.high_score_manager.is_high_score(self.score):
-            high_score_text = pygame.font.Font(None, 28).render("NEW HIGH SCORE!", True, PURPLE)
+            high_score_text = ASSETS.font(28).render("NEW HIGH SCORE!", True, PURPLE)
             high_score_rect = high_score_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 120))
             self.screen.blit(high_score_text, high_score_rect)
         
-        continue_text = pygame.font.Font(None, 24).render("Press SPACE to continue or ESC to quit", True, WHITE)
+        continue_text = ASSETS.font(24).render("Press SPACE to continue or ESC to quit", True, WHITE)
         continue_rect = continue_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 150))
         self.screen.blit(continue_text, continue_rect)
         
-    def create_sounds(self):
-        # Create simple retro sounds using pygame
-        try:
-            # Create a simple beep sound
-            sample_rate = 22050
-            duration = 0.1
-            frequency = 440
-            
-            frames = int(duration * sample_rate)
-            arr = numpy.zeros((frames, 2))
-            
-            for i in range(frames):
-                wave = 4096 * numpy.sin(2 * numpy.pi * frequency * i / sample_rate)
-                arr[i][0] = wave
-                arr[i][1] = wave
-                
-            self.launch_sound = pygame.sndarray.make_sound(arr.astype(numpy.int16))
-        except:
-            self.launch_sound = None
-            
     def create_menu_music(self):
         """Create Terminator-inspired chiptune music"""
         try:
@@ -1031,17 +1918,21 @@ class Game:
             return None
             
     def handle_events(self):
+        if self.latency:
+            self.latency.events_polled()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
                 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and self.profiler:
+                self.profiler.toggle()
+                continue
+                
             if event.type == pygame.KEYDOWN:
                 if self.show_victory_screen:
                     if event.key == pygame.K_1:
                         # Continue playing
-                        self.show_victory_screen = False
-                        self.start_new_wave()
-                        self.victory = False
+                        self.continue_after_victory()
                     elif event.key == pygame.K_2:
                         if self.high_score_manager.is_high_score(self.score):
                             # Enter high score with name entry
@@ -1062,18 +1953,36 @@ class Game:
                     elif event.key == pygame.K_ESCAPE:
                         return False
                         
+                elif event.key == pygame.K_t:
+                    self.show_threat_map = not self.show_threat_map
+                        
             if event.type == pygame.MOUSEBUTTONDOWN and not self.game_over and not self.show_victory_screen:
                 if event.button == 1:  # Left click
-                    mouse_x, mouse_y = pygame.mouse.get_pos()
-                    self.launch_missile(mouse_x, mouse_y)
+                    # Aim where the click happened, not where the mouse is by the time we get here
+                    mouse_x, mouse_y = event.pos
+                    if self.scrolls() and self.minimap_rect().collidepoint(event.pos):
+                        self.jump_camera(mouse_x, mouse_y)
+                    elif self.launch_missile(mouse_x + self.camera_x, mouse_y + self.camera_y) and self.latency:
+                        self.latency.launched(event)
                     
         return True
         
+    def continue_after_victory(self):
+        if self.simulation:
+            self.simulation.send('continue')
+            return
+        if self.record_inputs:
+            self.session_events.append((self.frame, 'continue'))
+        self.show_victory_screen = False
+        self.start_new_wave()
+        self.victory = False
+        
     def update(self):
         if self.game_over or self.show_victory_screen:
             return
             
-        current_time = pygame.time.get_ticks()
+        self.frame += 1
+        current_time = self.current_time()
         
         # Reload launchers periodically
         # if current_time - self.last_reload_time > self.reload_interval:
@@ -1082,60 +1991,305 @@ class Game:
         #     self.last_reload_time = current_time
             
         # Update AI defense
-        self.update_ai_defense()
+        if self.ai_defense:
+            self.update_ai_defense()
         
         # Update player missiles
-        for missile in self.missiles[:]:
+        for missile in self.missiles:
             hit = missile.update()
             if hit:
                 # Create explosion
-                explosion = Explosion(missile.target_x, missile.target_y)
+                explosion = self.register(self.explosion_pool.acquire(missile.target_x, missile.target_y))
                 self.explosions.append(explosion)
-                self.missiles.remove(missile)
-            elif not missile.active:
-                self.missiles.remove(missile)
+                if self.telemetry:
+                    self.telemetry.emit(self.frame, telemetry.DETONATION, -1, missile.uid, explosion.uid,
+                                        missile.x, missile.y)
+                if self.sfx:
+                    self.sfx.play('detonation', missile.target_x - self.camera_x)
+                self.burst(missile.target_x, missile.target_y, fire=14, smoke=4, upward=False)
+        compact_entities(self.missiles, self.missile_pool, self.forget_missile)
                 
-        # Update defensive missiles
-        for d_missile in self.defensive_missiles[:]:
-            hit = d_missile.update(self.missiles)  # Pass player missiles for proximity detection
+        # Update defensive missiles, with the proximity fuses of all of them tested at once
+        for d_missile, fused in zip(self.defensive_missiles, swept_fuses(self.defensive_missiles, self.missiles)):
+            hit = d_missile.update(fused)
             if hit:
                 # Create smaller defensive explosion
-                explosion = Explosion(d_missile.x, d_missile.y, self.defensive_explosion_radius, True)
+                explosion = self.register(self.explosion_pool.acquire(d_missile.x, d_missile.y,
+                                                                      self.defensive_explosion_radius, True))
                 self.explosions.append(explosion)
-                self.defensive_missiles.remove(d_missile)
-            elif not d_missile.active:
-                self.defensive_missiles.remove(d_missile)
+                if self.telemetry:
+                    self.telemetry.emit(self.frame, telemetry.PROXIMITY, fused, d_missile.uid, explosion.uid,
+                                        d_missile.x, d_missile.y)
+                if self.sfx:
+                    self.sfx.play('intercept', d_missile.x - self.camera_x)
+                self.burst(d_missile.x, d_missile.y, fire=8, upward=False)
+        compact_entities(self.defensive_missiles, self.defensive_missile_pool)
                 
         # Update explosions and check for hits
-        for explosion in self.explosions[:]:
+        for explosion in self.explosions:
             explosion.update()
-            if not explosion.active:
-                self.explosions.remove(explosion)
-            else:
+        caught = swept_interceptions(self.explosions, self.missiles)
+        for explosion, inside in zip(self.explosions, caught):
+            if explosion.active:
                 # Check for city hits
                 for city in self.cities:
                     if city.check_hit(explosion.x, explosion.y, explosion.radius):
                         self.score += 100
+                        if self.telemetry:
+                            self.telemetry.emit(self.frame, telemetry.CITY_HIT, self.cities.index(city), explosion.uid, 0,
+                                                city.x + city.width // 2, city.y - 20)
+                        if self.sfx:
+                            self.sfx.play('city_hit', city.x + city.width // 2 - self.camera_x)
+                        self.burst(city.x + city.width // 2, city.y - 10, debris=40, smoke=30, fire=25, spread=city.width)
                         
                 # Check for defensive base hits
                 for base in self.defensive_bases:
                     if base.check_hit(explosion.x, explosion.y, explosion.radius):
                         self.score += 200  # Bonus for destroying defensive bases
+                        self.coverage = self.coverage.rebuilt()
+                        if self.telemetry:
+                            self.telemetry.emit(self.frame, telemetry.BASE_HIT, self.defensive_bases.index(base),
+                                                explosion.uid, 0, base.x, base.y)
+                        if self.sfx:
+                            self.sfx.play('base_hit', base.x - self.camera_x)
+                        self.burst(base.x, base.y, debris=30, smoke=20, fire=20, spread=base.width)
                         
-                # Check for missile interceptions
-                for missile in self.missiles[:]:
+                # Check for missile interceptions anywhere along the step each missile took
+                for missile_index in inside:
+                    missile = self.missiles[missile_index]
                     if missile.active:
-                        distance = math.sqrt((missile.x - explosion.x)**2 + (missile.y - explosion.y)**2)
-                        if distance < explosion.radius:
-                            missile.active = False
-                            self.missiles.remove(missile)
-                            # self.score += 50  # Bonus for intercepted missile
+                        missile.active = False
+                        if self.telemetry:
+                            self.telemetry.emit(self.frame, telemetry.INTERCEPTION, -1, missile.uid, explosion.uid,
+                                                missile.x, missile.y)
+                        # self.score += 50  # Bonus for intercepted missile
+        compact_entities(self.explosions, self.explosion_pool)
+        compact_entities(self.missiles, self.missile_pool, self.forget_missile)
                             
         # Check for game over conditions
         self.check_game_over()
         
+    def quiet_ticks(self):
+        """Number of upcoming update() calls guaranteed to do nothing but move missiles and grow explosions.
+        
+        A quiet tick launches nothing, detonates nothing, hits nothing and draws no random numbers,
+        so it can be skipped with advance_quiet_ticks(). Every bound here is conservative: the
+        returned count may stop short of the next event, but never past it.
+        """
+        if self.game_over or self.show_victory_screen:
+            return 0
+        if not any(not city.destroyed for city in self.cities):
+            return 0
+        if (not self.missiles and not any(not exp.is_defensive for exp in self.explosions) and
+                sum(launcher.missiles_remaining for launcher in self.launchers) == 0):
+            return 0
+            
+        # First tick at which something may happen; everything before it is quiet
+        next_event = math.inf
+        
+        # AI defense - a base fires (and draws random numbers) only when it is ready and has an intercept
+        # solution for a missile no interceptor is chasing yet
+        if self.missiles and self.ai_defense:
+            next_event = min(next_event, self.ticks_until_ai_fires())
+            if next_event <= 1:
+                return 0
+                    
+        # Player missiles arrive or leave the screen
+        for missile in self.missiles:
+            next_event = min(next_event, missile.steps_until_done())
+            
+        # Defensive missiles reach their target, leave the world or come within proximity fuse range. The
+        # swept fuse test fires in the tick that covers the first moment of contact: a contact k ticks
+        # from now (rounded down) is seen in update k + 1 at the earliest.
+        for d_missile in self.defensive_missiles:
+            next_event = min(next_event, d_missile.steps_until_done())
+            for missile in self.missiles:
+                next_event = min(next_event, 1 + _first_contact(d_missile.x - missile.x, d_missile.y - missile.y,
+                                                                d_missile.dx - missile.dx, d_missile.dy - missile.dy,
+                                                                d_missile.proximity_fuse_radius))
+                                                                   
+        # Explosions grow into cities, bases and missiles, but only while they are active: nothing
+        # happens in the tick an explosion burns out or later. Burning out only matters when the last
+        # player explosion may end the game; otherwise advance_quiet_ticks() just drops them.
+        launchers_empty = sum(launcher.missiles_remaining for launcher in self.launchers) == 0
+        for explosion in self.explosions:
+            lifetime = explosion.ticks_remaining()
+            if launchers_empty and not explosion.is_defensive:
+                next_event = min(next_event, lifetime)
+            first_touch = math.inf
+            for city in self.cities:
+                if not city.destroyed:
+                    distance = math.sqrt((explosion.x - (city.x + city.width // 2))**2 + (explosion.y - (city.y - 20))**2)
+                    first_touch = min(first_touch, _ticks_to_touch(distance - 30 - explosion.radius, explosion.growth_rate))
+            for base in self.defensive_bases:
+                if not base.destroyed:
+                    distance = math.sqrt((explosion.x - base.x)**2 + (explosion.y - base.y)**2)
+                    first_touch = min(first_touch, _ticks_to_touch(distance - 20 - explosion.radius, explosion.growth_rate))
+            # A missile is caught when its step passes within the radius the explosion has at the end
+            # of that tick, i.e. its path comes within one tick's growth more than the continuous radius
+            for missile in self.missiles:
+                first_touch = min(first_touch, 1 + _first_contact(missile.x - explosion.x, missile.y - explosion.y,
+                                                                  missile.dx, missile.dy,
+                                                                  explosion.radius + explosion.growth_rate,
+                                                                  explosion.growth_rate))
+            if first_touch < lifetime:
+                next_event = min(next_event, first_touch)
+                
+        return next_event - 1
+        
+    def ticks_until_ai_fires(self):
+        """First upcoming update() in which update_ai_defense() may fire, or math.inf.
+        
+        The AI looks at missiles before they move, so in the t-th update from now a missile is
+        t - 1 steps further on. Until a ready base has a solution for an unchased missile it draws
+        no random numbers, and the planner's solutions for the bases that are ready now say when
+        that can first be; bases still reloading are only bounded by their reload time. Solving
+        here only fills the planner's cache with what update_ai_defense() would compute itself.
+        """
+        chased = {d_missile.target_uid for d_missile in self.defensive_missiles if d_missile.active}
+        missiles = [missile for missile in self.missiles if missile.active and missile.uid not in chased]
+        if not missiles:
+            return math.inf
+        planner = self.planner
+        window = planner.WINDOW
+        first_tick = math.inf
+        pending = []  # Pairs that may fire within the window; only these need solutions
+        for index, base in enumerate(self.defensive_bases):
+            ready_time = base.ready_time()
+            if ready_time is None:
+                continue
+            ready_tick = max(1, self.frames_until(ready_time))
+            for missile in missiles:
+                # A missile closes at most 3px per tick, so it is out of range until this tick at least
+                tick = max(ready_tick, 1 + _first_contact(missile.x - base.x, missile.y - base.y,
+                                                          missile.dx, missile.dy, self.ai_range))
+                if ready_tick == 1 and tick <= window:
+                    pending.append((index, base, missile, tick))
+                else:
+                    first_tick = min(first_tick, tick)
+        pairs = []
+        for index, base, missile, tick in pending:
+            if tick < first_tick:
+                pairs += planner.missing([(index, base)], [missile])
+        planner.solve(self, pairs)
+        for index, base, missile, tick in pending:
+            if tick < first_tick:
+                # The first solvable step the cached window shows, or the step just past the window
+                start, rows = planner.solutions[(index, missile.uid)]
+                step = start + window
+                if rows is not None:
+                    for candidate in range(missile.steps + tick - 1, start + window):
+                        if rows[candidate - start] is not None:
+                            step = candidate
+                            break
+                first_tick = min(first_tick, max(tick, step - missile.steps + 1))
+        return first_tick
+        
+    def frames_until(self, time_ms):
+        """Number of frames until current_time() reaches time_ms"""
+        frame = max(self.frame, time_ms * FPS // 1000)
+        while frame * 1000 // FPS < time_ms:
+            frame += 1
+        return frame - self.frame
+        
+    def advance_quiet_ticks(self, ticks):
+        """Skip ticks frames that quiet_ticks() has declared quiet"""
+        self.frame += ticks
+        for missile in self.missiles:
+            missile.advance(ticks)
+        for d_missile in self.defensive_missiles:
+            d_missile.advance(ticks)
+        for explosion in self.explosions:
+            explosion.advance(ticks)
+            if explosion.radius >= explosion.max_radius:
+                explosion.active = False
+        compact_entities(self.explosions, self.explosion_pool)
+        
+    def step(self):
+        """Advance the simulation by one frame without drawing"""
+        self.update()
+        
+    def fast_forward(self, max_ticks):
+        """Advance up to max_ticks frames, jumping over quiet stretches instead of single-stepping.
+        
+        The result is identical to calling update() max_ticks times. Stops early when the game
+        ends or a milestone victory screen is reached. Returns the number of frames advanced.
+        """
+        advanced = 0
+        busy_streak = 0
+        while advanced < max_ticks and not (self.game_over or self.show_victory_screen):
+            quiet = min(self.quiet_ticks(), max_ticks - advanced)
+            if quiet > 0:
+                self.advance_quiet_ticks(quiet)
+                advanced += quiet
+                busy_streak = 0
+            else:
+                busy_streak += 1
+            # Busy stretches (e.g. a ready base tracking a missile) tend to last, so single-step a
+            # growing number of frames before asking quiet_ticks() again
+            for _ in range(min(2 ** (busy_streak // 2), 8)):
+                if advanced >= max_ticks or self.game_over or self.show_victory_screen:
+                    break
+                self.update()
+                advanced += 1
+        return advanced
+        
+    def burst(self, x, y, debris=0, smoke=0, fire=0, spread=0, upward=True):
+        """Spawn debris, smoke and fire particles at (x, y), fewer at lower quality tiers"""
+        if not self.particles:
+            return
+        share = self.quality.settings['particles']
+        for kind, count in ((ParticleSystem.SMOKE, smoke), (ParticleSystem.DEBRIS, debris), (ParticleSystem.FIRE, fire)):
+            if count:
+                self.particles.spawn(kind, x, y, count * share, spread, upward)
+        
+    def fork(self):
+        """Independent headless copy of the simulation, e.g. for a bot to try out moves on.
+        
+        Entities, launchers, bases, cities and the RNG are copied; the display, sound, recording
+        and every other output are left behind, so forking costs tens of microseconds. Stepping
+        the fork gives exactly what stepping this game would, given the same inputs.
+        """
+        fork = object.__new__(Game)
+        fork.__dict__.update(self.__dict__)
+        fork.headless = True
+        fork.screen = fork.font = fork.sfx = fork.high_score_manager = fork.particles = fork.threat_overlay = fork.profiler = None
+        fork.spectators = fork.simulation = fork.latency = fork.telemetry = fork.writer = None
+        fork.record_inputs = False
+        fork.autosave_path = None
+        fork.session_events = []
+        # Random numbers are only drawn inside update(), after the frame counter moves, so every
+        # fork taken during one frame can share a single capture of the RNG state
+        if self.rng_capture is None or self.rng_capture[0] is not self.rng or self.rng_capture[1] != self.frame:
+            self.rng_capture = (self.rng, self.frame, self.rng.getstate())
+        fork.rng = random.Random.__new__(random.Random)  # Skips seeding from the OS
+        fork.rng.setstate(self.rng_capture[2])
+        fork.rng_capture = None
+        fork.missiles = [_copy_entity(missile) for missile in self.missiles]
+        fork.defensive_missiles = [_copy_entity(d_missile) for d_missile in self.defensive_missiles]
+        fork.explosions = [_copy_entity(explosion) for explosion in self.explosions]
+        fork.missile_pool = EntityPool(Missile)
+        fork.defensive_missile_pool = EntityPool(DefensiveMissile)
+        fork.explosion_pool = EntityPool(Explosion)
+        fork.launchers = [_copy_unit(launcher) for launcher in self.launchers]
+        fork.defensive_bases = [_copy_unit(base) for base in self.defensive_bases]
+        fork.cities = [_copy_unit(city) for city in self.cities]
+        # Solutions are shared until the fork launches missiles of its own under the same uids
+        fork.planner = _copy_unit(self.planner)
+        fork.planner.solutions = dict(self.planner.solutions)
+        return fork
+        
     def launch_missile(self, target_x, target_y):
-        current_time = pygame.time.get_ticks()
+        current_time = self.current_time()
+        
+        if self.simulation:
+            if self.sfx and any(launcher.can_shoot(current_time) for launcher in self.launchers):
+                self.sfx.play('launch', target_x - self.camera_x)
+            self.simulation.send('launch', target_x, target_y)
+            return True
+            
+        if self.record_inputs:
+            self.session_events.append((self.frame, 'launch', target_x, target_y))
         
         # Choose closest launcher that can shoot
         best_launcher = None
@@ -1150,109 +2304,304 @@ class Game:
         
         if best_launcher and best_launcher.shoot(current_time):
             # Create missile
-            missile = Missile(best_launcher.x, best_launcher.y, target_x, target_y)
+            missile = self.register(self.missile_pool.acquire(best_launcher.x, best_launcher.y, target_x, target_y,
+                                                              (self.world_width, self.world_height)))
             self.missiles.append(missile)
+            if self.telemetry:
+                self.telemetry.emit(self.frame, telemetry.LAUNCH, self.launchers.index(best_launcher), missile.uid, 0,
+                                    target_x, target_y)
             
             # Play launch sound
-            if self.launch_sound:
-                try:
-                    self.launch_sound.play()
-                except:
-                    pass
+            if self.sfx:
+                self.sfx.play('launch', best_launcher.x - self.camera_x)
+            return True
+        return False
                 
-    def update_ai_defense(self):
-        current_time = pygame.time.get_ticks()
+    def autosave(self):
+        """Save the full game state to autosave_path, writing the file on a background thread"""
+        data = savegame.dumps(self)
+        if self.writer:
+            self.writer.submit(self.autosave_path, data)
+            return
+        threading.Thread(target=self.write_autosave, args=(self.autosave_path, data), daemon=True).start()
         
-        # AI tries to intercept incoming missiles
-        for missile in self.missiles:
-            if not missile.active:
-                continue
-                
-            # Calculate interception point more accurately
-            # Find the best defensive base for this missile
-            best_base = None
-            best_interception_point = None
-            best_time_to_intercept = float('inf')
+    def write_autosave(self, path, data):
+        try:
+            savegame.write_atomic(path, data)
+        except:
+            pass
             
-            for base in self.defensive_bases:
-                if not base.can_shoot(current_time):
-                    continue
-                    
-                # Calculate distance to missile
-                distance_to_missile = math.sqrt((base.x - missile.x)**2 + (base.y - missile.y)**2)
-                
-                # Only consider missiles within range
-                if distance_to_missile > self.ai_range:
-                    continue
+    def discard_autosave(self):
+        if self.autosave_path and self.writer:
+            self.writer.submit(self.autosave_path, None)  # Queued behind any save still being written
+        elif self.autosave_path:
+            try:
+                savegame.remove(self.autosave_path)
+            except:
+                pass
                 
-                # Predict where to intercept the missile
-                # Calculate time for defensive missile to reach various points along missile path
-                for t in range(10, 100, 5):  # Check multiple time steps
-                    future_missile_x = missile.x + missile.dx * t
-                    future_missile_y = missile.y + missile.dy * t
-                    
-                    # Skip if missile will be off screen
-                    if future_missile_y > SCREEN_HEIGHT or future_missile_x < 0 or future_missile_x > SCREEN_WIDTH:
-                        break
-                    
-                    # Calculate time for defensive missile to reach this point
-                    distance_to_intercept = math.sqrt((base.x - future_missile_x)**2 + (base.y - future_missile_y)**2)
-                    defensive_missile_time = distance_to_intercept / 4  # Defensive missile speed is 4
-                    
-                    # If defensive missile can reach the point at roughly the same time
-                    if abs(defensive_missile_time - t) < 15:  # Allow some tolerance
-                        if t < best_time_to_intercept:
-                            best_time_to_intercept = t
-                            best_base = base
-                            # Add some inaccuracy based on difficulty
-                            accuracy_offset = 0 if random.random() < self.ai_accuracy else random.randint(-30, 30)
-                            best_interception_point = (
-                                future_missile_x + accuracy_offset,
-                                future_missile_y + accuracy_offset
-                            )
-                        break
-            
-            # Shoot at the calculated interception point
-            if best_base and best_interception_point and random.random() < self.ai_reaction_chance:
-                defensive_missile = best_base.shoot(best_interception_point[0], best_interception_point[1], current_time)
-                if defensive_missile:
-                    self.defensive_missiles.append(defensive_missile)
-                        
-    def draw(self):
-        self.screen.fill(BLACK)
+    def session_record(self):
+        """Everything needed to replay this game, as JSON-ready data"""
+        return {'version': 1, 'difficulty': self.difficulty, 'seed': self.seed, 'frames': self.frame,
+                'world': list(self.world), 'events': [list(event) for event in self.session_events]}
         
-        # Draw stars background
-        for i in range(50):
-            x = (i * 37) % SCREEN_WIDTH
-            y = (i * 23) % (SCREEN_HEIGHT // 2)
-            pygame.draw.circle(self.screen, WHITE, (x, y), 1)
-            
-        # Draw launchers
-        for launcher in self.launchers:
-            launcher.draw(self.screen)
+    def save_session(self, path):
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.session_record(), f)
+        except:
+            pass
             
-        # Draw defensive missile bases
-        for base in self.defensive_bases:
-            base.draw(self.screen)
+    def register(self, entity):
+        """Give a newly spawned entity its unique id"""
+        entity.uid = self.next_uid
+        self.next_uid += 1
+        return entity
+        
+    def defend(self, base_index, target_x, target_y):
+        """Fire an interceptor from a defensive base, on behalf of a human defender"""
+        if self.game_over or self.show_victory_screen or not 0 <= base_index < len(self.defensive_bases):
+            return False
+        base = self.defensive_bases[base_index]
+        if (target_x, target_y) == (base.x, base.y):
+            return False
+        defensive_missile = base.shoot(target_x, target_y, self.current_time(), self.defensive_missile_pool)
+        if defensive_missile:
+            self.defensive_missiles.append(self.register(defensive_missile))
+            if self.telemetry:
+                self.telemetry.emit(self.frame, telemetry.DEFENSE_LAUNCH, base_index, defensive_missile.uid, 0,
+                                    target_x, target_y)
+            return True
+        return False
+        
+    def update_ai_defense(self):
+        """Assign ready bases to incoming missiles and fire.
+        
+        All ready bases and all missiles not already being chased are planned together: a
+        bases x missiles cost matrix is filled in from the InterceptPlanner's cached solutions
+        and solved as an assignment, so two bases never spend shots on the same missile while
+        another gets through. Each base weighs up a bounded number of missiles per frame, the
+        ones it can reach soonest. Leftover frame budget goes to bases that are about to reload.
+        """
+        started = time.perf_counter()
+        current_time = self.current_time()
+        chased = {d_missile.target_uid for d_missile in self.defensive_missiles if d_missile.active}
+        missiles = [missile for missile in self.missiles if missile.active and missile.uid not in chased]
+        if not missiles:
+            return
+        planner = self.planner
+        bases = [(index, base) for index, base in enumerate(self.defensive_bases) if base.can_shoot(current_time)]
+        if bases:
+            candidates = planner.candidates(self, bases, missiles)
+            planner.solve(self, [pair for index, base in bases
+                                 for pair in planner.missing([(index, base)], candidates[index])])
+            # Only missiles some base weighs up are worth a column in the assignment
+            weighed = {missile.uid for chosen in candidates.values() for missile in chosen}
+            self.fire_interceptors(bases, [missile for missile in missiles if missile.uid in weighed],
+                                   current_time, candidates)
+        planner.plan_ahead(self, missiles, started)
+        
+    def forget_missile(self, missile):
+        """Drop the AI's solutions for a missile as it goes back to its pool"""
+        self.planner.release(missile.uid, len(self.defensive_bases))
+        
+    def fire_interceptors(self, bases, missiles, current_time, candidates=None):
+        """Pick the best missile for each ready base and fire at the planned intercept points.
+        
+        candidates maps a base index to the missiles it weighs up (see InterceptPlanner.candidates());
+        the others count as out of its reach this frame. Without it every base weighs up every missile.
+        """
+        # Prefer early intercepts with little timing error, and bases with missiles to spare
+        last_step = INTERCEPT_STEPS[-1]
+        accuracy = 0.5 + 0.5 * self.ai_accuracy
+        cost = []
+        solutions = []
+        for index, base in bases:
+            row = []
+            weighed = None if candidates is None else {missile.uid for missile in candidates[index]}
+            for missile in missiles:
+                solution = self.planner.lookup(index, missile) if weighed is None or missile.uid in weighed else None
+                solutions.append(solution)
+                if solution is None:
+                    row.append(UNREACHABLE_COST)
+                else:
+                    ticks, timing_error, _, _ = solution
+                    hit_chance = (1 - timing_error / 15) * accuracy
+                    row.append(ticks / last_step + (1 - hit_chance) + 1 / base.missiles_remaining)
+            cost.append(row)
+        if all(solution is None for solution in solutions):
+            return
             
-        # Draw cities
+        for base_index, missile_index in solve_assignment(cost):
+            if cost[base_index][missile_index] >= UNREACHABLE_COST:
+                continue
+            index, base = bases[base_index]
+            _, _, intercept_x, intercept_y = solutions[base_index * len(missiles) + missile_index]
+            # Add some inaccuracy based on difficulty
+            accuracy_offset = 0 if self.rng.random() < self.ai_accuracy else self.rng.randint(-30, 30)
+            if self.rng.random() < self.ai_reaction_chance:
+                defensive_missile = base.shoot(intercept_x + accuracy_offset, intercept_y + accuracy_offset,
+                                               current_time, self.defensive_missile_pool)
+                if defensive_missile:
+                    defensive_missile.target_uid = missiles[missile_index].uid
+                    self.defensive_missiles.append(self.register(defensive_missile))
+                    if self.telemetry:
+                        self.telemetry.emit(self.frame, telemetry.DEFENSE_LAUNCH, index, defensive_missile.uid,
+                                            defensive_missile.target_uid, defensive_missile.target_x,
+                                            defensive_missile.target_y)
+                        
+    def scrolls(self):
+        """Whether the battlefield is larger than the screen, with a camera and minimap"""
+        return self.world_width > SCREEN_WIDTH or self.world_height > SCREEN_HEIGHT
+        
+    def move_camera(self, x, y):
+        self.camera_x = int(min(max(x, 0), self.world_width - SCREEN_WIDTH))
+        self.camera_y = int(min(max(y, 0), self.world_height - SCREEN_HEIGHT))
+        
+    def scroll_camera(self):
+        """Scroll with the arrow keys or WASD, or while the mouse rests against a window edge"""
+        if not self.scrolls():
+            return
+        keys = pygame.key.get_pressed()
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        edges = pygame.mouse.get_focused()
+        right = keys[pygame.K_RIGHT] or keys[pygame.K_d] or (edges and mouse_x >= SCREEN_WIDTH - SCROLL_EDGE)
+        left = keys[pygame.K_LEFT] or keys[pygame.K_a] or (edges and mouse_x < SCROLL_EDGE)
+        down = keys[pygame.K_DOWN] or keys[pygame.K_s] or (edges and mouse_y >= SCREEN_HEIGHT - SCROLL_EDGE)
+        up = keys[pygame.K_UP] or keys[pygame.K_w] or (edges and mouse_y < SCROLL_EDGE)
+        self.move_camera(self.camera_x + (bool(right) - bool(left)) * SCROLL_SPEED,
+                         self.camera_y + (bool(down) - bool(up)) * SCROLL_SPEED)
+        
+    def minimap_rect(self):
+        """Screen rectangle of the minimap, in the top right corner, scaled to fit the world"""
+        scale = MINIMAP_WIDTH / max(self.world_width, self.world_height)
+        width = int(self.world_width * scale)
+        return pygame.Rect(SCREEN_WIDTH - width - 10, 10, width, int(self.world_height * scale))
+        
+    def jump_camera(self, x, y):
+        """Center the camera on the world point under screen position (x, y) of the minimap"""
+        rect = self.minimap_rect()
+        scale = self.world_width / rect.width
+        self.move_camera((x - rect.x) * scale - SCREEN_WIDTH // 2, (y - rect.y) * scale - SCREEN_HEIGHT // 2)
+        
+    def draw_minimap(self):
+        """Whole battlefield at a glance: units, missiles and the part the camera shows"""
+        rect = self.minimap_rect()
+        scale = rect.width / self.world_width
+        pygame.draw.rect(self.screen, BLACK, rect)
         for city in self.cities:
-            city.draw(self.screen)
-            
-        # Draw player missiles
-        for missile in self.missiles:
-            missile.draw(self.screen)
-            
-        # Draw defensive missiles
-        for d_missile in self.defensive_missiles:
-            d_missile.draw(self.screen)
-            
-        # Draw explosions
+            if not city.destroyed:
+                pygame.draw.rect(self.screen, CYAN, (rect.x + int((city.x + 20) * scale), rect.y + int(city.y * scale) - 2, 3, 2))
+        for base in self.defensive_bases:
+            color = (100, 0, 0) if base.destroyed else RED
+            pygame.draw.rect(self.screen, color, (rect.x + int(base.x * scale) - 1, rect.y + int(base.y * scale) - 1, 3, 3))
+        for launcher in self.launchers:
+            pygame.draw.rect(self.screen, GREEN, (rect.x + int(launcher.x * scale) - 1, rect.y + int(launcher.y * scale), 3, 2))
+        for missiles, color in ((self.missiles, YELLOW), (self.defensive_missiles, ORANGE)):
+            for missile in missiles:
+                self.screen.set_at((rect.x + int(missile.x * scale), rect.y + int(missile.y * scale)), color)
         for explosion in self.explosions:
-            explosion.draw(self.screen)
+            if explosion.active:
+                pygame.draw.circle(self.screen, CYAN if explosion.is_defensive else RED,
+                                   (rect.x + int(explosion.x * scale), rect.y + int(explosion.y * scale)),
+                                   max(1, int(explosion.radius * scale)), 1)
+        pygame.draw.rect(self.screen, WHITE, (rect.x + int(self.camera_x * scale), rect.y + int(self.camera_y * scale),
+                                              int(SCREEN_WIDTH * scale), int(SCREEN_HEIGHT * scale)), 1)
+        pygame.draw.rect(self.screen, GREEN, rect, 1)
+        
+    def draw_threat_map(self):
+        """Tint what the standing bases can reach: redder where they get there sooner, yellower where several can.
+        
+        The tinted cells under the camera are scaled up once and kept until the camera crosses
+        into another cell or the bases change.
+        """
+        if self.coverage.stale():
+            self.coverage = self.coverage.rebuilt()  # Bases changed outside update(), e.g. in a mirrored game
+        column = self.camera_x // COVERAGE_CELL
+        row = self.camera_y // COVERAGE_CELL
+        key = (self.coverage, column, row)
+        if self.threat_overlay is None or self.threat_overlay[0] != key:
+            earliest, count = self.coverage.threat_map()
+            view = (slice(column, column + SCREEN_WIDTH // COVERAGE_CELL + 1),
+                    slice(row, row + SCREEN_HEIGHT // COVERAGE_CELL + 1))
+            earliest = earliest[view]
+            count = count[view].astype(int)
+            covered = count > 0
+            closeness = numpy.where(covered, 1 - earliest / (self.ai_range / 4), 0)
+            # Dim colours, added onto the mostly black sky rather than alpha blended, which is far cheaper
+            colors = numpy.zeros(earliest.shape + (3,), dtype=numpy.uint8)
+            colors[:, :, 0] = numpy.where(covered, 25 + 55 * closeness, 0)
+            colors[:, :, 1] = numpy.clip((count - 1) * 20, 0, 45)
+            surface = pygame.transform.scale(pygame.surfarray.make_surface(colors),
+                                             (colors.shape[0] * COVERAGE_CELL, colors.shape[1] * COVERAGE_CELL))
+            self.threat_overlay = (key, surface.convert(self.screen))
+        self.screen.blit(self.threat_overlay[1], (column * COVERAGE_CELL - self.camera_x, row * COVERAGE_CELL - self.camera_y),
+                         special_flags=pygame.BLEND_ADD)
+        
+    def draw(self):
+        self.render()
+        pygame.display.flip()
+        
+    def render(self, show_crosshair=True):
+        """Draw the current frame onto self.screen, which may be an offscreen surface.
+        
+        Only what is under the camera is drawn, so the cost follows what is on screen rather
+        than the size of the battlefield.
+        """
+        detail = self.quality.settings
+        self.screen.fill(BLACK)
+        offset = (self.camera_x, self.camera_y)
+        view = (self.camera_x, self.camera_y, self.camera_x + SCREEN_WIDTH, self.camera_y + SCREEN_HEIGHT)
+        
+        # Draw stars background, thinned out evenly at lower quality; every screen of the world
+        # has the same sky, so only the screens the camera overlaps are visited
+        if detail['stars']:
+            for tile_x in range(self.camera_x // SCREEN_WIDTH, (view[2] - 1) // SCREEN_WIDTH + 1):
+                for tile_y in range(self.camera_y // SCREEN_HEIGHT, (view[3] - 1) // SCREEN_HEIGHT + 1):
+                    for i in range(0, 50, 50 // detail['stars']):
+                        x = tile_x * SCREEN_WIDTH + (i * 37) % SCREEN_WIDTH - self.camera_x
+                        y = tile_y * SCREEN_HEIGHT + (i * 23) % (SCREEN_HEIGHT // 2) - self.camera_y
+                        pygame.draw.circle(self.screen, WHITE, (x, y), 1)
+                        
+        if self.show_threat_map:
+            self.draw_threat_map()
+            
+        # Draw launchers, defensive missile bases and cities, in that order
+        for kind, index in sorted(self.static_index.query(*view)):
+            if kind == 0:
+                self.launchers[index].draw(self.screen, offset)
+            elif kind == 1:
+                self.defensive_bases[index].draw(self.screen, offset)
+            else:
+                self.cities[index].draw(self.screen, detail['city_windows'], offset)
+                
+        # Draw player missiles, defensive missiles and explosions; they move every frame, so a
+        # plain overlap test against the view is cheaper than keeping them in an index
+        left, top, right, bottom = view
+        for entities, entity_detail in ((self.missiles, detail['missile_trail']),
+                                        (self.defensive_missiles, detail['defensive_trail']),
+                                        (self.explosions, detail['explosion_rings'])):
+            for entity in entities:
+                if entity.active:
+                    x0, y0, x1, y1 = entity.bounding_box()
+                    if x1 >= left and x0 <= right and y1 >= top and y0 <= bottom:
+                        entity.draw(self.screen, entity_detail, offset)
+            
+        # Particles move with the display rather than the simulation, so they settle on the
+        # game over and victory screens too; ruined cities keep smouldering
+        if self.particles:
+            self.particles.step()
+            if self.particles.ticks % 8 == 0:
+                for city in self.cities:
+                    if city.destroyed:
+                        self.particles.spawn(ParticleSystem.SMOKE, city.x + city.width // 2, city.y - 4, 1, city.width)
+            self.particles.draw(self.screen, offset)
+            
+        if self.scrolls():
+            self.draw_minimap()
             
         # Draw crosshair at mouse position (only if game not over)
-        if not self.game_over:
+        if show_crosshair and not self.game_over:
             mouse_x, mouse_y = pygame.mouse.get_pos()
             pygame.draw.line(self.screen, GREEN, (mouse_x - 10, mouse_y), (mouse_x + 10, mouse_y), 2)
             pygame.draw.line(self.screen, GREEN, (mouse_x, mouse_y - 10), (mouse_x, mouse_y + 10), 2)
@@ -1271,24 +2620,24 @@ class Game:
         
         # Draw difficulty and wave
         difficulty_color = GREEN if self.difficulty == 'EASY' else YELLOW if self.difficulty == 'NORMAL' else RED
-        difficulty_text = pygame.font.Font(None, 28).render(f"Difficulty: {self.difficulty}", True, difficulty_color)
+        difficulty_text = ASSETS.font(28).render(f"Difficulty: {self.difficulty}", True, difficulty_color)
         self.screen.blit(difficulty_text, (10, 130))
         
-        wave_text = pygame.font.Font(None, 28).render(f"Wave: {self.wave}", True, WHITE)
+        wave_text = ASSETS.font(28).render(f"Wave: {self.wave}", True, WHITE)
         self.screen.blit(wave_text, (10, 160))
         
         # Show total missiles remaining
         total_missiles = sum(launcher.missiles_remaining for launcher in self.launchers)
-        missiles_text = pygame.font.Font(None, 28).render(f"Missiles: {total_missiles}", True, YELLOW)
+        missiles_text = ASSETS.font(28).render(f"Missiles: {total_missiles}", True, YELLOW)
         self.screen.blit(missiles_text, (10, 190))
         
         # Draw instructions (only at start of game)
         if self.score == 0 and not self.game_over:
-            inst_text = pygame.font.Font(None, 24).render("Click to launch missiles! Destroy cities and enemy bases!", True, YELLOW)
+            inst_text = ASSETS.font(24).render("Click to launch missiles! Destroy cities and enemy bases!", True, YELLOW)
             text_rect = inst_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 100))
             self.screen.blit(inst_text, text_rect)
             
-            inst_text2 = pygame.font.Font(None, 20).render("Red bases will shoot down your missiles!", True, RED)
+            inst_text2 = ASSETS.font(20).render("Red bases will shoot down your missiles!", True, RED)
             text_rect2 = inst_text2.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 70))
             self.screen.blit(inst_text2, text_rect2)
             
@@ -1297,40 +2646,185 @@ class Game:
             self.draw_game_over()
         elif self.show_victory_screen:
             self.draw_victory_screen()
-            
-        pygame.display.flip()
         
     def run(self):
-        running = True
-        while running:
-            result = self.handle_events()
-            if result == False:
-                running = False
-            elif result == 'MENU':
-                return 'MENU'
-            elif result == ('NAME_ENTRY', None):
-                return ('NAME_ENTRY', None)
-            
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+        """Play until the game is left, pacing frames with pygame's clock; returns where to go next"""
+        frames = self.frames()
+        busy = None
+        try:
+            while True:
+                frames.send(busy)
+                self.clock.tick(FPS)
+                busy = self.clock.get_rawtime()
+        except StopIteration as done:
+            return done.value
+        finally:
+            frames.close()
+            
+    def frames(self):
+        """The game loop as a generator that yields once per frame, for whoever paces the frames.
+        
+        The driver waits for the next frame after each yield and sends back the milliseconds the
+        frame took, not counting that wait. The generator returns where to go next, 'QUIT',
+        'MENU' or ('NAME_ENTRY', None), and tidies up after the game however it ends.
+        """
+        profile = self.profiler
+        if profile.autostart:
+            profile.start()
+        try:
+            running = True
+            while running:
+                profile.enter('events')
+                result = self.handle_events()
+                if result == False:
+                    running = False
+                elif result == 'MENU':
+                    return 'MENU'
+                elif result == ('NAME_ENTRY', None):
+                    return ('NAME_ENTRY', None)
+                
+                profile.enter('update')
+                if self.simulation:
+                    self.simulation.sync(self)
+                else:
+                    self.update()
+                if self.spectators:
+                    self.spectators.publish(self)
+                profile.enter('draw')
+                self.scroll_camera()
+                self.render()
+                profile.enter('flip')
+                pygame.display.flip()
+                if self.latency:
+                    self.latency.frame_drawn()
+                profile.enter('idle')
+                busy = yield
+                self.quality.record(busy)
+                profile.frame_done()
+                
+            return 'QUIT'
+        finally:
+            profile.stop()
+            if self.latency:
+                # TRUE_LIBERATOR_LATENCY=1 prints the distributions, a file name also saves the samples
+                setting = os.environ.get('TRUE_LIBERATOR_LATENCY')
+                self.latency.report(setting if setting != '1' else None)
+                self.latency = LatencyProbe()
+            if self.telemetry:
+                self.telemetry.close()
+                self.telemetry = None
+            # A finished game can't be resumed; one closed mid-wave resumes from its last autosave
+            if self.game_over or self.show_victory_screen:
+                self.discard_autosave()
+            if self.simulation:
+                self.simulation.close()
+                self.simulation = None
+            elif self.record_inputs and self.frame and not self.resumed:
+                # Keep a replayable record of the game, e.g. for video_export.py
+                record_dir = os.environ['TRUE_LIBERATOR_RECORD_DIR']
+                os.makedirs(record_dir, exist_ok=True)
+                self.save_session(os.path.join(record_dir, f"session-{int(time.time())}-{self.seed}.json"))
+
+class SceneManager:
+    """Owns the menu, game and name entry scenes for the whole session.
+    
+    Each scene is built once, ideally ahead of time with preload(), and reset between
+    uses, so switching scenes never constructs a new Game or touches the asset registry.
+    """
+    def __init__(self):
+        self.screen = ASSETS.display()
+        self.clock = pygame.time.Clock()
+        self.menu = MenuScreen(self.screen)
+        self.game = None
+        self.name_entry = None
+        self.spectators = None
+        self.writer = None  # Set by async_loop to take saves off the frame
+        spectate = os.environ.get('TRUE_LIBERATOR_SPECTATE')  # TCP port or Unix socket path
+        if spectate:
+            from spectator import SpectatorPublisher
+            self.spectators = SpectatorPublisher(spectate)
+        
+    def preload(self, scene):
+        """Build a scene now, e.g. while the menu sits idle, so switching to it later is instant"""
+        if scene == 'GAME' and self.game is None:
+            # TRUE_LIBERATOR_WORLD=3x2 plays on a battlefield three screens wide and two high
+            self.game = Game(self.menu.selected_difficulty, world=parse_world(os.environ.get('TRUE_LIBERATOR_WORLD')))
+            self.game.spectators = self.spectators
+            self.game.writer = self.writer
+        elif scene == 'NAME_ENTRY' and self.name_entry is None:
+            self.name_entry = NameEntryScreen(self.screen, 0, self.menu.selected_difficulty)
+            
+    def open_telemetry(self):
+        """Log the next game's events when TRUE_LIBERATOR_TELEMETRY names a directory"""
+        if self.game.telemetry:
+            self.game.telemetry.close()  # Left open by a resume that fell back to a new game
+            self.game.telemetry = None
+        directory = os.environ.get('TRUE_LIBERATOR_TELEMETRY')
+        if not directory or os.environ.get('TRUE_LIBERATOR_SPLIT_PROCESS'):
+            return  # In split mode the simulation, and so every event, lives in the child process
+        try:
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"telemetry-{int(time.time() * 1000)}.tlm")
+            self.game.telemetry = telemetry.TelemetryLog(path, {'source': 'main'})
+        except:
+            pass
             
-        return 'QUIT'
+    def start_game(self, difficulty):
+        self.preload('GAME')
+        if os.environ.get('TRUE_LIBERATOR_SPLIT_PROCESS') or self.spectators:
+            # The child process and the spectator stream only know the single-screen battlefield
+            self.game.world = (1, 1)
+        else:
+            self.game.world = parse_world(os.environ.get('TRUE_LIBERATOR_WORLD'))
+        self.open_telemetry()
+        self.game.reset(difficulty)
+        if os.environ.get('TRUE_LIBERATOR_SPLIT_PROCESS'):
+            from split_process import SimulationProcess
+            self.game.simulation = SimulationProcess(difficulty)
+            self.game.autosave_path = None
+        else:
+            self.game.autosave_path = AUTOSAVE_FILE
+        return self.game
+        
+    def resume_game(self):
+        """Continue the game saved at the start of its last wave, e.g. after a crash or power cut"""
+        self.preload('GAME')
+        self.open_telemetry()
+        try:
+            savegame.load(AUTOSAVE_FILE, self.game)
+            if self.game.world != (1, 1) and (self.spectators or os.environ.get('TRUE_LIBERATOR_SPLIT_PROCESS')):
+                raise ValueError("saved on a battlefield this mode can't show")
+        except:
+            return self.start_game(self.menu.selected_difficulty)
+        self.menu.selected_difficulty = self.game.difficulty
+        self.game.autosave_path = AUTOSAVE_FILE
+        return self.game
+        
+    def start_name_entry(self, score, difficulty):
+        self.preload('NAME_ENTRY')
+        self.name_entry.reset(score, difficulty)
+        return self.name_entry
 
-def main():
-    print("Welcome to True Liberator!")
-    print("A reverse Missile Command experience...")
+def session(scenes):
+    """The menus and games of one session as a generator, so that any loop can pace it.
     
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    pygame.display.set_caption("True Liberator")
-    clock = pygame.time.Clock()
+    Yields None after each frame, and is sent back how many milliseconds the frame took; or
+    yields a timeout in milliseconds while a static screen waits for input, and is sent back
+    the events that arrived, if any. See run_session() and async_loop.run().
+    """
+    startup_probe = os.environ.get('TRUE_LIBERATOR_STARTUP_PROBE')  # Set by startup_budget.py
     
-    menu = MenuScreen(screen)
+    menu = scenes.menu
     menu.start_music()  # Start menu music
     
+    # The menu and name entry screens are static, so they sleep until input arrives and
+    # only redraw after input or a cursor blink
     running = True
+    redraw = True
     while running:
-        for event in pygame.event.get():
+        events = pygame.event.get() if redraw else (yield menu.idle_timeout())
+        redraw = redraw or changes_screen(events)  # Only cleared once the screen is drawn
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
                 break
@@ -1339,23 +2833,29 @@ def main():
             if result == 'QUIT':
                 running = False
                 break
-            elif result == 'START_GAME':
+            elif result in ('START_GAME', 'RESUME_GAME'):
                 # Stop menu music and start game
                 menu.stop_music()
-                game = Game(menu.selected_difficulty)
-                game_result = game.run()
+                if result == 'RESUME_GAME':
+                    game = scenes.resume_game()
+                else:
+                    game = scenes.start_game(menu.selected_difficulty)
+                game_result = yield from game.frames()
                 
                 if game_result == 'QUIT':
                     running = False
                     break
                 elif game_result == ('NAME_ENTRY', None):
                     # Show name entry screen
-                    name_entry = NameEntryScreen(screen, game.score, game.difficulty)
+                    name_entry = scenes.start_name_entry(game.score, game.difficulty)
                     
                     # Name entry loop
                     name_entry_running = True
+                    name_redraw = True
                     while name_entry_running:
-                        for name_event in pygame.event.get():
+                        name_events = pygame.event.get() if name_redraw else (yield name_entry.idle_timeout())
+                        name_redraw = name_redraw or changes_screen(name_events)
+                        for name_event in name_events:
                             if name_event.type == pygame.QUIT:
                                 running = False
                                 name_entry_running = False
@@ -1380,22 +2880,66 @@ def main():
                         if not running:
                             break
                             
-                        name_entry.update()
-                        name_entry.draw()
-                        clock.tick(FPS)
+                        if name_entry.update() or name_redraw:
+                            name_entry.draw()
+                            name_redraw = False
+                        yield
                 
                 # Restart menu music when returning to menu
                 if running:
                     menu.start_music()
+                menu.refresh_saved_game()
+                redraw = True
                 
         if not running:
             break
             
-        menu.draw()
-        clock.tick(FPS)
+        menu.update()
+        if redraw:
+            menu.draw()
+            redraw = False
+            if startup_probe:
+                print("FIRST_MENU_FRAME", flush=True)
+                running = False
+            
+        # Build the other scenes while the menu is on screen
+        scenes.preload('GAME')
+        scenes.preload('NAME_ENTRY')
+        yield
     
     # Stop music before quitting
     menu.stop_music()
+
+def run_session(scenes):
+    """Play a session, pacing frames with pygame's clock and sleeping in wait_for_events()"""
+    frames = session(scenes)
+    reply = None
+    try:
+        while True:
+            wait = frames.send(reply)
+            if wait is None:
+                scenes.clock.tick(FPS)
+                reply = scenes.clock.get_rawtime()
+            else:
+                reply = wait_for_events(wait)
+    except StopIteration:
+        pass
+    finally:
+        frames.close()
+
+def main():
+    print("Welcome to True Liberator!")
+    print("A reverse Missile Command experience...")
+    
+    scenes = SceneManager()
+    if os.environ.get('TRUE_LIBERATOR_ASYNC'):
+        # Frames paced by an asyncio event loop that also runs the save writer, the leaderboard
+        # client and the spectator socket
+        import async_loop
+        async_loop.run(scenes, session(scenes), FPS)
+    else:
+        run_session(scenes)
+    
     pygame.quit()
     sys.exit()
 
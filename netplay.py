@@ -0,0 +1,449 @@
+"""Head-to-head network play: a human attacker against a human defender
+
+The server owns the simulation. Clients send clicks and receive binary state
+snapshots (see state_codec), delta-compressed against the last snapshot they
+acknowledged. One server process runs any number of matches at a fixed 60 Hz.
+A match starts when an attacker joins; until a defender joins, the usual AI
+defends the cities.
+
+    python netplay.py server --port 47800 --stats-interval 5
+    python netplay.py client --role attacker --host 127.0.0.1
+    python netplay.py client --role defender --host 127.0.0.1
+    python netplay.py bench --matches 100 --seconds 5
+
+Datagrams, little-endian:
+
+    client -> server   'J' role:u8                         join a match
+                       'I' ack_tick:u32 first_seq:u32 n:u8 (base:u8 x:f32 y:f32)*
+                       'L'                                 leave
+                       'S'                                 request server metrics
+    server -> client   'W' match:u32 role:u8 difficulty    welcome
+                       'P' input_seq:u32 snapshot          'F' or 'D' snapshot from state_codec
+                       'S' json                            metrics
+"""
+import argparse
+import json
+import math
+import random
+import socket
+import statistics
+import struct
+import time
+from collections import OrderedDict, deque
+
+import state_codec
+from main import Game, FPS, SCREEN_WIDTH, SCREEN_HEIGHT
+
+DEFAULT_PORT = 47800
+ATTACKER = 0
+DEFENDER = 1
+ROLE_NAMES = {'attacker': ATTACKER, 'defender': DEFENDER}
+
+TICK_SECONDS = 1 / FPS
+HISTORY = 64  # Snapshots kept per client for delta baselines
+CLIENT_TIMEOUT = 5.0
+FINISHED_MATCH_LINGER = 10.0
+MAX_DATAGRAM = 65507
+
+INPUT_HEADER = struct.Struct('<IIB')
+COMMAND = struct.Struct('<Bff')
+WELCOME = struct.Struct('<IB')
+SEQ = struct.Struct('<I')
+
+
+class ServerMetrics:
+    """Tick timing and bandwidth counters, summarized over a sliding window of ticks"""
+    def __init__(self, window=FPS * 10):
+        self.tick_times = deque(maxlen=window)
+        self.tick_bytes = deque(maxlen=window)
+        self.bytes_sent = 0
+        self.full_snapshots = 0
+        self.delta_snapshots = 0
+        self.late_ticks = 0
+        self.ticks = 0
+
+    def record_tick(self, duration, bytes_sent):
+        self.ticks += 1
+        self.tick_times.append(duration)
+        self.tick_bytes.append(bytes_sent)
+        self.bytes_sent += bytes_sent
+        if duration > TICK_SECONDS:
+            self.late_ticks += 1
+
+    def summary(self, matches, clients):
+        times = sorted(self.tick_times) or [0.0]
+        window_seconds = len(self.tick_bytes) * TICK_SECONDS or 1.0
+        bytes_per_second = sum(self.tick_bytes) / window_seconds
+        return {
+            'matches': matches,
+            'clients': clients,
+            'ticks': self.ticks,
+            'tick_ms_p50': times[len(times) // 2] * 1000,
+            'tick_ms_p99': times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+            'tick_ms_max': times[-1] * 1000,
+            'tick_budget_used': statistics.fmean(times) / TICK_SECONDS,
+            'late_ticks': self.late_ticks,
+            'bytes_per_second': bytes_per_second,
+            'bytes_per_client_second': bytes_per_second / clients if clients else 0.0,
+            'full_snapshots': self.full_snapshots,
+            'delta_snapshots': self.delta_snapshots,
+        }
+
+
+class Match:
+    def __init__(self, match_id, difficulty):
+        self.match_id = match_id
+        self.game = Game(difficulty, headless=True)
+        self.players = {}  # role -> ClientSlot
+        self.record_cache = {}
+        self.snapshot = state_codec.capture(self.game, self.record_cache)
+        self.finished_at = None
+
+    def step(self, now):
+        game = self.game
+        if ATTACKER not in self.players or game.game_over:
+            return
+        game.ai_defense = DEFENDER not in self.players
+        if game.show_victory_screen:
+            game.continue_after_victory()
+        game.update()
+        self.snapshot = state_codec.capture(game, self.record_cache)
+        if game.game_over:
+            self.finished_at = now
+
+    def apply_command(self, role, base_index, x, y):
+        # Never trust the client: clamp to the playfield and refuse zero-length shots
+        if not (math.isfinite(x) and math.isfinite(y)):
+            return
+        x = min(max(x, 0.0), SCREEN_WIDTH)
+        y = min(max(y, 0.0), SCREEN_HEIGHT)
+        game = self.game
+        if role == ATTACKER:
+            if all((x, y) != (launcher.x, launcher.y) for launcher in game.launchers):
+                game.launch_missile(x, y)
+        else:
+            game.defend(base_index, x, y)
+
+
+class ClientSlot:
+    def __init__(self, address, match, role):
+        self.address = address
+        self.match = match
+        self.role = role
+        self.acked_tick = None
+        self.input_seq = 0
+        self.history = OrderedDict()  # tick -> Snapshot sent
+        self.last_heard = time.perf_counter()
+
+
+class Server:
+    def __init__(self, host='0.0.0.0', port=DEFAULT_PORT, difficulty='NORMAL'):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.difficulty = difficulty
+        self.matches = {}
+        self.clients = {}
+        self.next_match_id = 1
+        self.metrics = ServerMetrics()
+
+    def metrics_summary(self):
+        return self.metrics.summary(len(self.matches), len(self.clients))
+
+    def find_match(self, role):
+        for match in self.matches.values():
+            if role not in match.players and not match.game.game_over:
+                return match
+        match = Match(self.next_match_id, self.difficulty)
+        self.matches[match.match_id] = match
+        self.next_match_id += 1
+        return match
+
+    def drop_client(self, client):
+        self.clients.pop(client.address, None)
+        if client.match.players.get(client.role) is client:
+            del client.match.players[client.role]
+        if not client.match.players:
+            self.matches.pop(client.match.match_id, None)
+
+    def handle_datagram(self, data, address):
+        kind = data[:1]
+        client = self.clients.get(address)
+        if client:
+            client.last_heard = time.perf_counter()
+        if kind == b'J' and len(data) == 2 and data[1] in (ATTACKER, DEFENDER):
+            if client is None:
+                match = self.find_match(data[1])
+                client = self.clients[address] = ClientSlot(address, match, data[1])
+                match.players[data[1]] = client
+            self.sock.sendto(b'W' + WELCOME.pack(client.match.match_id, client.role) +
+                             client.match.game.difficulty.encode(), address)
+        elif kind == b'I' and client and len(data) >= 1 + INPUT_HEADER.size:
+            ack_tick, first_seq, count = INPUT_HEADER.unpack_from(data, 1)
+            if ack_tick in client.history:
+                client.acked_tick = ack_tick
+                while client.history and next(iter(client.history)) < ack_tick:
+                    client.history.popitem(last=False)
+            offset = 1 + INPUT_HEADER.size
+            for seq in range(first_seq, first_seq + count):
+                if offset + COMMAND.size > len(data):
+                    break
+                if seq > client.input_seq:  # Commands are resent until acknowledged; apply each once
+                    client.match.apply_command(client.role, *COMMAND.unpack_from(data, offset))
+                    client.input_seq = seq
+                offset += COMMAND.size
+        elif kind == b'L' and client:
+            self.drop_client(client)
+        elif kind == b'S':
+            self.sock.sendto(b'S' + json.dumps(self.metrics_summary()).encode(), address)
+
+    def poll(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            except ConnectionResetError:
+                continue
+            self.handle_datagram(data, address)
+
+    def send_snapshot(self, client):
+        snapshot = client.match.snapshot
+        if client.history and next(reversed(client.history)) == snapshot.tick:
+            return 0  # Paused match, nothing new
+        baseline = client.history.get(client.acked_tick) if client.acked_tick is not None else None
+        payload = state_codec.encode(snapshot, baseline)
+        if baseline is None:
+            self.metrics.full_snapshots += 1
+        else:
+            self.metrics.delta_snapshots += 1
+        client.history[snapshot.tick] = snapshot
+        if len(client.history) > HISTORY:
+            client.history.popitem(last=False)
+        data = b'P' + SEQ.pack(client.input_seq) + payload
+        try:
+            self.sock.sendto(data, client.address)
+        except (BlockingIOError, OSError):
+            return 0
+        return len(data)
+
+    def tick(self):
+        start = time.perf_counter()
+        for client in [client for client in self.clients.values() if start - client.last_heard > CLIENT_TIMEOUT]:
+            self.drop_client(client)
+        for match in list(self.matches.values()):
+            if match.finished_at is not None and start - match.finished_at > FINISHED_MATCH_LINGER:
+                for client in list(match.players.values()):
+                    self.drop_client(client)
+                self.matches.pop(match.match_id, None)
+            else:
+                match.step(start)
+        bytes_sent = 0
+        for client in self.clients.values():
+            bytes_sent += self.send_snapshot(client)
+        self.metrics.record_tick(time.perf_counter() - start, bytes_sent)
+
+    def serve_forever(self, duration=None, stats_interval=None):
+        start = next_tick = time.perf_counter()
+        next_stats = start + stats_interval if stats_interval else math.inf
+        while duration is None or time.perf_counter() - start < duration:
+            self.poll()
+            now = time.perf_counter()
+            if now >= next_tick:
+                self.tick()
+                next_tick += TICK_SECONDS
+                if now - next_tick > 0.25:
+                    next_tick = now  # Too far behind to catch up; drop the missed ticks
+            else:
+                self.sock.settimeout(next_tick - now)
+                try:
+                    data, address = self.sock.recvfrom(MAX_DATAGRAM)
+                    self.handle_datagram(data, address)
+                except (socket.timeout, ConnectionResetError):
+                    pass
+                finally:
+                    self.sock.setblocking(False)
+            if now >= next_stats:
+                print(json.dumps(self.metrics_summary()), flush=True)
+                next_stats += stats_interval
+
+
+class NetClient:
+    """Client side of the protocol: joins a match, queues commands and tracks snapshots"""
+    def __init__(self, host, port, role):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect((host, port))
+        self.address = (host, port)
+        self.role = role
+        self.match_id = None
+        self.difficulty = None
+        self.baselines = OrderedDict()
+        self.latest = None
+        self.pending = []  # (seq, packed command) not yet acknowledged by the server
+        self.next_seq = 1
+
+    def request_join(self):
+        self.sock.send(b'J' + bytes((self.role,)))
+
+    def receive_welcome(self, timeout):
+        self.sock.settimeout(timeout)
+        try:
+            while True:
+                data = self.sock.recv(MAX_DATAGRAM)
+                if data[:1] == b'W':
+                    self.match_id, _ = WELCOME.unpack_from(data, 1)
+                    self.difficulty = data[1 + WELCOME.size:].decode()
+                    return True
+        except (socket.timeout, ConnectionRefusedError):
+            return False
+        finally:
+            self.sock.setblocking(False)
+
+    def join(self, timeout=5.0):
+        deadline = time.perf_counter() + timeout
+        while True:
+            self.request_join()
+            if self.receive_welcome(0.5):
+                return
+            if time.perf_counter() > deadline:
+                raise ConnectionError(f"no answer from {self.address[0]}:{self.address[1]}")
+
+    def command(self, base_index, x, y):
+        self.pending.append((self.next_seq, COMMAND.pack(base_index, x, y)))
+        self.next_seq += 1
+
+    def pump(self):
+        """Receive waiting snapshots, then acknowledge the newest and send unacknowledged commands.
+
+        Returns the newest snapshot, or None if none has arrived yet.
+        """
+        while True:
+            try:
+                data = self.sock.recv(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError, ConnectionRefusedError):
+                break
+            if data[:1] != b'P':
+                continue
+            input_seq, = SEQ.unpack_from(data, 1)
+            payload = data[1 + SEQ.size:]
+            baseline_tick = state_codec.baseline_tick(payload)
+            baseline = self.baselines.get(baseline_tick) if baseline_tick is not None else None
+            if baseline_tick is not None and baseline is None:
+                continue  # Baseline already discarded; the server will resend against a newer ack
+            snapshot = state_codec.decode(payload, baseline)
+            self.pending = [(seq, command) for seq, command in self.pending if seq > input_seq]
+            if self.latest is None or snapshot.tick > self.latest.tick:
+                self.latest = snapshot
+                self.baselines[snapshot.tick] = snapshot
+                if len(self.baselines) > HISTORY:
+                    self.baselines.popitem(last=False)
+
+        ack_tick = self.latest.tick if self.latest else 0xFFFFFFFF
+        commands = self.pending[:255]
+        first_seq = commands[0][0] if commands else self.next_seq
+        packet = b'I' + INPUT_HEADER.pack(ack_tick, first_seq, len(commands)) + b''.join(c for _, c in commands)
+        try:
+            self.sock.send(packet)
+        except OSError:
+            pass
+        return self.latest
+
+    def close(self):
+        try:
+            self.sock.send(b'L')
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def run_client(host, port, role):
+    import pygame
+
+    client = NetClient(host, port, role)
+    client.join()
+    game = Game(client.difficulty)
+    pygame.display.set_caption(f"True Liberator - {'Attacker' if role == ATTACKER else 'Defender'}")
+    clock = pygame.time.Clock()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                x, y = event.pos
+                if role == ATTACKER:
+                    client.command(0, x, y)
+                else:
+                    # Fire from the nearest base that is still standing
+                    bases = [(abs(base.x - x), i) for i, base in enumerate(game.defensive_bases)
+                             if not base.destroyed and base.missiles_remaining > 0]
+                    if bases:
+                        client.command(min(bases)[1], x, y)
+        snapshot = client.pump()
+        if snapshot:
+            state_codec.apply(snapshot, game)
+        game.draw()
+        clock.tick(FPS)
+    client.close()
+    pygame.quit()
+
+
+def run_bench(matches, seconds, difficulty):
+    """Run a loopback server with scripted attackers and report tick time and bandwidth"""
+    server = Server('127.0.0.1', 0, difficulty)
+    rng = random.Random(0)
+    bots = [NetClient('127.0.0.1', server.address[1], ATTACKER) for _ in range(matches)]
+    for bot in bots:
+        bot.request_join()
+    server.poll()
+    for bot in bots:
+        if not bot.receive_welcome(1.0):
+            raise ConnectionError("bench client was not welcomed")
+
+    deadline = time.perf_counter() + seconds
+    next_tick = time.perf_counter()
+    while time.perf_counter() < deadline:
+        for bot in bots:
+            if rng.random() < 1 / FPS:
+                bot.command(0, rng.uniform(50, SCREEN_WIDTH - 50), SCREEN_HEIGHT - 40)
+            bot.pump()
+        server.poll()
+        server.tick()
+        next_tick += TICK_SECONDS
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    print(json.dumps(server.metrics_summary(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="True Liberator network play")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    server_parser = subparsers.add_parser('server')
+    server_parser.add_argument('--host', default='0.0.0.0')
+    server_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    server_parser.add_argument('--difficulty', default='NORMAL', choices=['EASY', 'NORMAL', 'HARD'])
+    server_parser.add_argument('--stats-interval', type=float, default=None, help="seconds between metric lines")
+    client_parser = subparsers.add_parser('client')
+    client_parser.add_argument('--host', default='127.0.0.1')
+    client_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    client_parser.add_argument('--role', default='attacker', choices=sorted(ROLE_NAMES))
+    bench_parser = subparsers.add_parser('bench')
+    bench_parser.add_argument('--matches', type=int, default=50)
+    bench_parser.add_argument('--seconds', type=float, default=5.0)
+    bench_parser.add_argument('--difficulty', default='NORMAL', choices=['EASY', 'NORMAL', 'HARD'])
+    args = parser.parse_args()
+
+    if args.command == 'server':
+        server = Server(args.host, args.port, args.difficulty)
+        print(f"Serving on {server.address[0]}:{server.address[1]}")
+        server.serve_forever(stats_interval=args.stats_interval)
+    elif args.command == 'client':
+        run_client(args.host, args.port, ROLE_NAMES[args.role])
+    else:
+        run_bench(args.matches, args.seconds, args.difficulty)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Debris, smoke and fire for True Liberator
+
+Purely cosmetic particles, moved and drawn as NumPy arrays. Game spawns them where missiles
+detonate and hit and where ruined cities smoulder; headless games and forks have none.
+"""
+import math
+
+import numpy
+import pygame
+
+
+class ParticleSystem:
+    """Debris, smoke and fire, purely for show.
+
+    Particles live in one fixed-capacity float32 array, a row per field, with the live ones
+    packed at the front. Each frame moves all of them with a handful of vectorized operations,
+    drops the expired ones by compacting the array, and stamps the rest straight into the
+    screen's pixels through pygame.surfarray. Spawns past the capacity are dropped, so a
+    barrage costs no more than the cap. The system draws from its own RNG and never from the
+    game's, so simulation results do not depend on whether anyone is watching.
+    """
+    CAPACITY = 4096
+    X, Y, VX, VY, AGE, LIFE, GRAVITY, DRAG, KIND, SIZE = range(10)
+    DEBRIS, SMOKE, FIRE = range(3)
+    # kind: (gravity, drag, lifetime range in frames, speed range, size in pixels)
+    KINDS = {
+        DEBRIS: (0.15, 0.99, (40, 90), (1.5, 4.5), 2),
+        SMOKE: (-0.02, 0.96, (60, 150), (0.2, 1.0), 2),
+        FIRE: (-0.05, 0.93, (12, 35), (0.5, 2.5), 2),
+    }
+    # Colour of each kind when it spawns and when it expires; the background is black, so
+    # fading towards a dark colour reads as fading out
+    START_COLORS = numpy.array([(170, 150, 120), (120, 120, 120), (255, 230, 80)], dtype=numpy.float32)
+    END_COLORS = numpy.array([(60, 50, 40), (20, 20, 20), (160, 20, 0)], dtype=numpy.float32)
+
+    def __init__(self, capacity=CAPACITY, ground=582):
+        self.data = numpy.zeros((10, capacity), dtype=numpy.float32)
+        self.capacity = capacity
+        self.count = 0
+        self.rng = numpy.random.default_rng()
+        self.ground = ground  # Debris comes to rest here, just below the cities' base line
+        self.ticks = 0
+        self.dropped = 0
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, kind, x, y, count, spread=0, upward=True):
+        """Add count particles of a kind around (x, y), scattered over spread pixels horizontally.
+
+        Upward bursts fly up and out; otherwise they scatter in every direction.
+        """
+        count = int(count)
+        n = min(count, self.capacity - self.count)
+        self.dropped += count - n
+        if n <= 0:
+            return
+        gravity, drag, (life_low, life_high), (speed_low, speed_high), size = self.KINDS[kind]
+        rng = self.rng
+        angle = rng.uniform(-math.pi, 0, n) if upward else rng.uniform(-math.pi, math.pi, n)
+        speed = rng.uniform(speed_low, speed_high, n)
+        block = self.data[:, self.count:self.count + n]
+        block[self.X] = x + rng.uniform(-spread / 2, spread / 2, n)
+        block[self.Y] = y
+        block[self.VX] = numpy.cos(angle) * speed
+        block[self.VY] = numpy.sin(angle) * speed
+        block[self.AGE] = 0
+        block[self.LIFE] = rng.integers(life_low, life_high, n, endpoint=True)
+        block[self.GRAVITY] = gravity
+        block[self.DRAG] = drag
+        block[self.KIND] = kind
+        block[self.SIZE] = size
+        self.count += n
+
+    def step(self):
+        """Advance every particle one frame and drop the ones that have expired"""
+        self.ticks += 1
+        n = self.count
+        if not n:
+            return
+        live = self.data[:, :n]
+        live[self.VX] *= live[self.DRAG]
+        live[self.VY] *= live[self.DRAG]
+        live[self.VY] += live[self.GRAVITY]
+        live[self.X] += live[self.VX]
+        live[self.Y] += live[self.VY]
+        live[self.AGE] += 1
+        landed = live[self.Y] > self.ground
+        if landed.any():
+            live[self.Y, landed] = self.ground
+            live[self.VX, landed] = 0
+            live[self.VY, landed] = 0
+        alive = live[self.AGE] < live[self.LIFE]
+        if not alive.all():
+            keep = numpy.flatnonzero(alive)
+            self.data[:, :len(keep)] = live[:, keep]
+            self.count = len(keep)
+
+    def draw(self, screen, offset=(0, 0)):
+        """Stamp every live particle into screen as a small square, in a few array assignments"""
+        n = self.count
+        if not n:
+            return
+        live = self.data[:, :n]
+        fade = live[self.AGE] / live[self.LIFE]  # 0 when spawned, 1 when expired
+        kind = live[self.KIND].astype(numpy.intp)
+        start = self.START_COLORS[kind]
+        colors = (start + (self.END_COLORS[kind] - start) * fade[:, None]).astype(numpy.uint8)
+        # Smoke billows out as it rises
+        size = (live[self.SIZE] + (kind == self.SMOKE) * 2 * fade).astype(numpy.intp)
+        x = live[self.X].astype(numpy.intp) - int(offset[0])
+        y = live[self.Y].astype(numpy.intp) - int(offset[1])
+        try:
+            pixels = pygame.surfarray.pixels3d(screen)
+        except (ValueError, pygame.error):
+            # Surfaces without a 24 or 32 bit pixel array fall back to one fill per particle
+            for i in range(n):
+                screen.fill(colors[i].tolist(), (x[i], y[i], size[i], size[i]))
+            return
+        width, height = pixels.shape[:2]
+        for dx in range(size.max()):
+            for dy in range(size.max()):
+                px = x + dx
+                py = y + dy
+                mask = (size > max(dx, dy)) & (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                pixels[px[mask], py[mask]] = colors[mask]
+        del pixels  # Unlocks the surface
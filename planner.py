@@ -0,0 +1,154 @@
+"""Intercept planning for True Liberator's defensive AI
+
+InterceptPlanner works out where each defensive base can meet each player missile, for a
+window of upcoming steps at a time, and caches the answers. Game turns the cached solutions
+into a cost matrix and assigns bases to missiles with solve_assignment().
+"""
+import math
+import time
+
+import numpy
+
+
+# Look-ahead times (in ticks) at which the AI considers meeting a missile
+INTERCEPT_STEPS = numpy.arange(10, 100, 5)
+AI_BUDGET_US = 300  # Time per frame the AI may spend planning for bases that are about to reload
+READY_MISSILES = 12  # Missiles a base weighs up per frame, the ones it can reach soonest
+
+
+class InterceptPlanner:
+    """Where each defensive base can meet each missile, worked out ahead and cached.
+
+    Missiles fly straight lines and bases never move, so the intercept a base can make on a
+    missile depends only on how many steps the missile has flown. Solutions are computed for a
+    window of upcoming steps at once, in one batched NumPy pass over every pair that needs one,
+    and looked up until the window runs out; each lookup gives exactly what planning from
+    scratch on that frame would. A base only weighs up the READY_MISSILES missiles it can reach
+    soonest in any frame, so the planning a ready base needs per frame is bounded however many
+    missiles fly; the others come up in later frames, as they close in. Bases a few frames from
+    reloading are planned for in whatever is left of the frame's time budget, so a base that
+    becomes ready usually finds its solutions waiting. Which missiles a base weighs up only
+    depends on the game state, never on timing, so the defence plays the same on every machine.
+    """
+    WINDOW = 32  # Missile steps covered by one solution
+    LEAD = 10  # Frames before a base reloads when planning for it may start
+
+    def __init__(self, budget_us=AI_BUDGET_US):
+        self.budget_us = budget_us
+        # (base index, missile uid) -> (first step, rows), rows None when out of reach for the whole window
+        self.solutions = {}
+        self.planned = 0  # Pair windows computed
+        self.ahead = 0  # ... of which ahead of time
+        self.lookups = 0
+
+    def clear(self):
+        self.solutions.clear()
+
+    def release(self, uid, bases):
+        """Drop the solutions of a missile that is gone, for each of the bases"""
+        for index in range(bases):
+            self.solutions.pop((index, uid), None)
+
+    def candidates(self, game, bases, missiles):
+        """For each (base index, base), the missiles it weighs up this frame: all of them, or the
+        READY_MISSILES it may reach soonest, as a dict keyed by base index"""
+        if len(missiles) <= READY_MISSILES:
+            return {index: missiles for index, _ in bases}
+        x, y = numpy.array([(missile.x, missile.y) for missile in missiles]).T
+        chosen = {}
+        for index, _ in bases:
+            nearest = numpy.argsort(game.coverage.times_to_reach(index, x, y), kind='stable')[:READY_MISSILES]
+            chosen[index] = [missiles[i] for i in nearest.tolist()]
+        return chosen
+
+    def missing(self, bases, missiles, ahead=0):
+        """(base index, base, missile) pairs whose cached window ends within ahead steps of the missile"""
+        pairs = []
+        for index, base in bases:
+            for missile in missiles:
+                solution = self.solutions.get((index, missile.uid))
+                if solution is None or not solution[0] <= missile.steps < solution[0] + self.WINDOW - ahead:
+                    pairs.append((index, base, missile))
+        return pairs
+
+    def lookup(self, index, missile):
+        """(intercept ticks, timing error, x, y) for a base and missile now, or None if it cannot intercept"""
+        self.lookups += 1
+        first, rows = self.solutions[(index, missile.uid)]
+        if rows is None:
+            return None
+        return rows[missile.steps - first]
+
+    def solve(self, game, pairs):
+        """Compute and cache the next WINDOW steps of every (base index, base, missile) pair"""
+        if not pairs:
+            return
+        self.planned += len(pairs)
+        window = self.WINDOW
+        reach = game.ai_range + 1
+        near = []
+        for pair in pairs:
+            index, base, missile = pair
+            # A missile that cannot come within range during the window needs no arithmetic; the
+            # coverage field never puts a missile closer to a base than it is
+            speed = math.hypot(missile.dx, missile.dy)
+            if game.coverage.time_to_reach(index, missile.x, missile.y) * 4 - speed * window > reach:
+                self.solutions[(index, missile.uid)] = (missile.steps, None)
+            else:
+                near.append(pair)
+        if not near:
+            return
+
+        # Pairs x window steps, with the same arithmetic as Missile.position_at()
+        columns = numpy.array([(base.x, base.y, missile.start_x, missile.start_y, missile.dx, missile.dy)
+                               for _, base, missile in near], dtype=float).T[:, :, None]
+        base_x, base_y, start_x, start_y, dx, dy = columns
+        steps = numpy.array([missile.steps for _, _, missile in near])[:, None] + numpy.arange(window)
+        missile_x = start_x + dx * steps
+        missile_y = start_y + dy * steps
+        pair, step = numpy.nonzero(numpy.hypot(base_x - missile_x, base_y - missile_y) <= game.ai_range)
+
+        # Only the steps a missile spends in range can have an intercept. Where would it be after each
+        # candidate number of ticks, and is it still in the world by then (a missile that has left
+        # the world stays out of reach)?
+        ticks = INTERCEPT_STEPS
+        dx = dx[pair]
+        dy = dy[pair]
+        future_x = missile_x[pair, step][:, None] + dx * ticks
+        future_y = missile_y[pair, step][:, None] + dy * ticks
+        in_world = numpy.logical_and.accumulate((future_y <= game.world_height) & (future_x >= 0) &
+                                                (future_x <= game.world_width), axis=1)
+
+        # An interceptor (speed 4) must reach the point within 15 ticks of the missile
+        flight_time = numpy.hypot(base_x[pair] - future_x, base_y[pair] - future_y) / 4
+        timing_error = numpy.abs(flight_time - ticks)
+        feasible = (timing_error < 15) & in_world
+        reachable = numpy.nonzero(feasible.any(axis=1))[0]
+        first = feasible[reachable].argmax(axis=1)  # Earliest feasible intercept at each step
+        found = zip(pair[reachable].tolist(), step[reachable].tolist(), ticks[first].tolist(),
+                    timing_error[reachable, first].tolist(), future_x[reachable, first].tolist(),
+                    future_y[reachable, first].tolist())
+        table = [None] * len(near)
+        for i, j, *solution in found:
+            if table[i] is None:
+                table[i] = [None] * window
+            table[i][j] = tuple(solution)
+        for (index, _, missile), rows in zip(near, table):
+            self.solutions[(index, missile.uid)] = (missile.steps, rows)
+
+    def plan_ahead(self, game, missiles, started):
+        """Fill in solutions for bases about to reload, a few pairs at a time, until the frame's budget is spent"""
+        bases = []
+        for index, base in enumerate(game.defensive_bases):
+            ready_time = base.ready_time()
+            if ready_time is not None and 0 < game.frames_until(ready_time) <= self.LEAD:
+                bases.append((index, base))
+        if not bases:
+            return
+        candidates = self.candidates(game, bases, missiles)
+        pairs = [pair for index, base in bases for pair in self.missing([(index, base)], candidates[index], self.LEAD)]
+        for i in range(0, len(pairs), 8):
+            if (time.perf_counter() - started) * 1e6 >= self.budget_us:
+                break
+            self.solve(game, pairs[i:i + 8])
+            self.ahead += len(pairs[i:i + 8])
@@ -0,0 +1,239 @@
+"""Frame profiler for True Liberator
+
+Captures a window of frames of a running game without stopping it. The game loop reports
+which phase of the frame it enters (events, update, draw, flip or idle, the wait for the
+next frame), and the wall time of each phase is totalled. In sample mode a thread reads the
+game thread's stack every millisecond and tags each sample with the phase, or with a finer
+one such as ai when a tagged function is on the stack. In cprofile mode the game is traced
+by cProfile instead, and collapsed stacks are estimated from its call graph. Outside a
+capture entering a phase is one attribute store and one test.
+
+    TRUE_LIBERATOR_PROFILE=sample:600 python main.py   # capture the first 600 frames of each game
+    TRUE_LIBERATOR_PROFILE=cprofile python main.py     # ... traced by cProfile instead of sampled
+    F9 in a game                                       # start a capture, or end one early
+
+Each capture writes, to TRUE_LIBERATOR_PROFILE_DIR (default profiles/):
+
+    profile-<time>.folded   collapsed stacks for flamegraph.pl or speedscope; phase first when sampled,
+                            microseconds rather than samples with cProfile
+    profile-<time>.prof     pstats data, cprofile mode only (python -m pstats FILE)
+    profile-<time>.txt      frame time percentiles, time per phase and, with cProfile, the top functions
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+MODES = ('sample', 'cprofile')
+DEFAULT_FRAMES = 600
+INTERVAL = 0.001  # Seconds between samples
+
+
+class FrameProfiler:
+    """Profiles a number of frames at a time on request; the game calls enter() and frame_done()"""
+    def __init__(self, mode='sample', frames=DEFAULT_FRAMES, directory='profiles', subphases=None, autostart=False):
+        self.mode = mode if mode in MODES else 'sample'
+        self.frames = frames
+        self.directory = directory
+        self.subphases = subphases or {}  # Code object -> phase, for work tagged by the function doing it
+        self.autostart = autostart
+        self.phase = 'idle'
+        self.capturing = False
+        self.captures = 0
+        self.last_path = None
+        self.labels = {}  # Code object -> stack frame label
+        self.writer = None
+
+    @classmethod
+    def from_environment(cls, subphases=None):
+        """Profiler configured by TRUE_LIBERATOR_PROFILE=mode[:frames]; captures start by themselves when it is set"""
+        setting = os.environ.get('TRUE_LIBERATOR_PROFILE', '')
+        mode, _, frames = setting.partition(':')
+        try:
+            frames = max(1, int(frames))
+        except ValueError:
+            frames = DEFAULT_FRAMES
+        return cls(mode or 'sample', frames, os.environ.get('TRUE_LIBERATOR_PROFILE_DIR', 'profiles'), subphases,
+                   autostart=bool(setting))
+
+    def toggle(self):
+        if self.capturing:
+            self.stop()
+        else:
+            self.start()
+
+    def enter(self, phase):
+        """Mark the start of a phase of the frame"""
+        if self.capturing:
+            now = time.perf_counter()
+            self.phase_times[self.phase] += now - self.phase_start
+            self.phase_start = now
+        self.phase = phase
+        
+    def start(self):
+        if self.capturing:
+            return
+        self.capturing = True
+        self.frames_left = self.frames
+        self.frame_times = []
+        self.phase_times = Counter()
+        self.samples = Counter()
+        self.sampler = self.profile = None
+        self.thread_id = threading.get_ident()
+        if self.mode == 'cprofile':
+            # cProfile sees every thread, so it runs alone
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            # The sampler only gets to run when the game thread lets go of the GIL
+            self.switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(INTERVAL / 2)
+            self.stopping = threading.Event()
+            self.sampler = threading.Thread(target=self.sample_loop, name="profile-sampler", daemon=True)
+            self.sampler.start()
+        self.started = self.frame_start = self.phase_start = time.perf_counter()
+
+    def frame_done(self):
+        """Called once per frame by the game loop"""
+        if not self.capturing:
+            return
+        now = time.perf_counter()
+        self.frame_times.append((now - self.frame_start) * 1000)
+        self.frame_start = now
+        self.frames_left -= 1
+        if self.frames_left <= 0:
+            self.stop()
+
+    def stop(self):
+        """End the capture and write its files in the background"""
+        if not self.capturing:
+            return
+        if self.profile:
+            self.profile.disable()
+        self.enter(self.phase)
+        self.capturing = False
+        elapsed = time.perf_counter() - self.started
+        if self.sampler:
+            self.stopping.set()
+            self.sampler.join()
+            sys.setswitchinterval(self.switch_interval)
+        self.captures += 1
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, time.strftime('profile-%Y%m%d-%H%M%S'))
+        if os.path.exists(path + '.folded'):
+            path += f'-{self.captures}'
+        self.last_path = path
+        self.writer = threading.Thread(target=self.write, name="profile-writer", daemon=True,
+                                       args=(path, self.samples, self.frame_times, self.phase_times, self.profile,
+                                             elapsed))
+        self.writer.start()
+
+    def label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            label = self.labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        return label
+
+    def sample_loop(self):
+        current_frames = sys._current_frames
+        subphases = self.subphases
+        while not self.stopping.wait(INTERVAL):
+            frame = current_frames().get(self.thread_id)
+            phase = self.phase
+            stack = []
+            subphase = None
+            while frame is not None:
+                code = frame.f_code
+                stack.append(self.label(code))
+                if subphase is None:
+                    subphase = subphases.get(code)
+                frame = frame.f_back
+            if not stack:
+                continue
+            stack.append(subphase or phase)
+            stack.reverse()
+            self.samples[';'.join(stack)] += 1
+
+    def folded_from_stats(self, stats):
+        """Collapsed stacks in microseconds, estimated from cProfile's call graph.
+        
+        Time spent in a function is shared out among the paths leading to it in proportion to
+        the time each caller spent calling it, which is exact unless one function is much
+        slower from some callers than from others.
+        """
+        callees = defaultdict(list)
+        for function, (_, _, _, _, callers) in stats.items():
+            for caller, (_, _, _, cumulative) in callers.items():
+                if caller != function:
+                    callees[caller].append((function, cumulative))
+        folded = Counter()
+        
+        def walk(path, function, share):
+            _, _, own, cumulative, _ = stats[function]
+            if cumulative <= 0 or share < 1e-6:
+                return
+            path = path + (self.label_of(function),)
+            scale = min(1.0, share / cumulative)
+            folded[';'.join(path)] += own * scale * 1e6
+            if len(path) < 64:
+                for callee, time_in_callee in callees[function]:
+                    if self.label_of(callee) not in path:
+                        walk(path, callee, time_in_callee * scale)
+                        
+        # Time no profiled caller accounts for was spent in calls from outside the capture, such
+        # as the game loop's own, so those calls start stacks of their own
+        for function, (_, _, _, cumulative, callers) in stats.items():
+            called = sum(timing[3] for caller, timing in callers.items() if caller in stats and caller != function)
+            if cumulative - called > 1e-6:
+                walk((), function, cumulative - called)
+        return folded
+        
+    def label_of(self, function):
+        filename, line, name = function
+        if filename == '~':
+            return name  # A builtin, e.g. "<method 'blit' of 'pygame.surface.Surface' objects>"
+        return f"{name} ({os.path.basename(filename)}:{line})"
+        
+    def write(self, path, samples, frame_times, phase_times, profile, elapsed):
+        try:
+            if profile:
+                profile.create_stats()
+                folded = self.folded_from_stats(profile.stats)
+            else:
+                folded = samples
+            with open(path + '.folded', 'w') as f:
+                for stack, count in folded.most_common():
+                    if round(count):
+                        f.write(f"{stack} {round(count)}\n")
+            summary = io.StringIO()
+            summary.write(f"{len(frame_times)} frames in {elapsed:.2f}s" +
+                          (f", {sum(samples.values())} samples\n" if not profile else " under cProfile\n"))
+            if frame_times:
+                ordered = sorted(frame_times)
+                for name, share in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99)):
+                    summary.write(f"  frame {name} {ordered[int(share * (len(ordered) - 1))]:7.2f} ms\n")
+                summary.write(f"  frame max {ordered[-1]:7.2f} ms\n")
+            total = sum(phase_times.values()) or 1
+            summary.write("Time by phase:\n")
+            for phase, seconds in phase_times.most_common():
+                summary.write(f"  {phase:>8} {seconds * 1000 / max(1, len(frame_times)):8.3f} ms/frame {seconds / total:6.1%}\n")
+            if samples:
+                phases = Counter()
+                for stack, count in samples.items():
+                    phases[stack.partition(';')[0]] += count
+                summary.write("Samples by phase:\n")
+                for phase, count in phases.most_common():
+                    summary.write(f"  {phase:>8} {count / sum(phases.values()):6.1%}\n")
+            if profile:
+                profile.dump_stats(path + '.prof')
+                stats = pstats.Stats(profile, stream=summary)
+                stats.sort_stats('cumulative').print_stats(25)
+            with open(path + '.txt', 'w') as f:
+                f.write(summary.getvalue())
+            print(f"Profile written to {path}.*")
+        except OSError as error:
+            print(f"Profile not written: {error}")
@@ -0,0 +1,239 @@
+"""Full-state save files for True Liberator
+
+Unlike state_codec, which only carries what a display needs, a save holds everything
+the simulation depends on, so a loaded game carries on exactly as the saved one would
+have: every entity with its trail, launcher and base timers, AI parameters, wave,
+score and the RNG state. Saving or loading takes a fraction of a millisecond, cheap
+enough for Game to autosave at every new wave.
+
+All values are little-endian:
+
+    file        magic:'TLSV' version:u8 meta_len:u16 meta game rng cities launchers:u8 launcher*
+                bases:u8 base* missiles:u16 missile* defensive:u16 defensive* explosions:u16 explosion*
+    meta        JSON: difficulty, settings, seed, world (screens across and down)
+    game        frame:u32 score:u32 wave:u16 flags:u8 next_uid:u32 last_reload_ago:i32
+                ai_accuracy:f64 ai_reaction_chance:f64
+    rng         version:u8 has_gauss:u8 gauss:f64 state:u32*625
+    cities      count:u8 destroyed_bits:u32 heights:u8*3 per city (0 until first drawn)
+    unit        destroyed:u8 missiles_remaining:u16 max_missiles:u16 shot_cooldown:i32 last_shot_ago:i32
+    missile     uid:u32 target_uid:u32 steps:u32 active:u8 start_x start_y target_x target_y:f64
+                trail_len:u8 (x:i16 y:i16)*
+    explosion   uid:u32 x:f64 y:f64 radius:f64 max_radius:f64 growth_rate:f64 flags:u8
+
+Timers are stored relative to the simulation clock ("ago"), so they stay meaningful
+whatever the saved frame was. Settings that never change during a game, such as the
+AI range and explosion sizes, come back from the meta block through Game.reset().
+"""
+import json
+import os
+import struct
+import threading
+
+MAGIC = b'TLSV'
+VERSION = 2
+
+PREFIX = struct.Struct('<4sBH')
+GAME = struct.Struct('<IIHBIidd')
+RNG_HEADER = struct.Struct('<BBd')
+RNG_STATE = struct.Struct('<625I')
+UNIT = struct.Struct('<BHHii')
+MISSILE = struct.Struct('<IIIBddddB')
+POINT = struct.Struct('<hh')
+EXPLOSION = struct.Struct('<IdddddB')
+CITIES = struct.Struct('<BI')
+COUNT8 = struct.Struct('<B')
+COUNT16 = struct.Struct('<H')
+
+FLAG_GAME_OVER = 1
+FLAG_VICTORY = 2
+FLAG_VICTORY_SCREEN = 4
+FLAG_AI_DEFENSE = 8
+
+EXPLOSION_ACTIVE = 1
+EXPLOSION_DEFENSIVE = 2
+
+_write_lock = threading.Lock()
+writes = 0  # Save files written or removed so far, so a cached peek() can tell it is out of date
+
+
+def dumps(game):
+    """Serialize the complete simulation state of game"""
+    current_time = game.current_time()
+    meta = json.dumps({'difficulty': game.difficulty, 'settings': game.difficulty_settings,
+                       'seed': game.seed, 'world': game.world}, separators=(',', ':')).encode()
+    flags = ((FLAG_GAME_OVER if game.game_over else 0) | (FLAG_VICTORY if game.victory else 0) |
+             (FLAG_VICTORY_SCREEN if game.show_victory_screen else 0) |
+             (FLAG_AI_DEFENSE if game.ai_defense else 0))
+    version, state, gauss = game.rng.getstate()
+    parts = [
+        PREFIX.pack(MAGIC, VERSION, len(meta)), meta,
+        GAME.pack(game.frame, game.score, game.wave, flags, game.next_uid, current_time - game.last_reload_time,
+                  game.ai_accuracy, game.ai_reaction_chance),
+        RNG_HEADER.pack(version, gauss is not None, gauss or 0.0), RNG_STATE.pack(*state),
+    ]
+
+    destroyed = 0
+    heights = []
+    for i, city in enumerate(game.cities):
+        if city.destroyed:
+            destroyed |= 1 << i
+        heights.append(bytes(getattr(city, 'building_heights', (0, 0, 0))))
+    parts += [CITIES.pack(len(game.cities), destroyed)] + heights
+
+    for units in (game.launchers, game.defensive_bases):
+        parts.append(COUNT8.pack(len(units)))
+        for unit in units:
+            parts.append(UNIT.pack(getattr(unit, 'destroyed', False), unit.missiles_remaining, unit.max_missiles,
+                                   unit.shot_cooldown, current_time - unit.last_shot_time))
+
+    for missiles in (game.missiles, game.defensive_missiles):
+        parts.append(COUNT16.pack(len(missiles)))
+        for missile in missiles:
+            parts.append(MISSILE.pack(missile.uid, getattr(missile, 'target_uid', 0), missile.steps, missile.active,
+                                      missile.start_x, missile.start_y, missile.target_x, missile.target_y,
+                                      len(missile.trail)))
+            parts += [POINT.pack(*point) for point in missile.trail]
+
+    parts.append(COUNT16.pack(len(game.explosions)))
+    for explosion in game.explosions:
+        parts.append(EXPLOSION.pack(explosion.uid, explosion.x, explosion.y, explosion.radius, explosion.max_radius,
+                                    explosion.growth_rate,
+                                    (EXPLOSION_ACTIVE if explosion.active else 0) |
+                                    (EXPLOSION_DEFENSIVE if explosion.is_defensive else 0)))
+    return b''.join(parts)
+
+
+def read_meta(data):
+    """The meta block of a save: difficulty, settings, seed and world"""
+    magic, version, length = PREFIX.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a True Liberator save")
+    if version != VERSION:
+        raise ValueError(f"unsupported save version {version}")
+    return json.loads(bytes(data[PREFIX.size:PREFIX.size + length]))
+
+
+def loads(data, game):
+    """Restore game to the state serialized in data.
+
+    game is reset to the saved difficulty and settings first, so any Game will do,
+    including one shown on screen.
+    """
+    meta = read_meta(data)
+    offset = PREFIX.size + PREFIX.unpack_from(data, 0)[2]
+    game.world = tuple(meta['world'])
+    game.reset(meta['difficulty'], meta['seed'], meta['settings'])
+    game.resumed = True
+
+    (game.frame, game.score, game.wave, flags, game.next_uid, last_reload_ago, game.ai_accuracy,
+     game.ai_reaction_chance) = GAME.unpack_from(data, offset)
+    offset += GAME.size
+    current_time = game.current_time()
+    game.last_reload_time = current_time - last_reload_ago
+    game.game_over = bool(flags & FLAG_GAME_OVER)
+    game.victory = bool(flags & FLAG_VICTORY)
+    game.show_victory_screen = bool(flags & FLAG_VICTORY_SCREEN)
+    game.ai_defense = bool(flags & FLAG_AI_DEFENSE)
+
+    version, has_gauss, gauss = RNG_HEADER.unpack_from(data, offset)
+    offset += RNG_HEADER.size
+    game.rng.setstate((version, RNG_STATE.unpack_from(data, offset), gauss if has_gauss else None))
+    offset += RNG_STATE.size
+
+    count, destroyed = CITIES.unpack_from(data, offset)
+    offset += CITIES.size
+    for i, city in enumerate(game.cities[:count]):
+        city.destroyed = bool(destroyed & (1 << i))
+        heights = list(data[offset + 3 * i:offset + 3 * i + 3])
+        if any(heights):
+            city.building_heights = heights
+        elif hasattr(city, 'building_heights'):
+            del city.building_heights
+    offset += 3 * count
+
+    for units in (game.launchers, game.defensive_bases):
+        count, = COUNT8.unpack_from(data, offset)
+        offset += COUNT8.size
+        for unit in units[:count]:
+            destroyed, unit.missiles_remaining, unit.max_missiles, unit.shot_cooldown, last_shot_ago = \
+                UNIT.unpack_from(data, offset)
+            unit.last_shot_time = current_time - last_shot_ago
+            if hasattr(unit, 'destroyed'):
+                unit.destroyed = bool(destroyed)
+            offset += UNIT.size
+
+    for entities, pool in ((game.missiles, game.missile_pool), (game.defensive_missiles, game.defensive_missile_pool)):
+        count, = COUNT16.unpack_from(data, offset)
+        offset += COUNT16.size
+        for _ in range(count):
+            uid, target_uid, steps, active, start_x, start_y, target_x, target_y, trail_len = \
+                MISSILE.unpack_from(data, offset)
+            offset += MISSILE.size
+            missile = pool.acquire(start_x, start_y, target_x, target_y, (game.world_width, game.world_height))
+            missile.uid = uid
+            if hasattr(missile, 'target_uid'):
+                missile.target_uid = target_uid
+            missile.steps = steps
+            missile.x, missile.y = missile.position_at(steps)
+            missile.active = bool(active)
+            missile.trail.extend(POINT.iter_unpack(data[offset:offset + trail_len * POINT.size]))
+            offset += trail_len * POINT.size
+            entities.append(missile)
+
+    count, = COUNT16.unpack_from(data, offset)
+    offset += COUNT16.size
+    for _ in range(count):
+        uid, x, y, radius, max_radius, growth_rate, explosion_flags = EXPLOSION.unpack_from(data, offset)
+        offset += EXPLOSION.size
+        explosion = game.explosion_pool.acquire(x, y, max_radius, bool(explosion_flags & EXPLOSION_DEFENSIVE))
+        explosion.uid = uid
+        explosion.radius = radius
+        explosion.growth_rate = growth_rate
+        explosion.active = bool(explosion_flags & EXPLOSION_ACTIVE)
+        game.explosions.append(explosion)
+    return game
+
+
+def write_atomic(path, data):
+    """Replace path with data so that a crash or power cut leaves either the old or the new file"""
+    global writes
+    with _write_lock:
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        writes += 1
+
+
+def remove(path):
+    """Remove a save file if there is one"""
+    global writes
+    with _write_lock:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        writes += 1
+
+
+def save(game, path):
+    write_atomic(path, dumps(game))
+
+
+def load(path, game):
+    with open(path, 'rb') as f:
+        return loads(f.read(), game)
+
+
+def peek(path):
+    """(difficulty, wave, score) of a save file, or None if there is no usable save"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read(PREFIX.size + 0xFFFF + GAME.size)
+        meta = read_meta(data)
+        _, score, wave = GAME.unpack_from(data, PREFIX.size + PREFIX.unpack_from(data, 0)[2])[:3]
+        return meta['difficulty'], wave, score
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
@@ -0,0 +1,239 @@
+"""Long-run soak test for True Liberator
+
+Drives one Game through hundreds of waves, milestone victory screens included, with a
+scripted player. Once per wave it samples traced Python heap, process RSS and the time
+of a fixed probe: a second Game replaying the same seeded volley, so that frame-time
+drift is not drowned out by how busy each wave happens to be. Least-squares slopes are
+fitted after a warm-up, and the run fails when any slope exceeds its limit, the way a
+cabinet left running for days would slowly degrade. Time is CPU time of the playing
+thread, so other load on the machine does not show up as drift.
+
+    python soak.py --waves 300 --render
+    python soak.py --waves 1000 --difficulty HARD --max-heap-slope 32
+
+Lost games are restarted on the same Game, as the cabinet does, so waves keep counting.
+With --render every frame, game over and victory screens included, is drawn to an
+offscreen surface. Exits with status 1 when a limit is exceeded.
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+
+from headless import GreedyAttacker
+from main import ASSETS, DIFFICULTY_SETTINGS, FPS, SCREEN_WIDTH, SCREEN_HEIGHT, Game
+from particles import ParticleSystem
+
+HOLD_FRAMES = FPS  # Frames the game over and victory screens stay up before the player moves on
+PROBE_FRAMES = 90
+PROBE_SEED = 12345
+PROBE_REPEATS = 3  # The fastest repeat is kept, which filters out scheduler noise
+
+
+def soak_settings(difficulty, missiles, cooldown):
+    """DIFFICULTY_SETTINGS with a deeper, faster magazine, so the scripted player keeps winning waves"""
+    settings = dict(DIFFICULTY_SETTINGS[difficulty])
+    settings['player_missile_limit'] = missiles
+    settings['player_cooldown'] = cooldown
+    return settings
+
+
+def rss_bytes():
+    """Current resident set size; falls back to the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def slope(xs, ys):
+    """Least-squares slope of ys over xs"""
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(ys)
+    spread = sum((x - mean_x) ** 2 for x in xs)
+    if spread == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / spread
+
+
+class Soak:
+    """One long run; collects a sample row each time a wave is completed"""
+    def __init__(self, difficulty='NORMAL', seed=0, settings=None, render=False, trace_frames=1):
+        self.game = Game(difficulty, headless=True, seed=seed, settings=settings)
+        self.probe_game = Game(difficulty, headless=True, seed=PROBE_SEED, settings=settings)
+        self.difficulty = difficulty
+        self.settings = settings
+        self.seed = seed
+        self.player = GreedyAttacker(seed)
+        self.surface = None
+        if render:
+            import pygame
+            pygame.font.init()
+            self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            for game in (self.game, self.probe_game):
+                game.screen = self.surface
+                game.font = ASSETS.font(36)
+                game.high_score_manager = ASSETS.high_scores()
+                game.particles = ParticleSystem()
+        tracemalloc.start(trace_frames)
+        self.waves = 0  # Waves completed, over all games
+        self.games = 1
+        self.milestones = 0
+        self.frame_times = []  # Seconds per frame within the current wave
+        self.samples = []  # (waves, heap bytes, RSS bytes, median frame ms, probe ms)
+        self.baseline = None  # tracemalloc snapshot taken when the warm-up ends
+        self.next_decision = 0
+
+    def tick(self):
+        """Play or show one frame, timing the work a live frame would do"""
+        game = self.game
+        start = time.thread_time()
+        if game.game_over or game.show_victory_screen:
+            if self.surface:
+                game.render(show_crosshair=False)
+        else:
+            if game.frame >= self.next_decision:
+                self.next_decision = game.frame + max(1, self.player.act(game))
+            game.update()
+            if self.surface:
+                game.render(show_crosshair=False)
+        self.frame_times.append(time.thread_time() - start)
+
+    def hold(self):
+        for _ in range(HOLD_FRAMES):
+            self.tick()
+
+    def run_wave(self):
+        """Play until one more wave is completed, restarting lost games along the way"""
+        game = self.game
+        wave = game.wave
+        while game.wave == wave and not game.show_victory_screen:
+            self.tick()
+            if game.game_over:
+                self.hold()
+                self.games += 1
+                game.reset(self.difficulty, self.seed + self.games, self.settings)
+                self.player = GreedyAttacker(self.seed + self.games)
+                self.next_decision = 0
+                wave = game.wave
+        if game.show_victory_screen:
+            self.hold()
+            self.milestones += 1
+            game.continue_after_victory()
+        self.waves += 1
+
+    def probe(self):
+        """Milliseconds taken by the same busy stretch of play, which only drifts if the process slows down"""
+        game = self.probe_game
+        best = None
+        for _ in range(PROBE_REPEATS):
+            game.reset(self.difficulty, PROBE_SEED, self.settings)
+            player = GreedyAttacker(PROBE_SEED)
+            next_decision = 0
+            start = time.thread_time()
+            for _ in range(PROBE_FRAMES):
+                if game.frame >= next_decision:
+                    next_decision = game.frame + max(1, player.act(game))
+                game.update()
+                if self.surface:
+                    game.render(show_crosshair=False)
+            elapsed = time.thread_time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
+
+    def sample(self):
+        heap, _ = tracemalloc.get_traced_memory()
+        self.samples.append((self.waves, heap, rss_bytes(), statistics.median(self.frame_times) * 1000,
+                             self.probe()))
+        self.frame_times.clear()
+
+    def run(self, waves, warmup, log=print, log_every=50):
+        while self.waves < waves:
+            self.run_wave()
+            self.sample()
+            if self.waves == warmup:
+                self.baseline = tracemalloc.take_snapshot()
+            if log and self.waves % log_every == 0:
+                _, heap, rss, frame_ms, probe_ms = self.samples[-1]
+                log(f"wave {self.waves:5d}  games {self.games:3d}  heap {heap / 1024:8.0f} KB  "
+                    f"RSS {rss / 1024 ** 2:6.1f} MB  median frame {frame_ms:.3f} ms  probe {probe_ms:.2f} ms")
+
+    def slopes(self, warmup):
+        """Growth per 100 waves after the warm-up: heap KB, RSS KB and probe time in percent"""
+        rows = [row for row in self.samples if row[0] > warmup]
+        if len(rows) < 2:
+            return None
+        waves = [row[0] / 100 for row in rows]
+        probe_ms = statistics.fmean(row[4] for row in rows)
+        return {
+            'heap_kb': slope(waves, [row[1] / 1024 for row in rows]),
+            'rss_kb': slope(waves, [row[2] / 1024 for row in rows]),
+            'frame_pct': slope(waves, [row[4] / probe_ms * 100 for row in rows]),
+        }
+
+    def growth_sites(self, limit=10):
+        """Source lines whose traced allocations grew most since the warm-up"""
+        if self.baseline is None:
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        return [stat for stat in snapshot.compare_to(self.baseline, 'lineno') if stat.size_diff > 0][:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak True Liberator for memory and frame-time drift")
+    parser.add_argument('--waves', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30, help="waves ignored while caches and pools fill up")
+    parser.add_argument('--difficulty', default='NORMAL', choices=['EASY', 'NORMAL', 'HARD'])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--render', action='store_true', help="draw every frame to an offscreen surface")
+    parser.add_argument('--missiles', type=int, default=60, help="scripted player's missiles per launcher")
+    parser.add_argument('--cooldown', type=int, default=250, help="scripted player's launcher cooldown (ms)")
+    parser.add_argument('--max-heap-slope', type=float, default=64, help="KB of traced heap per 100 waves")
+    parser.add_argument('--max-rss-slope', type=float, default=2048, help="KB of RSS per 100 waves")
+    parser.add_argument('--max-frame-slope', type=float, default=5, help="percent of probe time per 100 waves")
+    parser.add_argument('--output', help="write the samples and slopes here as JSON")
+    args = parser.parse_args()
+    if args.waves <= args.warmup + 1:
+        parser.error("--waves must leave at least two samples after --warmup")
+
+    soak = Soak(args.difficulty, args.seed, soak_settings(args.difficulty, args.missiles, args.cooldown),
+                render=args.render)
+    start = time.perf_counter()
+    soak.run(args.waves, args.warmup)
+    elapsed = time.perf_counter() - start
+    slopes = soak.slopes(args.warmup)
+
+    print(f"{soak.waves} waves in {soak.games} games, {soak.milestones} milestone victories, "
+          f"{soak.game.frame} frames in the last game, {elapsed:.1f}s")
+    limits = {'heap_kb': args.max_heap_slope, 'rss_kb': args.max_rss_slope, 'frame_pct': args.max_frame_slope}
+    units = {'heap_kb': "KB heap", 'rss_kb': "KB RSS", 'frame_pct': "% probe time"}
+    failed = []
+    for name, value in slopes.items():
+        over = value > limits[name]
+        if over:
+            failed.append(name)
+        print(f"  {units[name]:>16} per 100 waves: {value:9.2f}  (limit {limits[name]:g}){'  FAIL' if over else ''}")
+    if 'heap_kb' in failed:
+        print("Largest heap growth since the warm-up:")
+        for stat in soak.growth_sites():
+            print(f"  {stat}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'samples': soak.samples, 'slopes': slopes, 'limits': limits, 'failed': failed,
+                       'games': soak.games, 'milestones': soak.milestones}, f, indent=2)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Sound effects for True Liberator
+
+Effects are synthesized with NumPy rather than loaded from files: each kind has a few
+variants that differ in pitch and noise. SoundEngine plays them on a fixed pool of
+reserved mixer channels, so a barrage of explosions never floods the mixer.
+"""
+import threading
+
+import numpy
+import pygame
+
+
+def _low_pass(samples, sample_rate, cutoff):
+    """Crude low-pass filter: a moving average about one cutoff period long"""
+    width = max(1, int(sample_rate / cutoff))
+    return numpy.convolve(samples, numpy.ones(width) / width, mode='same')
+
+
+def synthesize_sfx(kind, variant, sample_rate):
+    """One variant of a sound effect, as mono samples in [-1, 1].
+
+    Variants differ in pitch and noise, so repeated events don't all sound alike.
+    """
+    noise_source = numpy.random.RandomState(variant)
+    pitch = 1 + 0.06 * (variant - 1.5)
+    duration = {'launch': 0.12, 'intercept': 0.25, 'detonation': 0.5, 'city_hit': 0.7, 'base_hit': 0.6}[kind]
+    t = numpy.arange(int(duration * sample_rate)) / sample_rate
+    noise = noise_source.uniform(-1, 1, len(t))
+
+    def sweep(start, end):
+        # Sine whose frequency glides linearly from start to end Hz
+        frequency = start + (end - start) * t / duration
+        return numpy.sin(2 * numpy.pi * numpy.cumsum(frequency) / sample_rate)
+
+    if kind == 'launch':
+        wave = sweep(440 * pitch, 660 * pitch) * (1 - t / duration)
+    elif kind == 'intercept':
+        wave = (0.7 * _low_pass(noise, sample_rate, 3000 * pitch) * 3 + 0.3 * sweep(900 * pitch, 500 * pitch)) * numpy.exp(-t * 14)
+    elif kind == 'detonation':
+        wave = (_low_pass(noise, sample_rate, 900 * pitch) * 4 + 0.5 * sweep(70 * pitch, 40 * pitch)) * numpy.exp(-t * 6)
+    elif kind == 'city_hit':
+        wave = (_low_pass(noise, sample_rate, 400 * pitch) * 6 + 0.6 * sweep(220 * pitch, 80 * pitch)) * numpy.exp(-t * 4)
+    else:
+        square = numpy.sign(sweep(330 * pitch, 110 * pitch))
+        wave = (0.5 * square + _low_pass(noise, sample_rate, 1500 * pitch) * 3) * numpy.exp(-t * 5)
+    return wave / max(1e-9, numpy.abs(wave).max())
+
+
+class SoundEngine:
+    """Plays sound effects on a fixed pool of reserved mixer channels.
+
+    Every effect kind has a priority, a minimum gap between plays and a cap on simultaneous
+    voices. When all channels are busy a new sound takes over the oldest voice of the lowest
+    priority, or is dropped if every voice playing matters more. Samples come from a bank of
+    variants synthesized once, in the background, so a barrage of explosions costs no
+    synthesis and never floods the mixer.
+    """
+    CHANNELS = 8
+    VARIANTS = 4
+    # kind: (priority, minimum gap in ms, maximum voices, volume)
+    EFFECTS = {
+        'launch': (1, 40, 2, 0.5),
+        'intercept': (1, 50, 3, 0.4),
+        'detonation': (2, 50, 4, 0.7),
+        'city_hit': (3, 100, 2, 0.9),
+        'base_hit': (3, 100, 2, 0.9),
+    }
+
+    def __init__(self, width=800):
+        self.width = width  # Of the screen, for panning
+        self.channels = []
+        self.voices = []  # Per channel: (priority, start time, kind) of the last sound started on it
+        self.samples = None  # kind -> variant arrays, filled in by the synthesis thread
+        self.bank = None  # kind -> pygame Sounds, made from the samples on first use
+        self.last_played = {}
+        self.next_variant = {}
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def start(self):
+        """Reserve the channel pool and synthesize the bank in the background; False without a mixer"""
+        if not pygame.mixer.get_init():
+            return False
+        try:
+            # Channels past the reserved ones stay free for the menu music
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.CHANNELS + 2))
+            pygame.mixer.set_reserved(self.CHANNELS)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.CHANNELS)]
+        except pygame.error:
+            return False
+        self.voices = [(0, 0, None)] * self.CHANNELS
+        sample_rate, _, channel_count = pygame.mixer.get_init()
+
+        def synthesize():
+            samples = {}
+            for kind in self.EFFECTS:
+                samples[kind] = []
+                for variant in range(self.VARIANTS):
+                    wave = (6000 * synthesize_sfx(kind, variant, sample_rate)).astype(numpy.int16)
+                    samples[kind].append(numpy.ascontiguousarray(numpy.column_stack([wave] * channel_count)))
+            self.samples = samples
+
+        threading.Thread(target=synthesize, daemon=True).start()
+        return True
+
+    def ready(self):
+        if self.bank is None and self.samples is not None:
+            try:
+                self.bank = {kind: [pygame.sndarray.make_sound(variant) for variant in variants]
+                             for kind, variants in self.samples.items()}
+            except:
+                self.samples = None  # No usable mixer after all; stay silent
+        return self.bank is not None
+
+    def play(self, kind, x=None):
+        """Play an effect, panned towards x if given; returns False if it was rate limited or dropped"""
+        if not self.ready():
+            return False
+        priority, gap, max_voices, volume = self.EFFECTS[kind]
+        now = pygame.time.get_ticks()
+        if now - self.last_played.get(kind, -gap) < gap:
+            self.dropped += 1
+            return False
+
+        free = None
+        same_kind = []
+        weakest = None  # Busy channel with the lowest priority, oldest first
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                if free is None:
+                    free = i
+                continue
+            if self.voices[i][2] == kind:
+                same_kind.append(i)
+            if weakest is None or self.voices[i][:2] < self.voices[weakest][:2]:
+                weakest = i
+
+        # A kind at its voice limit restarts its own oldest voice; otherwise take a free channel,
+        # or steal from a voice that matters no more than this one
+        if len(same_kind) >= max_voices:
+            victim = min(same_kind, key=lambda i: self.voices[i][1])
+        elif free is not None:
+            victim = free
+        elif self.voices[weakest][0] <= priority:
+            victim = weakest
+        else:
+            self.dropped += 1
+            return False
+        if victim != free:
+            self.stolen += 1
+
+        variant = self.next_variant.get(kind, 0)
+        self.next_variant[kind] = (variant + 1) % self.VARIANTS
+        channel = self.channels[victim]
+        channel.play(self.bank[kind][variant])
+        if x is None:
+            channel.set_volume(volume)
+        else:
+            pan = min(max(x / self.width, 0), 1)
+            channel.set_volume(volume * min(1, 2 * (1 - pan)), volume * min(1, 2 * pan))
+        self.voices[victim] = (priority, now, kind)
+        self.last_played[kind] = now
+        self.played += 1
+        return True
@@ -0,0 +1,270 @@
+"""Live spectator stream for mirroring a running game on other screens
+
+A SpectatorPublisher listens on a local TCP port or Unix socket path and sends every
+connected subscriber one binary frame per tick. Frames are self-contained, so a
+subscriber can join at any time, and are written without blocking: a subscriber
+that cannot take a whole frame skips ticks until it has drained, and is dropped
+if it stays behind.
+
+    TRUE_LIBERATOR_SPECTATE=47900 python main.py       # publish the local game
+    python spectator.py watch 47900                    # print what subscribers see
+
+Frames, little-endian:
+
+    frame       size:u32 header status missile* defensive_missile* explosion*
+    header      tick:u32 score:u32 wave:u16 flags:u8 missiles:u16 defensive_missiles:u16 explosions:u16
+    status      destroyed_cities:u8 launchers:u8 (missiles_remaining:u8)* bases:u8 (destroyed:u8 missiles_remaining:u8)*
+    missile     x:f32 y:f32 target_x:f32 target_y:f32
+    explosion   x:f32 y:f32 radius:u16 defensive:u8
+
+size counts the bytes after itself.
+"""
+import argparse
+import os
+import socket
+import struct
+
+SIZE = struct.Struct('<I')
+HEADER = struct.Struct('<IIHBHHH')
+MISSILE = struct.Struct('<ffff')
+EXPLOSION = struct.Struct('<ffHB')
+
+FLAG_GAME_OVER = 1
+FLAG_VICTORY_SCREEN = 2
+
+MAX_SKIPPED_FRAMES = 120  # A subscriber this far behind is disconnected
+INITIAL_CAPACITY = 16384
+
+
+def parse_address(address):
+    """A port number means TCP on localhost, anything else a Unix socket path"""
+    address = str(address)
+    if address.isdigit():
+        return socket.AF_INET, ('127.0.0.1', int(address))
+    return socket.AF_UNIX, address
+
+
+class Subscriber:
+    __slots__ = ('sock', 'backlog', 'skipped')
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.backlog = b''  # Unsent tail of the last frame after a partial write
+        self.skipped = 0
+
+
+class SpectatorPublisher:
+    def __init__(self, address):
+        self.family, self.address = parse_address(address)
+        if self.family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+        self.listener = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(self.address)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.subscribers = []
+        self.buffer = bytearray(INITIAL_CAPACITY)
+        self.view = memoryview(self.buffer)
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.subscribers_dropped = 0
+
+    def accept(self):
+        while True:
+            try:
+                sock, _ = self.listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            if self.family == socket.AF_INET:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.subscribers.append(Subscriber(sock))
+
+    def _reserve(self, size):
+        if size > len(self.buffer):
+            self.buffer = bytearray(max(size, len(self.buffer) * 2))
+            self.view = memoryview(self.buffer)
+
+    def pack(self, game):
+        """Serialize game into the reusable buffer and return the frame length"""
+        missiles = game.missiles
+        defensive_missiles = game.defensive_missiles
+        explosions = game.explosions
+        launchers = game.launchers
+        bases = game.defensive_bases
+        status_size = 3 + len(launchers) + 2 * len(bases)
+        self._reserve(SIZE.size + HEADER.size + status_size +
+                      MISSILE.size * (len(missiles) + len(defensive_missiles)) + EXPLOSION.size * len(explosions))
+
+        buffer = self.buffer
+        flags = (FLAG_GAME_OVER if game.game_over else 0) | (FLAG_VICTORY_SCREEN if game.show_victory_screen else 0)
+        offset = SIZE.size
+        HEADER.pack_into(buffer, offset, game.frame, game.score, game.wave, flags,
+                         len(missiles), len(defensive_missiles), len(explosions))
+        offset += HEADER.size
+
+        destroyed_cities = 0
+        for i, city in enumerate(game.cities):
+            if city.destroyed:
+                destroyed_cities |= 1 << i
+        buffer[offset] = destroyed_cities
+        buffer[offset + 1] = len(launchers)
+        offset += 2
+        for launcher in launchers:
+            buffer[offset] = launcher.missiles_remaining
+            offset += 1
+        buffer[offset] = len(bases)
+        offset += 1
+        for base in bases:
+            buffer[offset] = base.destroyed
+            buffer[offset + 1] = base.missiles_remaining
+            offset += 2
+
+        pack_missile = MISSILE.pack_into
+        for missile in missiles:
+            pack_missile(buffer, offset, missile.x, missile.y, missile.target_x, missile.target_y)
+            offset += MISSILE.size
+        for missile in defensive_missiles:
+            pack_missile(buffer, offset, missile.x, missile.y, missile.target_x, missile.target_y)
+            offset += MISSILE.size
+        pack_explosion = EXPLOSION.pack_into
+        for explosion in explosions:
+            pack_explosion(buffer, offset, explosion.x, explosion.y, explosion.radius, explosion.is_defensive)
+            offset += EXPLOSION.size
+        SIZE.pack_into(buffer, 0, offset - SIZE.size)
+        return offset
+
+    def publish(self, game):
+        """Send the current state of game to every subscriber that can take it without blocking"""
+        self.accept()
+        if not self.subscribers:
+            return
+        frame = self.view[:self.pack(game)]
+        dropped = []
+        for subscriber in self.subscribers:
+            try:
+                if subscriber.backlog:
+                    sent = subscriber.sock.send(subscriber.backlog)
+                    subscriber.backlog = subscriber.backlog[sent:]
+                    if subscriber.backlog:
+                        # Still draining: skip this frame rather than queue it
+                        subscriber.skipped += 1
+                        self.frames_skipped += 1
+                        if subscriber.skipped > MAX_SKIPPED_FRAMES:
+                            dropped.append(subscriber)
+                        continue
+                sent = subscriber.sock.send(frame)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                dropped.append(subscriber)
+                continue
+            if sent < len(frame):
+                if sent:
+                    subscriber.backlog = bytes(frame[sent:])  # The buffer is reused next tick
+                subscriber.skipped += 1
+                self.frames_skipped += 1
+                if subscriber.skipped > MAX_SKIPPED_FRAMES:
+                    dropped.append(subscriber)
+            else:
+                subscriber.skipped = 0
+                self.frames_sent += 1
+        for subscriber in dropped:
+            self.subscribers.remove(subscriber)
+            self.subscribers_dropped += 1
+            subscriber.sock.close()
+
+    def drain(self):
+        """Send what is left of each subscriber's last frame, e.g. while the game waits for its next tick"""
+        dropped = []
+        for subscriber in self.subscribers:
+            if not subscriber.backlog:
+                continue
+            try:
+                sent = subscriber.sock.send(subscriber.backlog)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                dropped.append(subscriber)
+                continue
+            subscriber.backlog = subscriber.backlog[sent:]
+        for subscriber in dropped:
+            self.subscribers.remove(subscriber)
+            self.subscribers_dropped += 1
+            subscriber.sock.close()
+
+    def close(self):
+        for subscriber in self.subscribers:
+            subscriber.sock.close()
+        self.subscribers = []
+        self.listener.close()
+        if self.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+
+def decode_frame(data):
+    """Decode the body of a frame (without its size prefix) into a dict"""
+    tick, score, wave, flags, missile_count, defensive_count, explosion_count = HEADER.unpack_from(data, 0)
+    offset = HEADER.size
+    destroyed_cities = data[offset]
+    launcher_count = data[offset + 1]
+    offset += 2
+    launchers = list(data[offset:offset + launcher_count])
+    offset += launcher_count
+    base_count = data[offset]
+    offset += 1
+    bases = [(bool(data[offset + 2 * i]), data[offset + 2 * i + 1]) for i in range(base_count)]
+    offset += 2 * base_count
+    missiles = list(MISSILE.iter_unpack(data[offset:offset + MISSILE.size * missile_count]))
+    offset += MISSILE.size * missile_count
+    defensive_missiles = list(MISSILE.iter_unpack(data[offset:offset + MISSILE.size * defensive_count]))
+    offset += MISSILE.size * defensive_count
+    explosions = list(EXPLOSION.iter_unpack(data[offset:offset + EXPLOSION.size * explosion_count]))
+    return {
+        'tick': tick, 'score': score, 'wave': wave,
+        'game_over': bool(flags & FLAG_GAME_OVER), 'victory_screen': bool(flags & FLAG_VICTORY_SCREEN),
+        'destroyed_cities': destroyed_cities, 'launchers': launchers, 'bases': bases,
+        'missiles': missiles, 'defensive_missiles': defensive_missiles, 'explosions': explosions,
+    }
+
+
+def subscribe(address):
+    """Connect to a publisher and yield decoded frames until it goes away"""
+    family, address = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(address)
+    pending = bytearray()
+    try:
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return
+            pending += chunk
+            while len(pending) >= SIZE.size:
+                size, = SIZE.unpack_from(pending, 0)
+                if len(pending) < SIZE.size + size:
+                    break
+                yield decode_frame(bytes(pending[SIZE.size:SIZE.size + size]))
+                del pending[:SIZE.size + size]
+    finally:
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a True Liberator spectator stream")
+    parser.add_argument('command', choices=['watch'])
+    parser.add_argument('address', help="TCP port on localhost or Unix socket path")
+    args = parser.parse_args()
+    for frame in subscribe(args.address):
+        print(f"tick {frame['tick']:6d}  wave {frame['wave']:3d}  score {frame['score']:6d}  "
+              f"missiles {len(frame['missiles']):3d}  interceptors {len(frame['defensive_missiles']):3d}  "
+              f"explosions {len(frame['explosions']):3d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""Two-process mode: simulation in a child process, rendering in the main one
+
+The simulation process steps a headless Game at a fixed 60 Hz and publishes each
+tick as a state_codec full snapshot into a shared memory double buffer. The render
+process decodes the newest complete slot straight out of shared memory, applies it
+to its own Game and draws it, so a slow frame on either side no longer delays the
+other. Clicks and menu choices travel back over a one-way pipe.
+
+    TRUE_LIBERATOR_SPLIT_PROCESS=1 python main.py
+
+Shared memory layout, little-endian:
+
+    control     front:i32 reading:i32 writing:i32      guarded by a multiprocessing lock
+    slot 0/1    serial:u32 length:u32 snapshot         snapshot as produced by state_codec.encode_full
+"""
+import multiprocessing
+import struct
+import time
+from multiprocessing import shared_memory
+
+import state_codec
+
+CONTROL = struct.Struct('<iii')
+SLOT_HEADER = struct.Struct('<II')
+SLOT_SIZE = 256 * 1024  # Room for about 10000 entities
+NONE = -1
+
+
+class SharedFrames:
+    """Double buffer of snapshots in shared memory.
+
+    The writer always fills the slot the reader is not holding, and the reader only
+    switches to the front slot when the writer is not in the middle of refilling it,
+    so neither side ever sees a half-written frame. The lock only guards the three
+    slot indices, never the copy itself.
+    """
+    def __init__(self, shm, lock):
+        self.shm = shm
+        self.lock = lock
+        self.buffer = shm.buf
+        self.serial = 0
+
+    @classmethod
+    def create(cls, context):
+        shm = shared_memory.SharedMemory(create=True, size=CONTROL.size + 2 * SLOT_SIZE)
+        CONTROL.pack_into(shm.buf, 0, NONE, 0, NONE)
+        return cls(shm, context.Lock())
+
+    def slot_offset(self, slot):
+        return CONTROL.size + slot * SLOT_SIZE
+
+    def publish(self, payload):
+        """Writer side: store one encoded snapshot and make it the front slot"""
+        if SLOT_HEADER.size + len(payload) > SLOT_SIZE:
+            return False
+        with self.lock:
+            front, reading, _ = CONTROL.unpack_from(self.buffer, 0)
+            slot = 1 - reading
+            CONTROL.pack_into(self.buffer, 0, front, reading, slot)
+        self.serial += 1
+        offset = self.slot_offset(slot)
+        SLOT_HEADER.pack_into(self.buffer, offset, self.serial, len(payload))
+        start = offset + SLOT_HEADER.size
+        self.buffer[start:start + len(payload)] = payload
+        with self.lock:
+            _, reading, _ = CONTROL.unpack_from(self.buffer, 0)
+            CONTROL.pack_into(self.buffer, 0, slot, reading, NONE)
+        return True
+
+    def latest(self):
+        """Reader side: return (serial, memoryview of the snapshot) for the newest complete frame.
+
+        The view points into shared memory and stays valid until the next call.
+        """
+        with self.lock:
+            front, reading, writing = CONTROL.unpack_from(self.buffer, 0)
+            if front != NONE and front != writing and front != reading:
+                reading = front
+                CONTROL.pack_into(self.buffer, 0, front, reading, writing)
+        if front == NONE:
+            return 0, None
+        offset = self.slot_offset(reading)
+        serial, length = SLOT_HEADER.unpack_from(self.buffer, offset)
+        if serial == 0:
+            return 0, None  # The only complete frame is still being overwritten
+        start = offset + SLOT_HEADER.size
+        return serial, self.buffer[start:start + length]
+
+    def close(self, unlink=False):
+        self.buffer = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def simulate(shm_name, lock, commands, difficulty, seed):
+    """Entry point of the simulation process"""
+    from main import Game, FPS
+
+    frames = SharedFrames(shared_memory.SharedMemory(name=shm_name), lock)
+    game = Game(difficulty, headless=True, seed=seed)
+    record_cache = {}
+    tick_seconds = 1 / FPS
+    next_tick = time.perf_counter()
+    running = True
+    try:
+        while running:
+            while commands.poll():
+                try:
+                    command = commands.recv()
+                except EOFError:
+                    running = False
+                    break
+                if command[0] == 'launch':
+                    x, y = command[1], command[2]
+                    if all((x, y) != (launcher.x, launcher.y) for launcher in game.launchers):
+                        game.launch_missile(x, y)
+                elif command[0] == 'continue' and game.show_victory_screen:
+                    game.continue_after_victory()
+                elif command[0] == 'quit':
+                    running = False
+            game.update()
+            frames.publish(state_codec.encode_full(state_codec.capture(game, record_cache)))
+
+            next_tick += tick_seconds
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -0.25:
+                next_tick = time.perf_counter()  # Too far behind to catch up; drop the missed ticks
+    finally:
+        frames.close()
+
+
+class SimulationProcess:
+    """Handle held by the render process for a game simulated in a child process"""
+    def __init__(self, difficulty, seed=None):
+        context = multiprocessing.get_context('spawn')  # The child must not inherit the SDL state
+        self.frames = SharedFrames.create(context)
+        receiver, self.commands = context.Pipe(duplex=False)
+        self.process = context.Process(target=simulate, daemon=True,
+                                       args=(self.frames.shm.name, self.frames.lock, receiver, difficulty, seed))
+        self.process.start()
+        receiver.close()
+        self.applied_serial = 0
+
+    def send(self, *command):
+        try:
+            self.commands.send(command)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def sync(self, game):
+        """Make game show the newest simulated tick; returns False if nothing new has arrived"""
+        serial, view = self.frames.latest()
+        if view is None or serial == self.applied_serial:
+            return False
+        state_codec.apply(state_codec.decode(view), game)
+        view.release()
+        self.applied_serial = serial
+        return True
+
+    def close(self):
+        self.send('quit')
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.commands.close()
+        self.frames.close(unlink=True)
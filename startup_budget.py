@@ -0,0 +1,72 @@
+"""Startup-time budget check for True Liberator
+
+Measures, in fresh interpreters:
+  * import time of main.py, as paid by headless tools, which must not bring up SDL
+  * time from process start to the first drawn menu frame
+
+    python startup_budget.py --runs 5
+
+Exits with status 1 when a median exceeds its budget.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_BUDGET_MS = 300
+FIRST_MENU_FRAME_BUDGET_MS = 600
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+import pygame
+assert not pygame.display.get_init(), "importing main initialized the display"
+assert not pygame.mixer.get_init(), "importing main initialized the mixer"
+print(elapsed * 1000)
+"""
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import():
+    result = subprocess.run([sys.executable, '-c', IMPORT_PROBE], cwd=HERE, capture_output=True, text=True,
+                            check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure_first_menu_frame():
+    env = dict(os.environ, TRUE_LIBERATOR_STARTUP_PROBE='1')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, 'main.py'], cwd=HERE, env=env, stdout=subprocess.PIPE, text=True)
+    elapsed = None
+    for line in process.stdout:
+        if line.strip() == "FIRST_MENU_FRAME":
+            elapsed = (time.perf_counter() - start) * 1000
+    process.wait()
+    if elapsed is None:
+        raise RuntimeError("main.py exited without drawing a menu frame")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check True Liberator startup times against their budgets")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    over_budget = False
+    for name, measure, budget in (("import main", measure_import, IMPORT_BUDGET_MS),
+                                  ("first menu frame", measure_first_menu_frame, FIRST_MENU_FRAME_BUDGET_MS)):
+        samples = [measure() for _ in range(args.runs)]
+        median = statistics.median(samples)
+        status = "OK" if median <= budget else "OVER BUDGET"
+        over_budget |= median > budget
+        print(f"{name:18s} median {median:7.1f} ms  max {max(samples):7.1f} ms  budget {budget} ms  {status}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
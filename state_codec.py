@@ -0,0 +1,231 @@
+"""Compact binary encoding of True Liberator game state
+
+Missiles fly in straight lines and explosions grow at a fixed rate, so every moving
+entity is fully described by an immutable spawn record plus the current tick. A
+snapshot is a small header, a status block for cities, launchers and bases, and one
+fixed-size record per entity. A delta against an earlier snapshot carries the header,
+the status block only if it changed, and the entities spawned or removed since.
+
+All values are little-endian:
+
+    full snapshot   'F' header status_len:u16 status count:u16 record*
+    delta           'D' baseline_tick:u32 header has_status:u8 [status_len:u16 status]
+                        removed:u16 uid:u32* added:u16 record*
+    header          tick:u32 score:u32 wave:u16 flags:u8
+    status          destroyed_cities:u8 launchers:u8 unit* bases:u8 unit*
+    unit            destroyed:u8 missiles_remaining:u8 cooldown_ms_left:u16
+    record          kind:u8 uid:u32 spawn_tick:u32 a:f32 b:f32 c:f32 d:f32
+"""
+import struct
+
+HEADER = struct.Struct('<IIHB')
+RECORD = struct.Struct('<BIIffff')
+UNIT = struct.Struct('<BBH')
+COUNT = struct.Struct('<H')
+UID = struct.Struct('<I')
+TICK = struct.Struct('<I')
+
+# Record kinds. Missiles carry start and target, explosions centre, max radius and growth rate.
+KIND_MISSILE = 0
+KIND_DEFENSIVE_MISSILE = 1
+KIND_EXPLOSION = 2
+KIND_DEFENSIVE_EXPLOSION = 3
+
+FLAG_GAME_OVER = 1
+FLAG_VICTORY_SCREEN = 2
+FLAG_AI_DEFENSE = 4
+
+FULL = b'F'
+DELTA = b'D'
+
+
+class Snapshot:
+    """Game state at one tick, as packed records keyed by entity uid"""
+    __slots__ = ('tick', 'score', 'wave', 'flags', 'status', 'records')
+
+    def __init__(self, tick, score, wave, flags, status, records):
+        self.tick = tick
+        self.score = score
+        self.wave = wave
+        self.flags = flags
+        self.status = status
+        self.records = records
+
+
+def _cooldown_left(unit, current_time):
+    return max(0, min(0xFFFF, unit.last_shot_time + unit.shot_cooldown + 1 - current_time))
+
+
+def pack_status(game):
+    current_time = game.current_time()
+    destroyed_cities = 0
+    for i, city in enumerate(game.cities):
+        if city.destroyed:
+            destroyed_cities |= 1 << i
+    parts = [bytes((destroyed_cities, len(game.launchers)))]
+    for launcher in game.launchers:
+        parts.append(UNIT.pack(0, launcher.missiles_remaining, _cooldown_left(launcher, current_time)))
+    parts.append(bytes((len(game.defensive_bases),)))
+    for base in game.defensive_bases:
+        parts.append(UNIT.pack(base.destroyed, base.missiles_remaining, _cooldown_left(base, current_time)))
+    return b''.join(parts)
+
+
+def capture(game, record_cache=None):
+    """Snapshot a game.
+
+    record_cache maps uid -> packed record; passing the same dict every tick means each
+    entity is packed once, when it first appears.
+    """
+    if record_cache is None:
+        record_cache = {}
+    frame = game.frame
+    records = {}
+    for kind, missiles in ((KIND_MISSILE, game.missiles), (KIND_DEFENSIVE_MISSILE, game.defensive_missiles)):
+        for missile in missiles:
+            record = record_cache.get(missile.uid)
+            if record is None:
+                record = record_cache[missile.uid] = RECORD.pack(kind, missile.uid, frame - missile.steps,
+                                                                 missile.start_x, missile.start_y,
+                                                                 missile.target_x, missile.target_y)
+            records[missile.uid] = record
+    for explosion in game.explosions:
+        record = record_cache.get(explosion.uid)
+        if record is None:
+            kind = KIND_DEFENSIVE_EXPLOSION if explosion.is_defensive else KIND_EXPLOSION
+            spawn_tick = frame + 1 - explosion.radius // explosion.growth_rate
+            record = record_cache[explosion.uid] = RECORD.pack(kind, explosion.uid, spawn_tick, explosion.x,
+                                                               explosion.y, explosion.max_radius,
+                                                               explosion.growth_rate)
+        records[explosion.uid] = record
+    if len(record_cache) > len(records):
+        for uid in [uid for uid in record_cache if uid not in records]:
+            del record_cache[uid]
+
+    flags = ((FLAG_GAME_OVER if game.game_over else 0) | (FLAG_VICTORY_SCREEN if game.show_victory_screen else 0) |
+             (FLAG_AI_DEFENSE if game.ai_defense else 0))
+    return Snapshot(frame, game.score, game.wave, flags, pack_status(game), records)
+
+
+def _pack_header(snapshot):
+    return HEADER.pack(snapshot.tick, snapshot.score, snapshot.wave, snapshot.flags)
+
+
+def encode_full(snapshot):
+    return b''.join((FULL, _pack_header(snapshot), COUNT.pack(len(snapshot.status)), snapshot.status,
+                     COUNT.pack(len(snapshot.records)), *snapshot.records.values()))
+
+
+def encode_delta(snapshot, baseline):
+    """Encode snapshot relative to a baseline the receiver already holds"""
+    parts = [DELTA, TICK.pack(baseline.tick), _pack_header(snapshot)]
+    if snapshot.status != baseline.status:
+        parts += (b'\x01', COUNT.pack(len(snapshot.status)), snapshot.status)
+    else:
+        parts.append(b'\x00')
+    removed = [uid for uid in baseline.records if uid not in snapshot.records]
+    parts.append(COUNT.pack(len(removed)))
+    parts += [UID.pack(uid) for uid in removed]
+    added = [record for uid, record in snapshot.records.items() if uid not in baseline.records]
+    parts.append(COUNT.pack(len(added)))
+    parts += added
+    return b''.join(parts)
+
+
+def encode(snapshot, baseline=None):
+    return encode_delta(snapshot, baseline) if baseline is not None else encode_full(snapshot)
+
+
+def baseline_tick(data):
+    """Tick of the baseline a delta was encoded against, or None for a full snapshot"""
+    return TICK.unpack_from(data, 1)[0] if data[:1] == DELTA else None
+
+
+def decode(data, baseline=None):
+    """Decode a full snapshot, or a delta given the snapshot it was encoded against"""
+    kind = data[:1]
+    offset = 1
+    if kind == DELTA:
+        expected_tick, = TICK.unpack_from(data, offset)
+        offset += TICK.size
+        if baseline is None or baseline.tick != expected_tick:
+            raise ValueError(f"delta needs baseline tick {expected_tick}")
+    elif kind != FULL:
+        raise ValueError(f"not a snapshot: {kind!r}")
+    tick, score, wave, flags = HEADER.unpack_from(data, offset)
+    offset += HEADER.size
+
+    if kind == DELTA:
+        has_status = data[offset]
+        offset += 1
+    else:
+        has_status = True
+    if has_status:
+        length, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        status = bytes(data[offset:offset + length])
+        offset += length
+    else:
+        status = baseline.status
+
+    if kind == DELTA:
+        records = dict(baseline.records)
+        removed, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        for _ in range(removed):
+            records.pop(UID.unpack_from(data, offset)[0], None)
+            offset += UID.size
+    else:
+        records = {}
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    for _ in range(count):
+        record = bytes(data[offset:offset + RECORD.size])
+        records[UID.unpack_from(record, 1)[0]] = record
+        offset += RECORD.size
+    return Snapshot(tick, score, wave, flags, status, records)
+
+
+def apply(snapshot, game):
+    """Make game show the state in snapshot, e.g. so a client can draw it with Game.draw()"""
+    game.frame = snapshot.tick
+    game.score = snapshot.score
+    game.wave = snapshot.wave
+    game.game_over = bool(snapshot.flags & FLAG_GAME_OVER)
+    game.show_victory_screen = bool(snapshot.flags & FLAG_VICTORY_SCREEN)
+    game.ai_defense = bool(snapshot.flags & FLAG_AI_DEFENSE)
+    current_time = game.current_time()
+
+    status = snapshot.status
+    for i, city in enumerate(game.cities):
+        city.destroyed = bool(status[0] & (1 << i))
+    offset = 1
+    for units in (game.launchers, game.defensive_bases):
+        count = status[offset]
+        offset += 1
+        for unit in units[:count]:
+            destroyed, unit.missiles_remaining, cooldown_left = UNIT.unpack_from(status, offset)
+            unit.last_shot_time = current_time + cooldown_left - unit.shot_cooldown - 1
+            if hasattr(unit, 'destroyed'):
+                unit.destroyed = bool(destroyed)
+            offset += UNIT.size
+
+    game.missile_pool.release_all(game.missiles)
+    game.defensive_missile_pool.release_all(game.defensive_missiles)
+    game.explosion_pool.release_all(game.explosions)
+    for record in snapshot.records.values():
+        kind, uid, spawn_tick, a, b, c, d = RECORD.unpack(record)
+        if kind == KIND_MISSILE or kind == KIND_DEFENSIVE_MISSILE:
+            if kind == KIND_MISSILE:
+                missile, entities = game.missile_pool.acquire(a, b, c, d), game.missiles
+            else:
+                missile, entities = game.defensive_missile_pool.acquire(a, b, c, d), game.defensive_missiles
+            missile.uid = uid
+            missile.advance(snapshot.tick - spawn_tick)
+            entities.append(missile)
+        else:
+            explosion = game.explosion_pool.acquire(a, b, c, kind == KIND_DEFENSIVE_EXPLOSION)
+            explosion.uid = uid
+            explosion.growth_rate = int(d)
+            explosion.advance(snapshot.tick - spawn_tick + 1)
+            game.explosions.append(explosion)
@@ -0,0 +1,206 @@
+"""Gameplay telemetry for True Liberator
+
+Game emits one typed event for everything that matters to analytics: launches on both
+sides, detonations, interceptions, hits and wave boundaries. Events are written into
+preallocated columns (array.array, one per field), so emitting one costs a handful of
+item assignments and no allocation. Full buffers are handed to a background thread that
+appends them to the log file as a chunk and returns them for reuse.
+
+    TRUE_LIBERATOR_TELEMETRY=logs python main.py      # one log per game
+    python headless.py --games 50 --telemetry run.tlm
+    python telemetry.py run.tlm                       # summary tables
+
+load() returns every column as a NumPy array for aggregation. All values are
+little-endian:
+
+    file        magic:'TLTM' version:u8 meta_len:u16 meta chunk*
+    meta        JSON, free-form notes from whoever opened the log
+    chunk       count:u32 frame:u32*count kind:u8*count subject:i16*count uid:u32*count
+                ref:u32*count x:f32*count y:f32*count
+
+    kind            subject                     uid          ref                     x, y
+    GAME_START      difficulty index            0            seed                    world size
+    WAVE_START      wave                        0            score                   -
+    WAVE_END        wave                        0            score                   -
+    GAME_OVER       wave                        0            score                   -
+    LAUNCH          launcher index              missile      0                       aim point
+    DEFENSE_LAUNCH  base index                  interceptor  missile aimed at        aim point
+    DETONATION      -1                          missile      explosion               position
+    PROXIMITY       1 if the fuse fired, else 0 interceptor  explosion               position
+    INTERCEPTION    -1                          missile      explosion that got it   position
+    CITY_HIT        city index                  explosion    0                       city centre
+    BASE_HIT        base index                  explosion    0                       base
+"""
+import argparse
+import json
+import queue
+import struct
+import sys
+import threading
+from array import array
+
+import numpy
+
+MAGIC = b'TLTM'
+VERSION = 1
+
+PREFIX = struct.Struct('<4sBH')
+COUNT = struct.Struct('<I')
+
+(GAME_START, WAVE_START, WAVE_END, GAME_OVER, LAUNCH, DEFENSE_LAUNCH, DETONATION, PROXIMITY,
+ INTERCEPTION, CITY_HIT, BASE_HIT) = range(11)
+KIND_NAMES = ('GAME_START', 'WAVE_START', 'WAVE_END', 'GAME_OVER', 'LAUNCH', 'DEFENSE_LAUNCH', 'DETONATION',
+              'PROXIMITY', 'INTERCEPTION', 'CITY_HIT', 'BASE_HIT')
+DIFFICULTIES = ('EASY', 'NORMAL', 'HARD')
+
+# Column name, array.array typecode and NumPy dtype, in file order
+COLUMNS = (('frame', 'I', '<u4'), ('kind', 'B', 'u1'), ('subject', 'h', '<i2'), ('uid', 'I', '<u4'),
+           ('ref', 'I', '<u4'), ('x', 'f', '<f4'), ('y', 'f', '<f4'))
+ROW_SIZE = sum(numpy.dtype(dtype).itemsize for _, _, dtype in COLUMNS)
+CAPACITY = 4096  # Events per buffer; one chunk is written per full buffer
+
+
+class TelemetryLog:
+    """Event sink for one log file; emit() on the game thread, writing on a background thread"""
+    def __init__(self, path, meta=None, capacity=CAPACITY):
+        self.capacity = capacity
+        self.file = open(path, 'wb')
+        header = json.dumps(meta or {}, separators=(',', ':')).encode()
+        self.file.write(PREFIX.pack(MAGIC, VERSION, len(header)) + header)
+        self.columns = self.new_buffers()
+        self.count = 0
+        self.events = 0
+        self.chunks = 0
+        self.spare = queue.SimpleQueue()  # Buffers the writer has finished with
+        self.pending = queue.SimpleQueue()  # (columns, count) waiting to be written, None to stop
+        self.writer = threading.Thread(target=self.write_loop, name="telemetry-writer", daemon=True)
+        self.writer.start()
+
+    def new_buffers(self):
+        return tuple(array(typecode, bytes(array(typecode).itemsize * self.capacity))
+                     for _, typecode, _ in COLUMNS)
+
+    def emit(self, frame, kind, subject=0, uid=0, ref=0, x=0.0, y=0.0):
+        i = self.count
+        frames, kinds, subjects, uids, refs, xs, ys = self.columns
+        frames[i] = frame
+        kinds[i] = kind
+        subjects[i] = subject
+        uids[i] = uid
+        refs[i] = ref
+        xs[i] = x
+        ys[i] = y
+        self.count = i + 1
+        if self.count == self.capacity:
+            self.flush()
+
+    def flush(self):
+        """Hand the events so far to the writer and carry on in a recycled buffer"""
+        if not self.count:
+            return
+        self.pending.put((self.columns, self.count))
+        self.events += self.count
+        self.chunks += 1
+        try:
+            self.columns = self.spare.get_nowait()
+        except queue.Empty:
+            self.columns = self.new_buffers()  # The writer is behind; never make the game wait
+        self.count = 0
+
+    def write_loop(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            columns, count = item
+            try:
+                self.file.write(COUNT.pack(count))
+                for column in columns:
+                    self.file.write(memoryview(column)[:count])
+                self.file.flush()
+            except:
+                pass
+            self.spare.put(columns)
+
+    def close(self):
+        """Write out everything emitted so far and close the file"""
+        self.flush()
+        self.pending.put(None)
+        self.writer.join()
+        self.file.close()
+
+
+def load(path):
+    """(meta, columns) of a log, where columns maps each column name to a NumPy array"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, length = PREFIX.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a True Liberator telemetry log")
+    if version != VERSION:
+        raise ValueError(f"unsupported telemetry version {version}")
+    meta = json.loads(data[PREFIX.size:PREFIX.size + length])
+    offset = PREFIX.size + length
+    parts = {name: [] for name, _, _ in COLUMNS}
+    while offset + COUNT.size <= len(data):
+        count, = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        if offset + count * ROW_SIZE > len(data):
+            break  # A chunk cut short by a crash; everything before it is intact
+        for name, _, dtype in COLUMNS:
+            parts[name].append(numpy.frombuffer(data, dtype, count, offset))
+            offset += numpy.dtype(dtype).itemsize * count
+    return meta, {name: numpy.concatenate(parts[name]) if parts[name] else numpy.zeros(0, dtype)
+                  for name, _, dtype in COLUMNS}
+
+
+def summarize(columns):
+    """Aggregate tables from the columns returned by load()"""
+    kind = columns['kind']
+    counts = numpy.bincount(kind, minlength=len(KIND_NAMES))
+    base_shots = numpy.bincount(columns['subject'][kind == DEFENSE_LAUNCH].astype(numpy.intp))
+    launcher_shots = numpy.bincount(columns['subject'][kind == LAUNCH].astype(numpy.intp))
+    intercepted = kind == INTERCEPTION
+    proximity = kind == PROXIMITY
+    # The ground line of each interception's game is the world height in its GAME_START event
+    starts = numpy.flatnonzero(kind == GAME_START)
+    game = numpy.searchsorted(starts, numpy.flatnonzero(intercepted), side='right') - 1
+    ground = columns['y'][starts][game] if len(starts) else 600
+    return {
+        'events': {name: int(count) for name, count in zip(KIND_NAMES, counts) if count},
+        'games': int(counts[GAME_START]),
+        'shots_per_city': counts[LAUNCH] / max(1, counts[CITY_HIT]),
+        'interceptions_per_launch': counts[INTERCEPTION] / max(1, counts[LAUNCH]),
+        'fuse_share': float(columns['subject'][proximity].mean()) if proximity.any() else 0.0,
+        'base_shots': base_shots.tolist(),
+        'launcher_shots': launcher_shots.tolist(),
+        # Where interceptions happen, as deciles of height above the ground
+        'interception_height': numpy.percentile(ground - columns['y'][intercepted], numpy.arange(10, 100, 10)).round().tolist()
+                               if intercepted.any() else [],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a True Liberator telemetry log")
+    parser.add_argument('log')
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args()
+    meta, columns = load(args.log)
+    summary = summarize(columns)
+    if args.json:
+        json.dump({'meta': meta, **summary}, sys.stdout, indent=2)
+        print()
+        return
+    print(f"{len(columns['kind'])} events from {summary['games']} games  {json.dumps(meta)}")
+    for name, count in summary['events'].items():
+        print(f"  {name:>15} {count:8d}")
+    print(f"Shots per city destroyed:  {summary['shots_per_city']:.2f}")
+    print(f"Interceptions per launch:  {summary['interceptions_per_launch']:.2f}")
+    print(f"Interceptor fuse share:    {summary['fuse_share']:.0%}")
+    print(f"Shots by base:             {summary['base_shots']}")
+    print(f"Shots by launcher:         {summary['launcher_shots']}")
+    print(f"Interception height deciles (px above ground): {summary['interception_height']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Shared helpers for the simulation tests"""
+
+
+def fingerprint(game):
+    """Everything the simulation carries on from, in comparable form"""
+    return (game.frame, game.score, game.wave, game.game_over, game.rng.getstate(),
+            [(m.uid, m.x, m.y, m.steps, tuple(m.trail)) for m in game.missiles],
+            [(m.uid, m.x, m.y, m.steps, tuple(m.trail)) for m in game.defensive_missiles],
+            [(e.uid, e.x, e.y, e.radius, e.is_defensive) for e in game.explosions],
+            [city.destroyed for city in game.cities],
+            [(unit.missiles_remaining, unit.last_shot_time, unit.shot_cooldown) for unit in game.launchers],
+            [(base.destroyed, base.missiles_remaining, base.last_shot_time, base.shot_cooldown)
+             for base in game.defensive_bases])
+
+
+def play(game, player, frames):
+    """Step game frame by frame for the given number of frames, letting player act when it asks to"""
+    end = game.frame + frames
+    next_decision = game.frame
+    while game.frame < end and not game.game_over:
+        if game.show_victory_screen:
+            game.continue_after_victory()
+        if game.frame >= next_decision:
+            next_decision = game.frame + max(1, player.act(game))
+        game.step()
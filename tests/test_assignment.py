@@ -0,0 +1,35 @@
+"""Assignment of defensive bases to missiles"""
+import itertools
+import random
+
+import pytest
+
+from main import solve_assignment
+
+
+def brute_force_assignment(cost):
+    """Lowest total cost over every way of matching min(rows, columns) pairs"""
+    rows, columns = len(cost), len(cost[0])
+    if rows <= columns:
+        return min(sum(cost[row][column] for row, column in enumerate(chosen))
+                   for chosen in itertools.permutations(range(columns), rows))
+    return min(sum(cost[row][column] for column, row in enumerate(chosen))
+               for chosen in itertools.permutations(range(rows), columns))
+
+
+def test_solve_assignment_finds_the_cheapest_matching():
+    rng = random.Random(0)
+    for _ in range(300):
+        rows, columns = rng.randint(1, 5), rng.randint(1, 5)
+        cost = [[rng.choice([rng.randint(0, 20), rng.uniform(0, 100), 1e9]) for _ in range(columns)]
+                for _ in range(rows)]
+        pairs = solve_assignment(cost)
+        assert len(pairs) == min(rows, columns)
+        assert pairs == sorted(pairs)
+        assert len({row for row, _ in pairs}) == len({column for _, column in pairs}) == len(pairs)
+        assert sum(cost[row][column] for row, column in pairs) == pytest.approx(brute_force_assignment(cost))
+
+
+def test_solve_assignment_of_nothing():
+    assert solve_assignment([]) == []
+    assert solve_assignment([[]]) == []
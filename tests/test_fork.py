@@ -0,0 +1,35 @@
+"""Forks of a game and the bot that plans on them"""
+import copy
+
+from headless import GreedyAttacker, LookaheadAttacker
+from helpers import fingerprint, play
+from main import Game
+
+
+def test_fork_leaves_the_parent_untouched():
+    game = Game('NORMAL', headless=True, seed=5)
+    player = GreedyAttacker(5)
+    play(game, player, 300)
+    before = fingerprint(game)
+    fork = game.fork()
+    fork_player = copy.deepcopy(player)
+    play(fork, fork_player, 600)
+    fork.fast_forward(600)
+    assert fingerprint(game) == before
+
+    # Given the same inputs the parent then plays out exactly as the fork did
+    play(game, player, 600)
+    game.fast_forward(600)
+    assert fingerprint(game) == fingerprint(fork)
+
+
+def test_lookahead_rollouts_leave_the_game_untouched():
+    game = Game('NORMAL', headless=True, seed=9)
+    play(game, GreedyAttacker(9), 240)
+    before = fingerprint(game)
+    bot = LookaheadAttacker(9, candidates=6)
+    targets = bot.targets(game)
+    for target in targets:
+        bot.rollout(game, target)
+    assert fingerprint(game) == before
+    assert bot.forks == len(targets) and bot.rollout_frames
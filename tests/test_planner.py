@@ -0,0 +1,47 @@
+"""The AI's intercept planner"""
+import random
+
+from main import Game
+from planner import READY_MISSILES
+
+
+def crowded_game(count, seed=1):
+    """A game with count player missiles in flight towards the cities"""
+    game = Game('NORMAL', headless=True, seed=seed)
+    rng = random.Random(seed)
+    for _ in range(count):
+        missile = game.register(game.missile_pool.acquire(rng.uniform(0, 800), 0, rng.uniform(50, 750), 560))
+        missile.advance(rng.randint(0, 120))
+        game.missiles.append(missile)
+    return game
+
+
+def test_ready_bases_plan_a_bounded_number_of_missiles():
+    game = crowded_game(200)
+    planner = game.planner
+    stock = sum(base.missiles_remaining for base in game.defensive_bases)
+    for _ in range(60):
+        planned = planner.planned - planner.ahead
+        game.update()
+        # Every standing base is ready at most once per frame
+        assert planner.planned - planner.ahead - planned <= READY_MISSILES * len(game.defensive_bases)
+    assert sum(base.missiles_remaining for base in game.defensive_bases) < stock  # The bases still fire
+
+
+def test_candidates_are_the_missiles_a_base_reaches_soonest():
+    game = crowded_game(100)
+    bases = list(enumerate(game.defensive_bases))
+    candidates = game.planner.candidates(game, bases, game.missiles)
+    for index, _ in bases:
+        chosen = candidates[index]
+        assert len(chosen) == READY_MISSILES
+        times = sorted(game.coverage.time_to_reach(index, missile.x, missile.y) for missile in game.missiles)
+        assert [game.coverage.time_to_reach(index, missile.x, missile.y) for missile in chosen] == times[:READY_MISSILES]
+
+
+def test_solutions_are_dropped_with_their_missile():
+    game = crowded_game(30)
+    while game.missiles:
+        game.update()
+        live = {missile.uid for missile in game.missiles}
+        assert {uid for _, uid in game.planner.solutions} <= live
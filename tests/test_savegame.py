@@ -0,0 +1,59 @@
+"""Full-state saves and the autosave shown on the title screen"""
+import copy
+
+import pytest
+
+import main
+import savegame
+from headless import GreedyAttacker
+from helpers import fingerprint, play
+from main import Game
+
+
+@pytest.mark.parametrize('difficulty', ['EASY', 'HARD'])
+def test_loaded_save_carries_on_identically(difficulty):
+    game = Game(difficulty, headless=True, seed=7)
+    player = GreedyAttacker(7)
+    play(game, player, 450)
+    data = savegame.dumps(game)
+    loaded = Game('NORMAL', headless=True)
+    savegame.loads(data, loaded)
+    assert savegame.dumps(loaded) == data
+    assert fingerprint(loaded) == fingerprint(game)
+
+    loaded_player = copy.deepcopy(player)
+    play(game, player, 900)
+    play(loaded, loaded_player, 900)
+    assert fingerprint(loaded) == fingerprint(game)
+
+
+def test_peek_reads_the_header(tmp_path):
+    path = str(tmp_path / 'game.sav')
+    assert savegame.peek(path) is None
+    game = Game('HARD', headless=True, seed=2)
+    play(game, GreedyAttacker(2), 300)
+    savegame.save(game, path)
+    assert savegame.peek(path) == ('HARD', game.wave, game.score)
+    savegame.remove(path)
+    assert savegame.peek(path) is None
+
+
+def test_menu_reads_the_autosave_only_after_writes(tmp_path, monkeypatch):
+    path = str(tmp_path / 'autosave.sav')
+    monkeypatch.setattr(main, 'AUTOSAVE_FILE', path)
+    peeks = []
+    peek = savegame.peek
+    monkeypatch.setattr(savegame, 'peek', lambda path: peeks.append(path) or peek(path))
+    menu = main.MenuScreen.__new__(main.MenuScreen)
+    menu.saved = menu.saved_writes = None
+    for _ in range(3):
+        assert menu.saved_game() is None
+    assert len(peeks) == 1
+
+    savegame.save(Game('EASY', headless=True, seed=1), path)
+    assert menu.saved_game() == ('EASY', 1, 0)
+    assert menu.saved_game() == ('EASY', 1, 0)
+    assert len(peeks) == 2
+    menu.refresh_saved_game()
+    menu.saved_game()
+    assert len(peeks) == 3
@@ -0,0 +1,43 @@
+"""Fast-forward against stepping frame by frame"""
+import pytest
+
+from headless import GreedyAttacker, run_headless
+from helpers import fingerprint
+from main import Game
+
+
+class Recorder(GreedyAttacker):
+    """Greedy player noting the whole game state whenever it decides"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.states = []
+
+    def act(self, game):
+        self.states.append(fingerprint(game))
+        return super().act(game)
+
+
+@pytest.mark.parametrize('min_interval', [0, 120])
+@pytest.mark.parametrize('difficulty', ['EASY', 'NORMAL', 'HARD'])
+def test_fast_forward_matches_single_step(difficulty, min_interval):
+    for seed in range(2):
+        stepped = Recorder(seed, min_interval=min_interval)
+        skipped = Recorder(seed, min_interval=min_interval)
+        stepped_game = run_headless(difficulty, seed, stepped, max_waves=2, fast_forward=False)
+        skipped_game = run_headless(difficulty, seed, skipped, max_waves=2, fast_forward=True)
+        assert skipped.states == stepped.states
+        assert fingerprint(skipped_game) == fingerprint(stepped_game)
+
+
+def test_quiet_ticks_run_up_to_the_fuse():
+    # Head on, closing 7px per tick from 400px apart: within fuse range after 52.9 ticks, i.e. in update 53
+    game = Game('EASY', headless=True, seed=0)
+    game.ai_defense = False
+    game.missiles.append(game.register(game.missile_pool.acquire(100, 0, 100, 600)))
+    game.defensive_missiles.append(game.register(game.defensive_missile_pool.acquire(100, 400, 100, 0)))
+    assert game.quiet_ticks() == 52
+    for _ in range(52):
+        game.step()
+    assert not game.explosions
+    game.step()
+    assert len(game.explosions) == 1
@@ -0,0 +1,50 @@
+"""Snapshots for network play and the other displays"""
+import pytest
+
+import state_codec
+from headless import GreedyAttacker
+from helpers import play
+from main import Game
+
+
+def test_snapshot_round_trip():
+    game = Game('NORMAL', headless=True, seed=11)
+    player = GreedyAttacker(11)
+    play(game, player, 400)
+    snapshot = state_codec.capture(game)
+    assert snapshot.records
+
+    decoded = state_codec.decode(state_codec.encode(snapshot))
+    for field in state_codec.Snapshot.__slots__:
+        assert getattr(decoded, field) == getattr(snapshot, field), field
+
+    # A view the snapshot is applied to shows the same state and captures the same snapshot again
+    view = Game('NORMAL', headless=True)
+    state_codec.apply(decoded, view)
+    recaptured = state_codec.capture(view)
+    for field in state_codec.Snapshot.__slots__:
+        assert getattr(recaptured, field) == getattr(snapshot, field), field
+    positions = {m.uid: (m.x, m.y) for m in game.missiles + game.defensive_missiles}
+    for missile in view.missiles + view.defensive_missiles:
+        assert missile.x == pytest.approx(positions[missile.uid][0], abs=0.01)
+        assert missile.y == pytest.approx(positions[missile.uid][1], abs=0.01)
+    radii = {explosion.uid: explosion.radius for explosion in game.explosions}
+    assert {explosion.uid: explosion.radius for explosion in view.explosions} == radii
+
+    # Deltas against an earlier snapshot decode to the same state as a full one
+    play(game, player, 45)
+    later = state_codec.capture(game)
+    delta = state_codec.decode(state_codec.encode(later, snapshot), snapshot)
+    for field in state_codec.Snapshot.__slots__:
+        assert getattr(delta, field) == getattr(later, field), field
+
+
+def test_delta_needs_its_baseline():
+    game = Game('NORMAL', headless=True, seed=3)
+    play(game, GreedyAttacker(3), 200)
+    baseline = state_codec.capture(game)
+    game.step()
+    data = state_codec.encode(state_codec.capture(game), baseline)
+    assert state_codec.baseline_tick(data) == baseline.tick
+    with pytest.raises(ValueError):
+        state_codec.decode(data)
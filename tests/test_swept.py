@@ -0,0 +1,96 @@
+"""Fuses, interceptions and arrivals tested along the whole step"""
+import random
+
+import pytest
+
+import main
+from helpers import fingerprint
+from main import DefensiveMissile, Explosion, Game, Missile, swept_fuses, swept_interceptions
+
+
+def crossings(seed, count):
+    """Player missiles falling on the cities and interceptors fired at points on or near their paths"""
+    rng = random.Random(seed)
+    missiles, d_missiles = [], []
+    for _ in range(count):
+        missile = Missile(rng.uniform(50, 750), 0, rng.uniform(50, 750), 600)
+        missile.advance(rng.randint(20, 60))
+        # Fired from somewhere near the missile's path, so that about half of them fuse now
+        d_missile = DefensiveMissile(missile.x + rng.uniform(-60, 60), missile.y + rng.uniform(-60, 60),
+                                     rng.uniform(50, 750), 0)
+        missiles.append(missile)
+        d_missiles.append(d_missile)
+    return missiles, d_missiles
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_batched_and_looped_tests_agree(seed, monkeypatch):
+    missiles, d_missiles = crossings(seed, 12)
+    rng = random.Random(seed)
+    explosions = []
+    for missile in missiles:
+        explosion = Explosion(*missile.position_at(missile.steps + rng.randint(-3, 3)), rng.choice([30, 50]))
+        explosion.advance(rng.randint(1, 20))
+        explosions.append(explosion)
+    results = []
+    for vector_pairs in (0, 10 ** 9):
+        monkeypatch.setattr(main, 'VECTOR_PAIRS', vector_pairs)
+        results.append((swept_fuses(d_missiles, missiles), swept_interceptions(explosions, missiles)))
+    assert results[0] == results[1]
+    assert any(results[0][0]) and any(results[0][1])
+
+
+def test_fuse_catches_a_pass_between_two_samples():
+    # Head on, 3px apart before the step and 4px apart after it, the other way round
+    missile = Missile(100, 0, 100, 600)
+    missile.advance(99)
+    d_missile = DefensiveMissile(100, 400, 100, 0)
+    d_missile.proximity_fuse_radius = 2
+    d_missile.advance(25)
+    missile.update()
+    assert abs(d_missile.y - missile.position_at(missile.steps - 1)[1]) > 2
+    assert abs(d_missile.position_at(d_missile.steps + 1)[1] - missile.y) > 2
+    assert swept_fuses([d_missile], [missile]) == [True]
+
+
+def test_interception_catches_a_pass_between_two_samples():
+    missile = Missile(0, 100, 600, 100)
+    missile.advance(33)  # At x=99, crossing the explosion's centre at x=100.5 next step
+    explosion = Explosion(100.5, 100, max_radius=50)
+    explosion.radius = 1
+    missile.update()
+    assert abs(missile.x - explosion.x) > explosion.radius
+    assert swept_interceptions([explosion], [missile]) == [[0]]
+
+
+def test_arrival_is_predicted_exactly():
+    rng = random.Random(3)
+    for _ in range(200):
+        missile = Missile(rng.uniform(0, 800), 0, rng.uniform(0, 800), rng.uniform(300, 640))
+        predicted = missile.steps_until_done()
+        updates = 0
+        while missile.active:
+            missile.update()
+            updates += 1
+        assert updates == predicted
+
+
+def test_fast_forward_matches_single_step_in_a_crowded_wave():
+    # Many fuses and interceptions at once, on both sides of VECTOR_PAIRS
+    games = []
+    for fast_forward in (False, True):
+        game = Game('EASY', headless=True, seed=4)
+        rng = random.Random(4)
+        for _ in range(40):
+            missile = game.register(game.missile_pool.acquire(rng.uniform(0, 800), 0, rng.uniform(50, 750), 560))
+            missile.advance(rng.randint(0, 100))
+            game.missiles.append(missile)
+        if fast_forward:
+            game.fast_forward(900)
+        else:
+            for _ in range(900):
+                if game.game_over or game.show_victory_screen:
+                    break
+                game.step()
+        games.append(game)
+    assert fingerprint(games[0]) == fingerprint(games[1])
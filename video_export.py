@@ -0,0 +1,183 @@
+"""Offline video export of recorded True Liberator sessions
+
+Replays a session saved by the game (run it with TRUE_LIBERATOR_RECORD_DIR set),
+renders every frame to an offscreen surface and hands the pixels to a background
+encoder through a bounded queue, so memory use stays flat however long the clip is.
+
+    python video_export.py session.json highlight.mp4     # needs ffmpeg on the PATH
+    python video_export.py session.json frames/ --format png
+    python video_export.py session.json clip.rgb --format raw
+
+Without ffmpeg, --format auto falls back to a PNG sequence.
+"""
+import argparse
+import json
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import time
+import zlib
+
+import numpy
+import pygame
+
+from main import ASSETS, FPS, SCREEN_WIDTH, SCREEN_HEIGHT, Game
+from particles import ParticleSystem
+
+HOLD_SECONDS = 2  # How long victory and game over screens stay in the clip
+
+
+def write_png(path, frame, level=1):
+    """Write an RGB frame as PNG; a low zlib level keeps encoding well ahead of the renderer"""
+    height, width, _ = frame.shape
+    rows = numpy.zeros((height, width * 3 + 1), dtype=numpy.uint8)  # Leading 0 per row: no filter
+    rows[:, 1:] = frame.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        f.write(chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b'IDAT', zlib.compress(rows.data, level)))
+        f.write(chunk(b'IEND', b''))
+
+
+class FrameEncoder:
+    """Consumes RGB frames on a background thread"""
+    def __init__(self, output, format, fps=FPS, queue_size=8):
+        self.output = output
+        self.format = format
+        self.fps = fps
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.count = 0
+        self.process = None
+        self.file = None
+        if format == 'ffmpeg':
+            self.process = subprocess.Popen(
+                [shutil.which('ffmpeg'), '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                 '-s', f'{SCREEN_WIDTH}x{SCREEN_HEIGHT}', '-r', str(fps), '-i', '-',
+                 '-pix_fmt', 'yuv420p', output], stdin=subprocess.PIPE)
+        elif format == 'raw':
+            self.file = open(output, 'wb')
+        else:
+            os.makedirs(output, exist_ok=True)
+        self.thread = threading.Thread(target=self.work, daemon=True)
+        self.thread.start()
+
+    def put(self, frame):
+        """Queue one (height, width, 3) uint8 frame, blocking while the encoder is behind"""
+        if self.error:
+            raise self.error
+        self.frames.put(frame)
+
+    def work(self):
+        try:
+            while True:
+                frame = self.frames.get()
+                if frame is None:
+                    break
+                if self.format == 'ffmpeg':
+                    self.process.stdin.write(frame.data)
+                elif self.format == 'raw':
+                    self.file.write(frame.data)
+                else:
+                    write_png(os.path.join(self.output, f"frame{self.count:06d}.png"), frame)
+                self.count += 1
+        except Exception as e:
+            self.error = e
+            # Keep draining so the producer never blocks on a dead encoder
+            while self.frames.get() is not None:
+                pass
+
+    def close(self):
+        self.frames.put(None)
+        self.thread.join()
+        if self.process:
+            self.process.stdin.close()
+            self.process.wait()
+        if self.file:
+            self.file.close()
+        if self.error:
+            raise self.error
+
+
+def load_session(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def replay_frames(session, surface):
+    """Re-simulate a recorded session, rendering each frame onto surface and yielding after each one"""
+    game = Game(session['difficulty'], headless=True, seed=session['seed'], world=tuple(session.get('world', (1, 1))))
+    game.screen = surface
+    game.font = ASSETS.font(36)
+    game.high_score_manager = ASSETS.high_scores()
+    game.particles = ParticleSystem()
+    game.particles.ground = game.world_height - 18
+    events = session['events']
+    index = 0
+    while True:
+        while index < len(events) and events[index][0] <= game.frame:
+            event = events[index]
+            if event[1] == 'launch':
+                game.launch_missile(event[2], event[3])
+            elif event[1] == 'continue':
+                # Show the victory screen for a moment, as the player saw it
+                for _ in range(HOLD_SECONDS * FPS):
+                    game.render(show_crosshair=False)
+                    yield game
+                game.continue_after_victory()
+            index += 1
+        if game.game_over or (game.show_victory_screen and index >= len(events)) or game.frame >= session['frames']:
+            break
+        game.update()
+        game.render(show_crosshair=False)
+        yield game
+    if game.game_over or game.show_victory_screen:
+        game.render(show_crosshair=False)
+        for _ in range(HOLD_SECONDS * FPS):
+            yield game
+
+
+def export(session, output, format='auto', queue_size=8):
+    if format == 'auto':
+        format = 'ffmpeg' if shutil.which('ffmpeg') else 'png'
+        if format == 'png' and os.path.splitext(output)[1]:
+            output = os.path.splitext(output)[0] + '_frames'
+    pygame.font.init()
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    encoder = FrameEncoder(output, format, queue_size=queue_size)
+    try:
+        for game in replay_frames(session, surface):
+            # pixels3d is a (width, height, 3) view of the surface; the encoders want rows first
+            pixels = pygame.surfarray.pixels3d(surface)
+            frame = pixels.transpose(1, 0, 2).copy()
+            del pixels  # Unlocks the surface for the next render
+            encoder.put(frame)
+    finally:
+        encoder.close()
+    return encoder.count, format, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a recorded True Liberator session as video")
+    parser.add_argument('session', help="session JSON written with TRUE_LIBERATOR_RECORD_DIR")
+    parser.add_argument('output', help="video file, PNG directory or raw RGB file")
+    parser.add_argument('--format', default='auto', choices=['auto', 'ffmpeg', 'png', 'raw'])
+    parser.add_argument('--queue', type=int, default=8, help="frames buffered between renderer and encoder")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count, format, output = export(load_session(args.session), args.output, args.format, args.queue)
+    elapsed = time.perf_counter() - start
+    print(f"{count} frames ({count / FPS:.1f}s of video) written to {output} as {format} "
+          f"in {elapsed:.1f}s ({count / FPS / elapsed:.1f}x real time)")
+
+
+if __name__ == "__main__":
+    main()